@@ -1,447 +1,447 @@
-# build_exe.py
-"""
-Скрипт для создания .exe файла Lead Generation System v3.2.0
-Использование: python build_exe.py
-"""
-
-import os
-import subprocess
-import sys
-import shutil
-
-
-def create_spec_file():
-    """Создание .spec файла для PyInstaller"""
-    spec_content = """# -*- mode: python ; coding: utf-8 -*-
-
-block_cipher = None
-
-a = Analysis(
-    ['main.py'],
-    pathex=[],
-    binaries=[],
-    datas=[
-        ('config', 'config'),
-        ('data', 'data'),
-    ],
-    hiddenimports=[
-        # Основные
-        'pandas',
-        'phonenumbers',
-        'customtkinter',
-        'matplotlib',
-        'openpyxl',
-        'tkinter',
-        'PIL._tkinter_finder',
-        
-        # Сеть и API
-        'requests',
-        'urllib3',
-        'urllib.parse',
-        'http.client',
-        'json',
-        
-        # База данных
-        'sqlite3',
-        
-        # Многопоточность
-        'threading',
-        'time',
-        
-        # Новые модули для v3.2
-        'io',
-        'csv',
-        'datetime',
-        'logging',
-        'pathlib',
-    ],
-    hookspath=[],
-    hooksconfig={},
-    runtime_hooks=[],
-    excludes=[],
-    win_no_prefer_redirects=False,
-    win_private_assemblies=False,
-    cipher=block_cipher,
-    noarchive=False,
-)
-
-pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
-
-exe = EXE(
-    pyz,
-    a.scripts,
-    [],
-    exclude_binaries=True,
-    name='LeadGenerationSystem',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    console=False,  # Без консоли (GUI режим)
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-    icon=None,  # Можно добавить .ico файл
-)
-
-coll = COLLECT(
-    exe,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    name='LeadGenerationSystem',
-)
-"""
-
-    with open('LeadGenerationSystem.spec', 'w', encoding='utf-8') as f:
-        f.write(spec_content)
-
-    print("✅ Файл LeadGenerationSystem.spec создан")
-
-
-def check_structure():
-    """Проверка структуры проекта"""
-    print("📂 Проверка структуры проекта...")
-
-    required_files = [
-        'main.py',
-        'config/config.json',
-        'modules/data_processor.py',
-        'modules/webbee_integration.py',
-        'modules/yandex_maps_url_generator.py',  # Новый модуль
-        'database/db_manager.py',
-        'gui/main_window.py',
-    ]
-
-    missing_files = []
-    for file_path in required_files:
-        if not os.path.exists(file_path):
-            missing_files.append(file_path)
-
-    if missing_files:
-        print("❌ Отсутствуют файлы:")
-        for file in missing_files:
-            print(f"   - {file}")
-        return False
-
-    print("✅ Структура проекта корректна")
-    return True
-
-
-def install_dependencies():
-    """Установка всех зависимостей"""
-    print("📦 Установка зависимостей из requirements.txt...")
-
-    try:
-        subprocess.check_call(
-            [sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
-        print("✅ Все зависимости установлены")
-    except Exception as e:
-        print(f"❌ Ошибка установки зависимостей: {e}")
-        sys.exit(1)
-
-
-def install_pyinstaller():
-    """Установка PyInstaller"""
-    print("📦 Установка PyInstaller...")
-
-    try:
-        subprocess.check_call(
-            [sys.executable, '-m', 'pip', 'install', 'pyinstaller'])
-        print("✅ PyInstaller установлен")
-    except Exception as e:
-        print(f"❌ Ошибка установки PyInstaller: {e}")
-        sys.exit(1)
-
-
-def clean_build_folders():
-    """Очистка предыдущих сборок"""
-    print("🧹 Очистка предыдущих сборок...")
-
-    folders_to_clean = ['build', 'dist']
-
-    for folder in folders_to_clean:
-        if os.path.exists(folder):
-            shutil.rmtree(folder)
-            print(f"   Удалена папка: {folder}")
-
-    if os.path.exists('LeadGenerationSystem.spec'):
-        os.remove('LeadGenerationSystem.spec')
-        print("   Удален старый .spec файл")
-
-    print("✅ Очистка завершена")
-
-
-def build_exe():
-    """Сборка .exe файла"""
-    print("🔨 Начинаем сборку .exe файла...")
-    print("⏳ Это может занять несколько минут...\n")
-
-    try:
-        subprocess.check_call(
-            ['pyinstaller', 'LeadGenerationSystem.spec', '--clean', '--noconfirm'])
-
-        print("\n✅ Сборка завершена успешно!")
-        print("\n" + "=" * 60)
-        print("📁 Готовое приложение находится в:")
-        print("   dist/LeadGenerationSystem/")
-        print("\n🚀 Для запуска:")
-        print("   dist/LeadGenerationSystem/LeadGenerationSystem.exe")
-        print("=" * 60)
-
-        return True
-
-    except Exception as e:
-        print(f"\n❌ Ошибка сборки: {e}")
-        return False
-
-
-def create_readme():
-    """Создание README для распространения"""
-    readme_content = """
-╔═══════════════════════════════════════════════════════════════╗
-║          Lead Generation System v3.2.0                        ║
-║       Система обработки лидов для Битрикс24                   ║
-╚═══════════════════════════════════════════════════════════════╝
-
-📋 ЧТО ВКЛЮЧЕНО:
-
-✅ Обработка и объединение CSV файлов
-✅ Валидация российских телефонов
-✅ Дедупликация контактов
-✅ Экспорт в формат Битрикс24
-✅ Аналитика результатов с графиками
-✅ Генератор ссылок для Яндекс.Карт (НОВОЕ!)
-✅ Интеграция с Webbee AI для автоматического парсинга (НОВОЕ!)
-✅ История обработок и отчеты
-
-📦 ЗАПУСК ПРИЛОЖЕНИЯ:
-
-1. Распакуйте архив в любую папку
-2. Запустите LeadGenerationSystem.exe
-3. При первом запуске будет создана структура папок
-
-⚙️ НАСТРОЙКА:
-
-• Файл config/config.json содержит основные настройки
-• Добавьте менеджеров в интерфейсе приложения (вкладка "Настройки")
-• Для парсинга Webbee AI нужен API токен (https://app.webbee-ai.ru)
-
-🗺️ ГЕНЕРАТОР ССЫЛОК ЯНДЕКС.КАРТЫ:
-
-1. Перейдите на вкладку "Парсинг Webbee AI"
-2. Введите сегмент (например: "кафе", "салоны красоты")
-3. Выберите или введите город вручную
-4. Для мегаполисов (Москва, СПб) можно выбрать конкретные районы
-5. Нажмите "Сгенерировать ссылки" - они появятся в поле
-6. Скопируйте или сразу запустите парсинг через Webbee AI
-
-🤖 ПАРСИНГ ЧЕРЕЗ WEBBEE AI:
-
-1. Получите API токен на https://app.webbee-ai.ru
-2. Введите токен в настройках и сохраните
-3. Сгенерируйте ссылки для парсинга
-4. Нажмите "Запустить парсинг"
-5. Отслеживайте прогресс в реальном времени
-6. Результаты автоматически сохранятся в папку data/processed/
-
-📁 СТРУКТУРА ПАПОК:
-
-data/
-  ├── processed/    - Обработанные файлы и результаты парсинга
-  ├── reports/      - Отчеты и графики аналитики
-  └── database.db   - История обработок и настройки
-
-logs/               - Логи работы приложения
-
-config/
-  └── config.json   - Конфигурационные файлы
-
-💡 ОСНОВНЫЕ ВОЗМОЖНОСТИ:
-
-🔹 Обработка данных:
-   • Загрузка CSV файлов из любых источников
-   • Автоматическая валидация телефонов
-   • Удаление дубликатов по телефону
-   • Распределение между менеджерами
-
-🔹 Яндекс.Карты:
-   • Генерация ссылок для поиска по сегментам
-   • Поддержка любых городов России
-   • Разбивка по районам для мегаполисов
-   • Экспорт ссылок в текстовый формат
-
-🔹 Webbee AI:
-   • Автоматический парсинг Яндекс.Карт
-   • Сбор контактов, адресов, рейтингов
-   • Отслеживание прогресса в реальном времени
-   • Готовые CSV файлы для импорта
-
-🔹 Аналитика:
-   • Статистика по источникам
-   • Графики распределения
-   • История обработок
-   • Отчеты по менеджерам
-
-📞 ПОДДЕРЖКА:
-
-Email: i@iac-iac.ru
-Telegram: @iac_support
-Документация: https://github.com/your-repo/wiki
-
-Версия: 3.2.0
-Дата релиза: 05.02.2026
-
-═══════════════════════════════════════════════════════════════
-
-🎯 БЫСТРЫЙ СТАРТ:
-
-1. Запустите приложение
-2. Настройте менеджеров (вкладка "Настройки")
-3. Сгенерируйте ссылки для Яндекс.Карт
-4. Запустите парсинг через Webbee AI
-5. Дождитесь завершения парсинга
-6. Обработайте данные (вкладка "Обработка")
-7. Экспортируйте в Битрикс24
-
-Готово! Ваши лиды готовы к импорту 🎉
-
-═══════════════════════════════════════════════════════════════
-"""
-
-    readme_path = "dist/LeadGenerationSystem/README.txt"
-
-    try:
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
-        print(f"✅ Создан файл README.txt")
-    except Exception as e:
-        print(f"⚠️ Не удалось создать README: {e}")
-
-
-def create_distribution_package():
-    """Создание архива для распространения"""
-    print("\n📦 Создание архива для распространения...")
-
-    dist_folder = "dist/LeadGenerationSystem"
-    archive_name = f"LeadGenerationSystem_v3.2.0_{time.strftime('%Y%m%d')}"
-
-    try:
-        shutil.make_archive(archive_name, 'zip', dist_folder)
-        print(f"✅ Создан архив: {archive_name}.zip")
-
-        size_mb = os.path.getsize(archive_name + '.zip') / (1024 * 1024)
-        print(f"📊 Размер архива: {size_mb:.1f} МБ")
-    except Exception as e:
-        print(f"⚠️ Не удалось создать архив: {e}")
-
-
-def create_version_info():
-    """Создание файла с информацией о версии"""
-    version_info = """
-Lead Generation System v3.2.0
-═══════════════════════════════════════
-
-🆕 ЧТО НОВОГО В ВЕРСИИ 3.2.0:
-
-✨ Генератор ссылок для Яндекс.Карт
-   - Поддержка всех городов России
-   - Разбивка по районам для мегаполисов
-   - Ручной ввод названия города
-   - Выбор конкретных районов
-
-🤖 Интеграция с Webbee AI
-   - Автоматический парсинг Яндекс.Карт
-   - API интеграция с Webbee AI
-   - Отслеживание прогресса в реальном времени
-   - Автоматическое скачивание результатов
-
-🔧 Улучшения:
-   - Улучшенная обработка CSV файлов
-   - Поддержка различных разделителей (запятая, табуляция)
-   - Более информативные сообщения об ошибках
-   - Оптимизация работы с большими файлами
-
-📅 История версий:
-   v3.2.0 (05.02.2026) - Webbee AI + Генератор ссылок
-   v3.1.0 (01.02.2026) - Аналитика и отчеты
-   v3.0.0 (15.01.2026) - Первый релиз с GUI
-
-═══════════════════════════════════════
-"""
-
-    version_path = "dist/LeadGenerationSystem/VERSION.txt"
-
-    try:
-        with open(version_path, 'w', encoding='utf-8') as f:
-            f.write(version_info)
-        print(f"✅ Создан файл VERSION.txt")
-    except Exception as e:
-        print(f"⚠️ Не удалось создать VERSION.txt: {e}")
-
-
-if __name__ == '__main__':
-    import time
-
-    print("╔" + "=" * 58 + "╗")
-    print("║" + " " * 10 + "Lead Generation System v3.2.0" + " " * 19 + "║")
-    print("║" + " " * 15 + "Сборка .exe файла" + " " * 26 + "║")
-    print("╚" + "=" * 58 + "╝\n")
-
-    # Шаг 1: Проверка структуры
-    if not check_structure():
-        print("\n❌ Сборка прервана из-за отсутствующих файлов")
-        sys.exit(1)
-    print()
-
-    # Шаг 2: Очистка старых сборок
-    clean_build_folders()
-    print()
-
-    # Шаг 3: Установка зависимостей
-    install_dependencies()
-    print()
-
-    # Шаг 4: Установка PyInstaller
-    install_pyinstaller()
-    print()
-
-    # Шаг 5: Создание .spec файла
-    create_spec_file()
-    print()
-
-    # Шаг 6: Сборка
-    if build_exe():
-        print()
-
-        # Шаг 7: Создание README
-        create_readme()
-        print()
-
-        # Шаг 8: Создание VERSION.txt
-        create_version_info()
-        print()
-
-        # Шаг 9: Создание архива
-        create_distribution_package()
-
-        print("\n╔" + "=" * 58 + "╗")
-        print("║" + " " * 10 + "✅ СБОРКА ЗАВЕРШЕНА УСПЕШНО! ✅" + " " * 17 + "║")
-        print("╚" + "=" * 58 + "╝")
-
-        print("\n📝 Следующие шаги:")
-        print("1. Протестируйте приложение: dist/LeadGenerationSystem/LeadGenerationSystem.exe")
-        print("2. Или распространите архив: LeadGenerationSystem_v3.2.0_*.zip")
-        print("\n💡 Архив включает:")
-        print("   • Исполняемый файл (.exe)")
-        print("   • README.txt с инструкциями")
-        print("   • VERSION.txt с историей изменений")
-        print("   • Структуру папок config/ и data/")
-    else:
-        print("\n❌ Сборка завершилась с ошибками")
-        sys.exit(1)
+# build_exe.py
+"""
+Скрипт для создания .exe файла Lead Generation System v3.2.0
+Использование: python build_exe.py
+"""
+
+import os
+import subprocess
+import sys
+import shutil
+
+
+def create_spec_file():
+    """Создание .spec файла для PyInstaller"""
+    spec_content = """# -*- mode: python ; coding: utf-8 -*-
+
+block_cipher = None
+
+a = Analysis(
+    ['main.py'],
+    pathex=[],
+    binaries=[],
+    datas=[
+        ('config', 'config'),
+        ('data', 'data'),
+    ],
+    hiddenimports=[
+        # Основные
+        'pandas',
+        'phonenumbers',
+        'customtkinter',
+        'matplotlib',
+        'openpyxl',
+        'tkinter',
+        'PIL._tkinter_finder',
+        
+        # Сеть и API
+        'requests',
+        'urllib3',
+        'urllib.parse',
+        'http.client',
+        'json',
+        
+        # База данных
+        'sqlite3',
+        
+        # Многопоточность
+        'threading',
+        'time',
+        
+        # Новые модули для v3.2
+        'io',
+        'csv',
+        'datetime',
+        'logging',
+        'pathlib',
+    ],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='LeadGenerationSystem',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=False,  # Без консоли (GUI режим)
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=None,  # Можно добавить .ico файл
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='LeadGenerationSystem',
+)
+"""
+
+    with open('LeadGenerationSystem.spec', 'w', encoding='utf-8') as f:
+        f.write(spec_content)
+
+    print("✅ Файл LeadGenerationSystem.spec создан")
+
+
+def check_structure():
+    """Проверка структуры проекта"""
+    print("📂 Проверка структуры проекта...")
+
+    required_files = [
+        'main.py',
+        'config/config.json',
+        'modules/data_processor.py',
+        'modules/webbee_integration.py',
+        'modules/yandex_maps_url_generator.py',  # Новый модуль
+        'database/db_manager.py',
+        'gui/main_window.py',
+    ]
+
+    missing_files = []
+    for file_path in required_files:
+        if not os.path.exists(file_path):
+            missing_files.append(file_path)
+
+    if missing_files:
+        print("❌ Отсутствуют файлы:")
+        for file in missing_files:
+            print(f"   - {file}")
+        return False
+
+    print("✅ Структура проекта корректна")
+    return True
+
+
+def install_dependencies():
+    """Установка всех зависимостей"""
+    print("📦 Установка зависимостей из requirements.txt...")
+
+    try:
+        subprocess.check_call(
+            [sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'])
+        print("✅ Все зависимости установлены")
+    except Exception as e:
+        print(f"❌ Ошибка установки зависимостей: {e}")
+        sys.exit(1)
+
+
+def install_pyinstaller():
+    """Установка PyInstaller"""
+    print("📦 Установка PyInstaller...")
+
+    try:
+        subprocess.check_call(
+            [sys.executable, '-m', 'pip', 'install', 'pyinstaller'])
+        print("✅ PyInstaller установлен")
+    except Exception as e:
+        print(f"❌ Ошибка установки PyInstaller: {e}")
+        sys.exit(1)
+
+
+def clean_build_folders():
+    """Очистка предыдущих сборок"""
+    print("🧹 Очистка предыдущих сборок...")
+
+    folders_to_clean = ['build', 'dist']
+
+    for folder in folders_to_clean:
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+            print(f"   Удалена папка: {folder}")
+
+    if os.path.exists('LeadGenerationSystem.spec'):
+        os.remove('LeadGenerationSystem.spec')
+        print("   Удален старый .spec файл")
+
+    print("✅ Очистка завершена")
+
+
+def build_exe():
+    """Сборка .exe файла"""
+    print("🔨 Начинаем сборку .exe файла...")
+    print("⏳ Это может занять несколько минут...\n")
+
+    try:
+        subprocess.check_call(
+            ['pyinstaller', 'LeadGenerationSystem.spec', '--clean', '--noconfirm'])
+
+        print("\n✅ Сборка завершена успешно!")
+        print("\n" + "=" * 60)
+        print("📁 Готовое приложение находится в:")
+        print("   dist/LeadGenerationSystem/")
+        print("\n🚀 Для запуска:")
+        print("   dist/LeadGenerationSystem/LeadGenerationSystem.exe")
+        print("=" * 60)
+
+        return True
+
+    except Exception as e:
+        print(f"\n❌ Ошибка сборки: {e}")
+        return False
+
+
+def create_readme():
+    """Создание README для распространения"""
+    readme_content = """
+╔═══════════════════════════════════════════════════════════════╗
+║          Lead Generation System v3.2.0                        ║
+║       Система обработки лидов для Битрикс24                   ║
+╚═══════════════════════════════════════════════════════════════╝
+
+📋 ЧТО ВКЛЮЧЕНО:
+
+✅ Обработка и объединение CSV файлов
+✅ Валидация российских телефонов
+✅ Дедупликация контактов
+✅ Экспорт в формат Битрикс24
+✅ Аналитика результатов с графиками
+✅ Генератор ссылок для Яндекс.Карт (НОВОЕ!)
+✅ Интеграция с Webbee AI для автоматического парсинга (НОВОЕ!)
+✅ История обработок и отчеты
+
+📦 ЗАПУСК ПРИЛОЖЕНИЯ:
+
+1. Распакуйте архив в любую папку
+2. Запустите LeadGenerationSystem.exe
+3. При первом запуске будет создана структура папок
+
+⚙️ НАСТРОЙКА:
+
+• Файл config/config.json содержит основные настройки
+• Добавьте менеджеров в интерфейсе приложения (вкладка "Настройки")
+• Для парсинга Webbee AI нужен API токен (https://app.webbee-ai.ru)
+
+🗺️ ГЕНЕРАТОР ССЫЛОК ЯНДЕКС.КАРТЫ:
+
+1. Перейдите на вкладку "Парсинг Webbee AI"
+2. Введите сегмент (например: "кафе", "салоны красоты")
+3. Выберите или введите город вручную
+4. Для мегаполисов (Москва, СПб) можно выбрать конкретные районы
+5. Нажмите "Сгенерировать ссылки" - они появятся в поле
+6. Скопируйте или сразу запустите парсинг через Webbee AI
+
+🤖 ПАРСИНГ ЧЕРЕЗ WEBBEE AI:
+
+1. Получите API токен на https://app.webbee-ai.ru
+2. Введите токен в настройках и сохраните
+3. Сгенерируйте ссылки для парсинга
+4. Нажмите "Запустить парсинг"
+5. Отслеживайте прогресс в реальном времени
+6. Результаты автоматически сохранятся в папку data/processed/
+
+📁 СТРУКТУРА ПАПОК:
+
+data/
+  ├── processed/    - Обработанные файлы и результаты парсинга
+  ├── reports/      - Отчеты и графики аналитики
+  └── database.db   - История обработок и настройки
+
+logs/               - Логи работы приложения
+
+config/
+  └── config.json   - Конфигурационные файлы
+
+💡 ОСНОВНЫЕ ВОЗМОЖНОСТИ:
+
+🔹 Обработка данных:
+   • Загрузка CSV файлов из любых источников
+   • Автоматическая валидация телефонов
+   • Удаление дубликатов по телефону
+   • Распределение между менеджерами
+
+🔹 Яндекс.Карты:
+   • Генерация ссылок для поиска по сегментам
+   • Поддержка любых городов России
+   • Разбивка по районам для мегаполисов
+   • Экспорт ссылок в текстовый формат
+
+🔹 Webbee AI:
+   • Автоматический парсинг Яндекс.Карт
+   • Сбор контактов, адресов, рейтингов
+   • Отслеживание прогресса в реальном времени
+   • Готовые CSV файлы для импорта
+
+🔹 Аналитика:
+   • Статистика по источникам
+   • Графики распределения
+   • История обработок
+   • Отчеты по менеджерам
+
+📞 ПОДДЕРЖКА:
+
+Email: i@iac-iac.ru
+Telegram: @iac_support
+Документация: https://github.com/your-repo/wiki
+
+Версия: 3.2.0
+Дата релиза: 05.02.2026
+
+═══════════════════════════════════════════════════════════════
+
+🎯 БЫСТРЫЙ СТАРТ:
+
+1. Запустите приложение
+2. Настройте менеджеров (вкладка "Настройки")
+3. Сгенерируйте ссылки для Яндекс.Карт
+4. Запустите парсинг через Webbee AI
+5. Дождитесь завершения парсинга
+6. Обработайте данные (вкладка "Обработка")
+7. Экспортируйте в Битрикс24
+
+Готово! Ваши лиды готовы к импорту 🎉
+
+═══════════════════════════════════════════════════════════════
+"""
+
+    readme_path = "dist/LeadGenerationSystem/README.txt"
+
+    try:
+        with open(readme_path, 'w', encoding='utf-8') as f:
+            f.write(readme_content)
+        print(f"✅ Создан файл README.txt")
+    except Exception as e:
+        print(f"⚠️ Не удалось создать README: {e}")
+
+
+def create_distribution_package():
+    """Создание архива для распространения"""
+    print("\n📦 Создание архива для распространения...")
+
+    dist_folder = "dist/LeadGenerationSystem"
+    archive_name = f"LeadGenerationSystem_v3.2.0_{time.strftime('%Y%m%d')}"
+
+    try:
+        shutil.make_archive(archive_name, 'zip', dist_folder)
+        print(f"✅ Создан архив: {archive_name}.zip")
+
+        size_mb = os.path.getsize(archive_name + '.zip') / (1024 * 1024)
+        print(f"📊 Размер архива: {size_mb:.1f} МБ")
+    except Exception as e:
+        print(f"⚠️ Не удалось создать архив: {e}")
+
+
+def create_version_info():
+    """Создание файла с информацией о версии"""
+    version_info = """
+Lead Generation System v3.2.0
+═══════════════════════════════════════
+
+🆕 ЧТО НОВОГО В ВЕРСИИ 3.2.0:
+
+✨ Генератор ссылок для Яндекс.Карт
+   - Поддержка всех городов России
+   - Разбивка по районам для мегаполисов
+   - Ручной ввод названия города
+   - Выбор конкретных районов
+
+🤖 Интеграция с Webbee AI
+   - Автоматический парсинг Яндекс.Карт
+   - API интеграция с Webbee AI
+   - Отслеживание прогресса в реальном времени
+   - Автоматическое скачивание результатов
+
+🔧 Улучшения:
+   - Улучшенная обработка CSV файлов
+   - Поддержка различных разделителей (запятая, табуляция)
+   - Более информативные сообщения об ошибках
+   - Оптимизация работы с большими файлами
+
+📅 История версий:
+   v3.2.0 (05.02.2026) - Webbee AI + Генератор ссылок
+   v3.1.0 (01.02.2026) - Аналитика и отчеты
+   v3.0.0 (15.01.2026) - Первый релиз с GUI
+
+═══════════════════════════════════════
+"""
+
+    version_path = "dist/LeadGenerationSystem/VERSION.txt"
+
+    try:
+        with open(version_path, 'w', encoding='utf-8') as f:
+            f.write(version_info)
+        print(f"✅ Создан файл VERSION.txt")
+    except Exception as e:
+        print(f"⚠️ Не удалось создать VERSION.txt: {e}")
+
+
+if __name__ == '__main__':
+    import time
+
+    print("╔" + "=" * 58 + "╗")
+    print("║" + " " * 10 + "Lead Generation System v3.2.0" + " " * 19 + "║")
+    print("║" + " " * 15 + "Сборка .exe файла" + " " * 26 + "║")
+    print("╚" + "=" * 58 + "╝\n")
+
+    # Шаг 1: Проверка структуры
+    if not check_structure():
+        print("\n❌ Сборка прервана из-за отсутствующих файлов")
+        sys.exit(1)
+    print()
+
+    # Шаг 2: Очистка старых сборок
+    clean_build_folders()
+    print()
+
+    # Шаг 3: Установка зависимостей
+    install_dependencies()
+    print()
+
+    # Шаг 4: Установка PyInstaller
+    install_pyinstaller()
+    print()
+
+    # Шаг 5: Создание .spec файла
+    create_spec_file()
+    print()
+
+    # Шаг 6: Сборка
+    if build_exe():
+        print()
+
+        # Шаг 7: Создание README
+        create_readme()
+        print()
+
+        # Шаг 8: Создание VERSION.txt
+        create_version_info()
+        print()
+
+        # Шаг 9: Создание архива
+        create_distribution_package()
+
+        print("\n╔" + "=" * 58 + "╗")
+        print("║" + " " * 10 + "✅ СБОРКА ЗАВЕРШЕНА УСПЕШНО! ✅" + " " * 17 + "║")
+        print("╚" + "=" * 58 + "╝")
+
+        print("\n📝 Следующие шаги:")
+        print("1. Протестируйте приложение: dist/LeadGenerationSystem/LeadGenerationSystem.exe")
+        print("2. Или распространите архив: LeadGenerationSystem_v3.2.0_*.zip")
+        print("\n💡 Архив включает:")
+        print("   • Исполняемый файл (.exe)")
+        print("   • README.txt с инструкциями")
+        print("   • VERSION.txt с историей изменений")
+        print("   • Структуру папок config/ и data/")
+    else:
+        print("\n❌ Сборка завершилась с ошибками")
+        sys.exit(1)
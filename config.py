@@ -1,39 +1,159 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Учетные данные
-ADMIN_LOGIN = os.getenv('ADMIN_LOGIN', '')
-ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', '')
-
-# URL'ы
-BASE_URL = 'https://crm.it-datamaster.ru'
-LOGIN_URL = f'{BASE_URL}/admin'
-ACCOUNTS_URL = f'{BASE_URL}/admin/visit/rt-admin'
-TOKEN_API_URL = f'{BASE_URL}/admin/user/create-token'
-
-# Настройки парсинга
-ACCOUNTS_PER_PAGE = 200
-PHONES_PER_PAGE = 50
-DELAY_BETWEEN_REQUESTS = (2, 5)
-DELAY_BETWEEN_ACCOUNTS = (10, 15)
-RETRY_ATTEMPTS = 3
-RETRY_DELAY = 5
-
-# Параллелизация
-MAX_WORKERS = 3
-WORKER_DELAY = (5, 10)
-
-# База данных
-DB_PATH = 'data/phones.db'
-BACKUP_DIR = 'data/backups'
-BACKUP_INTERVAL = 100
-
-# Отчет
-REPORT_PATH = 'data/report.xlsx'
-
-# Браузер
-HEADLESS = False
-BROWSER_TIMEOUT = 120000  # УВЕЛИЧЕНО: 120 секунд (2 минуты) для долгих страниц
-PAGE_LOAD_TIMEOUT = 120000  # Таймаут для загрузки страниц
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Учетные данные
+ADMIN_LOGIN = os.getenv('ADMIN_LOGIN', '')
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', '')
+
+# URL'ы
+BASE_URL = 'https://crm.it-datamaster.ru'
+LOGIN_URL = f'{BASE_URL}/admin'
+ACCOUNTS_URL = f'{BASE_URL}/admin/visit/rt-admin'
+TOKEN_API_URL = f'{BASE_URL}/admin/user/create-token'
+
+# Генерация токенов: 'api' — запросы к TOKEN_API_URL, 'ui' — клик по кнопке в таблице
+TOKEN_MODE = 'api'
+TOKEN_API_METHOD = 'POST'
+TOKEN_CONCURRENCY = 8  # Одновременных запросов create-token (темп — общий лимитер, не выше RATE_MAX запр/сек)
+TOKEN_API_MAX_FAILURES = 10  # Неудач create-token подряд, после которых API отключается (токены — кнопкой)
+TOKEN_MAX_AGE_HOURS = 24  # Срок жизни токена при повторном сборе; 0 — не устаревает
+TOKEN_PROBE = False  # Проверять действующие токены запросом (вход по токену в отдельной сессии)
+
+# Настройки парсинга
+HARVEST_MODE = 'xhr'  # 'xhr' — список аккаунтов JSON-запросами таблицы, 'dom' — разбор строк
+ACCOUNTS_PER_PAGE = 200  # Аккаунтов на запрос списка в режиме 'xhr'
+PHONES_PER_PAGE = 50
+FANOUT_TABS = 3  # Вкладок на аккаунт, когда число страниц известно заранее
+DELAY_BETWEEN_REQUESTS = (2, 5)
+DELAY_BETWEEN_ACCOUNTS = (10, 15)
+RETRY_ATTEMPTS = 3
+RETRY_DELAY = 5  # Базовая пауза перед повтором страницы, сек (удваивается с каждой попыткой)
+RETRY_MAX_DELAY = 120  # Потолок паузы между повторами, сек
+CIRCUIT_BREAKER_THRESHOLD = 3  # Неудач подряд, после которых аккаунт откладывается (parked)
+ACCOUNT_RETRY_DELAY = 60  # Пауза перед повторным захватом аккаунта после неудачи, сек (удваивается)
+ACCOUNT_RETRY_MAX_DELAY = 900  # Потолок паузы перед повторным захватом, сек
+SCRAPE_ENGINE = 'browser'  # 'browser' — рендеринг страниц, 'http' — GET по cookies сессии
+HTTP_POOL_SIZE = 4  # Keep-alive соединений в пуле HTTP-движка
+HTTP_TIMEOUT = 60  # Таймаут HTTP-запроса страницы, сек
+
+# Общий темп запросов (token bucket с AIMD); при RATE_LIMIT = False — паузы DELAY_*
+RATE_LIMIT = True
+RATE_INITIAL = 0.5  # Стартовая скорость, запросов/сек на всех воркеров
+RATE_MIN = 0.1
+RATE_MAX = 5.0
+RATE_BURST = 3  # Запросов подряд без ожидания
+RATE_INCREASE = 0.05  # Прибавка скорости после быстрого ответа, запросов/сек
+RATE_DECREASE = 0.5  # Множитель при медленном ответе, ошибке или таймауте
+RATE_DECREASE_INTERVAL = 10  # Не снижать скорость чаще, чем раз в N сек
+RATE_TARGET_LATENCY = 5.0  # Ответ дольше N сек считается перегрузкой сервера
+RATE_BAN_DECREASE = 0.25  # Множитель при капче / 429 / 403
+RATE_BAN_PAUSE = 120  # Пауза всех воркеров после признаков блокировки, сек
+
+# Параллелизация
+MAX_WORKERS = 3
+WORKER_DELAY = (5, 10)
+ASYNC_CONCURRENCY = 5  # Аккаунтов одновременно в --mode async (контекстов одного браузера)
+MONITOR_INTERVAL = 5  # Период проверки состояния воркеров, сек
+PROGRESS_LOG_INTERVAL = 60  # Период вывода прогресса и ETA, сек
+CLAIM_BATCH_SIZE = 3  # Аккаунтов, захватываемых воркером за раз
+LEASE_DURATION = 600  # Срок аренды аккаунта, сек (больше любого таймаута страницы)
+LEASE_HEARTBEAT_INTERVAL = 60  # Период продления аренды, сек
+WRITER_MODE = False  # Запись в БД через один процесс-писатель
+WRITER_BATCH_SIZE = 200  # Сообщений в одной транзакции писателя
+WRITER_FLUSH_INTERVAL = 0.5  # Максимальное ожидание пачки, сек
+WRITER_MAX_PENDING = 20  # Неподтвержденных сообщений на воркер
+WORKER_STALL_TIMEOUT = 600  # Воркер без признаков жизни дольше этого перезапускается, сек
+WORKER_RECYCLE_ACCOUNTS = 200  # Перезапуск воркера после N аккаунтов (утечки браузера), 0 — не перезапускать
+WORKER_MAX_RESTARTS = 5  # Перезапусков слота подряд без обработанных аккаунтов
+WORKER_DRAIN_TIMEOUT = 300  # Ожидание текущих аккаунтов после Ctrl+C, сек (второй Ctrl+C — сразу)
+
+# Автомасштаб воркеров (--autoscale): MAX_WORKERS / --workers — потолок
+AUTOSCALE = False
+AUTOSCALE_MIN_WORKERS = 1
+AUTOSCALE_START_WORKERS = 1  # Воркеров при старте
+AUTOSCALE_INTERVAL = 120  # Окно замера скорости перед решением, сек
+AUTOSCALE_WARMUP = 30  # Не замерять после изменения числа воркеров (запуск браузера), сек
+AUTOSCALE_MIN_GAIN = 0.1  # Минимальный прирост стр/сек от добавленного воркера (10%)
+AUTOSCALE_MAX_ERROR_RATE = 0.05  # Доля ошибок и таймаутов запросов, выше — убрать воркер
+AUTOSCALE_LATENCY_FACTOR = 2.0  # Задержка сервера выше лучшей во столько раз — CRM замедлилась
+AUTOSCALE_MAX_CPU = 85  # Загрузка CPU, %, выше — убрать воркер (нужен psutil)
+AUTOSCALE_MAX_MEMORY = 85  # Занятая RAM, %, выше — убрать воркер (нужен psutil)
+AUTOSCALE_REPROBE = 5  # Окон до повторной попытки превысить найденный потолок
+
+# Метрики воркеров (--mode parallel/pipeline) в формате Prometheus
+METRICS_HOST = '127.0.0.1'
+METRICS_PORT = 9108  # http://METRICS_HOST:METRICS_PORT/metrics, 0 — не запускать
+
+# Конвейер сбор → парсинг (--mode pipeline)
+PIPELINE_POLL_INTERVAL = 5  # Пауза воркера при пустой очереди, пока идет сбор, сек
+PIPELINE_TOKENS_ON_DEMAND = False  # Сборщик пишет только список, токен получает воркер перед парсингом
+
+# База данных
+DB_PATH = 'data/phones.db'
+BACKUP_DIR = 'data/backups'
+BACKUP_INTERVAL = 100
+BACKUP_COMPRESS = True  # Сжимать бэкапы gzip
+BACKUP_KEEP_LAST = 10  # Сколько последних бэкапов хранить
+BACKUP_KEEP_DAILY = 7  # Плюс последний бэкап за каждый из N дней
+BACKUP_PAGES_PER_STEP = 1024  # Страниц SQLite за один шаг копирования
+BACKUP_STEP_PAUSE = 0.01  # Пауза между шагами, сек
+BACKUP_MAX_RESTARTS = 5  # После стольких перезапусков — копирование одним проходом
+DB_BUSY_TIMEOUT = 30000  # мс ожидания блокировки записи
+DB_SYNCHRONOUS = 'NORMAL'  # В WAL-режиме NORMAL безопасен и не делает fsync на каждый commit
+DB_CACHE_SIZE_KB = 65536  # 64 МБ кэша страниц на соединение
+DB_MMAP_SIZE = 268435456  # 256 МБ memory-mapped I/O
+PHONE_STORAGE = 'text'  # 'text' или 'integer' (WITHOUT ROWID, номер как INTEGER-ключ)
+
+# Отчет
+REPORT_PATH = 'data/report.xlsx'
+
+# Экспорт
+EXPORT_DIR = 'data/exports'
+EXPORT_CHUNK_SIZE = 50000  # Строк в одной порции чтения/записи
+EXPORT_STATE_PATH = 'data/exports/.last_export'  # Для --since last
+EXPORT_SETTLE_SECONDS = 60  # --since last не выгружает номера моложе (еще не закоммиченные записи)
+
+# Браузер
+HEADLESS = False
+BROWSER_TIMEOUT = 120000  # УВЕЛИЧЕНО: 120 секунд (2 минуты) для долгих страниц
+PAGE_LOAD_TIMEOUT = 120000  # Таймаут для загрузки страниц
+WAIT_TIMEOUT = 30000  # Верхняя граница ожидания таблицы/пагинации, мс
+WAIT_SHORT_TIMEOUT = 5000  # Ожидание мелких событий (меню, диалог, network idle), мс
+WAIT_STATS_SAMPLES = 1000  # Замеров на вид ожидания для p95 (память не растет с числом страниц)
+CONTEXT_POOL_SIZE = 2  # Максимум живых контекстов в пуле
+CONTEXT_REUSE = True  # Сбрасывать и переиспользовать контекст (False — новый на каждый аккаунт)
+BROWSER_RECYCLE_ACCOUNTS = 50  # Перезапуск Chromium после N аккаунтов (0 — не перезапускать)
+BROWSER_MAX_RSS_MB = 1500  # Перезапуск при превышении памяти (нужен psutil, 0 — не проверять)
+SESSION_REUSE = True  # Сохранять storage_state после входа и запускать контексты уже авторизованными
+SESSION_STATE_DIR = 'data/sessions'
+SESSION_TTL_HOURS = 12  # Срок жизни сохраненной сессии; 0 — пока сервер ее принимает
+
+# Блокировка запросов в браузере
+BLOCK_REQUESTS = True  # Подключать политику context.route
+BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font', 'stylesheet']
+# Фазы, в которых отменяются BLOCKED_RESOURCE_TYPES (вход и админка могут зависеть от CSS)
+BLOCK_PHASES = {
+    'login': False,
+    'harvest': False,
+    'scrape': True,
+}
+# Аналитика и трекеры — отменяются во всех фазах (домен и его поддомены)
+BLOCKED_HOSTS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'mc.yandex.ru',
+    'top-fwz1.mail.ru',
+    'connect.facebook.net',
+    'vk.com',
+]
+# Оценка размера отмененного ресурса, если его Content-Length еще не встречался, КБ
+BLOCKED_SIZE_ESTIMATES_KB = {
+    'image': 30,
+    'media': 300,
+    'font': 50,
+    'stylesheet': 40,
+    'tracker': 30,
+}
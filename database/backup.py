@@ -0,0 +1,171 @@
+import gzip
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+import config
+from utils.logger import logger
+
+BACKUP_PREFIX = 'phones_backup_'
+
+
+class _TooManyRestarts(Exception):
+    """Копирование по шагам постоянно перезапускается из-за записей"""
+
+
+def create_backup(db_path: str = config.DB_PATH,
+                  backup_dir: str = config.BACKUP_DIR,
+                  compress: bool = config.BACKUP_COMPRESS) -> str:
+    """
+    Онлайн-бэкап через SQLite backup API
+
+    Страницы копируются порциями по BACKUP_PAGES_PER_STEP с паузой между
+    шагами, поэтому воркеры продолжают писать. Если запись в источник
+    постоянно перезапускает копирование, выполняется один проход по снимку
+    (в WAL-режиме чтение не блокирует писателей). Результат сжимается gzip
+    потоково, после чего применяется политика хранения.
+
+    Returns:
+        Путь к файлу бэкапа
+    """
+    Path(backup_dir).mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    backup_path = Path(backup_dir) / f"{BACKUP_PREFIX}{timestamp}.db"
+    part_path = backup_path.with_suffix('.db.part')
+
+    started = time.perf_counter()
+    restarts = _copy_online(db_path, str(part_path))
+
+    if compress:
+        final_path = backup_path.with_suffix('.db.gz')
+        with open(part_path, 'rb') as src, gzip.open(final_path, 'wb', compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        part_path.unlink()
+    else:
+        final_path = backup_path
+        part_path.replace(final_path)
+
+    logger.debug(
+        f"   Бэкап {final_path.name}: {time.perf_counter() - started:.1f} сек, "
+        f"перезапусков копирования: {restarts}")
+
+    apply_retention(backup_dir)
+    return str(final_path)
+
+
+def _copy_online(db_path: str, target_path: str) -> int:
+    """Скопировать БД по шагам, вернуть число перезапусков копирования"""
+    restarts = 0
+    last_remaining = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, last_remaining
+        # remaining растет — источник изменился и копирование началось заново
+        if last_remaining is not None and remaining > last_remaining:
+            restarts += 1
+            if restarts > config.BACKUP_MAX_RESTARTS:
+                raise _TooManyRestarts()
+        last_remaining = remaining
+        # Отдаем блокировку чтения между шагами
+        time.sleep(config.BACKUP_STEP_PAUSE)
+
+    src = sqlite3.connect(db_path, timeout=config.DB_BUSY_TIMEOUT / 1000)
+    try:
+        dst = sqlite3.connect(target_path)
+        try:
+            try:
+                src.backup(dst, pages=config.BACKUP_PAGES_PER_STEP, progress=progress)
+            except _TooManyRestarts:
+                src.backup(dst, pages=-1)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+    return restarts
+
+
+def list_backups(backup_dir: str = config.BACKUP_DIR) -> List[Path]:
+    """Бэкапы от старых к новым (имя содержит метку времени)"""
+    backup_dir = Path(backup_dir)
+    if not backup_dir.exists():
+        return []
+    files = [
+        path for path in backup_dir.iterdir()
+        if path.name.startswith(BACKUP_PREFIX)
+        and (path.name.endswith('.db') or path.name.endswith('.db.gz'))
+    ]
+    return sorted(files, key=lambda path: path.name)
+
+
+def apply_retention(backup_dir: str = config.BACKUP_DIR,
+                    keep_last: int = config.BACKUP_KEEP_LAST,
+                    keep_daily: int = config.BACKUP_KEEP_DAILY) -> int:
+    """
+    Удалить старые бэкапы
+
+    Сохраняются keep_last последних бэкапов и последний бэкап каждого
+    из keep_daily последних дней.
+
+    Returns:
+        Количество удаленных файлов
+    """
+    backups = list_backups(backup_dir)
+    keep = set(backups[-keep_last:]) if keep_last > 0 else set()
+
+    # Последний бэкап каждого дня (дата — первые 8 символов метки времени)
+    daily = {}
+    for path in backups:
+        day = path.name[len(BACKUP_PREFIX):len(BACKUP_PREFIX) + 8]
+        daily[day] = path
+    for day in sorted(daily)[-keep_daily:] if keep_daily > 0 else []:
+        keep.add(daily[day])
+
+    removed = 0
+    for path in backups:
+        if path not in keep:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"⚠️ Не удалось удалить бэкап {path.name}: {e}")
+
+    if removed:
+        logger.debug(f"   Удалено старых бэкапов: {removed}")
+    return removed
+
+
+class BackgroundBackup:
+    """Бэкап в фоновом потоке, чтобы не останавливать парсинг"""
+
+    def __init__(self, db_path: str = config.DB_PATH):
+        self.db_path = db_path
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Запустить бэкап, если предыдущий уже завершен"""
+        if self.running:
+            logger.debug("   Предыдущий бэкап еще выполняется, пропускаю")
+            return False
+        self._thread = threading.Thread(target=self._run, name='backup', daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self):
+        """Дождаться завершения текущего бэкапа"""
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            backup_path = create_backup(self.db_path)
+            logger.info(f"💾 Создан бэкап: {backup_path}")
+        except Exception as e:
+            logger.error(f"❌ Ошибка создания бэкапа: {e}")
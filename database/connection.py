@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+import config
+from database.migrations import SCHEMA_VERSION, apply_migrations
+
+
+class ConnectionManager:
+    """
+    Долгоживущие соединения SQLite: одно на поток в каждом процессе.
+
+    Соединения открываются в WAL-режиме с настроенными PRAGMA, миграции
+    применяются только если PRAGMA user_version отстает от SCHEMA_VERSION.
+    Менеджер ведет счетчики открытых соединений и времени ожидания блокировок.
+    """
+
+    _instances: Dict[str, 'ConnectionManager'] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._connections = []
+
+        # Статистика
+        self.connections_opened = 0
+        self.transactions = 0
+        self.lock_waits = 0
+        self.lock_wait_time = 0.0
+
+    @classmethod
+    def for_path(cls, db_path: str) -> 'ConnectionManager':
+        """Получить менеджер для файла БД (один на процесс)"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            # После fork соединения родителя использовать нельзя
+            if manager is None or manager._pid != os.getpid():
+                manager = cls(db_path)
+                cls._instances[key] = manager
+            return manager
+
+    def connection(self) -> sqlite3.Connection:
+        """Соединение текущего потока (открывается при первом обращении)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            self._local.depth = 0
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        """Открыть соединение и применить PRAGMA"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=config.DB_BUSY_TIMEOUT / 1000,
+            isolation_level=None,  # транзакциями управляем сами
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f'PRAGMA synchronous = {config.DB_SYNCHRONOUS}')
+        conn.execute(f'PRAGMA cache_size = -{int(config.DB_CACHE_SIZE_KB)}')
+        conn.execute(f'PRAGMA mmap_size = {int(config.DB_MMAP_SIZE)}')
+        conn.execute(f'PRAGMA busy_timeout = {int(config.DB_BUSY_TIMEOUT)}')
+        conn.execute('PRAGMA temp_store = MEMORY')
+
+        with self._lock:
+            self.connections_opened += 1
+            self._connections.append(conn)
+            if not self._schema_ready:
+                self._ensure_schema(conn)
+                self._schema_ready = True
+
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        """Применить миграции, если версия схемы устарела"""
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < SCHEMA_VERSION:
+            apply_migrations(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Транзакция на запись (BEGIN IMMEDIATE).
+
+        Вложенные вызовы в том же потоке выполняются внутри внешней транзакции.
+        Время ожидания блокировки записи учитывается в статистике.
+        """
+        conn = self.connection()
+
+        if self._local.depth > 0:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        started = time.perf_counter()
+        conn.execute('BEGIN IMMEDIATE')
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            self.transactions += 1
+            self.lock_wait_time += waited
+            if waited > 0.001:
+                self.lock_waits += 1
+
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            conn.execute('COMMIT')
+        finally:
+            self._local.depth = 0
+
+    def get_stats(self) -> Dict:
+        """Статистика соединений и блокировок"""
+        with self._lock:
+            return {
+                'connections_opened': self.connections_opened,
+                'transactions': self.transactions,
+                'lock_waits': self.lock_waits,
+                'lock_wait_seconds': round(self.lock_wait_time, 3),
+            }
+
+    def close_all(self):
+        """Закрыть все соединения процесса"""
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
@@ -1,188 +1,445 @@
-import sqlite3
-import shutil
-from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional
-import config
-
-
-class Database:
-    def __init__(self, db_path: str = config.DB_PATH):
-        self.db_path = db_path
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self._init_db()
-
-    def _init_db(self):
-        """Инициализация БД со схемой"""
-        schema_path = Path(__file__).parent / 'schema.sql'
-        with sqlite3.connect(self.db_path) as conn:
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                conn.executescript(f.read())
-
-    def add_account(self, account_id: str, username: str, token_url: str):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO accounts (account_id, username, token_url, status)
-                VALUES (?, ?, ?, 'pending')
-                ON CONFLICT(account_id) DO UPDATE SET
-                    username = excluded.username,
-                    token_url = excluded.token_url,
-                    status = CASE 
-                        WHEN status = 'completed' THEN 'completed'
-                        ELSE 'pending'
-                    END
-            ''', (account_id, username, token_url))
-
-    def update_account_token(self, account_id: str, token_url: str):
-        """Обновить токен-ссылку"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                UPDATE accounts 
-                SET token_url = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = ?
-            ''', (token_url, account_id))
-
-    def update_account_status(self, account_id: str, status: str, last_page: int = None):
-        """Обновить статус аккаунта"""
-        with sqlite3.connect(self.db_path) as conn:
-            if last_page is not None:
-                conn.execute('''
-                    UPDATE accounts 
-                    SET status = ?, last_page = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE account_id = ?
-                ''', (status, last_page, account_id))
-            else:
-                conn.execute('''
-                    UPDATE accounts 
-                    SET status = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE account_id = ?
-                ''', (status, account_id))
-
-    def add_phones(self, account_id: str, phone_numbers: List[str]):
-        """Добавить номера (с дедупликацией)"""
-        with sqlite3.connect(self.db_path) as conn:
-            added = 0
-            for phone in phone_numbers:
-                try:
-                    conn.execute('''
-                        INSERT INTO phones (account_id, phone_number)
-                        VALUES (?, ?)
-                    ''', (account_id, phone))
-                    added += 1
-                except sqlite3.IntegrityError:
-                    # Номер уже есть в БД
-                    pass
-
-            # Обновить счетчик
-            conn.execute('''
-                UPDATE accounts 
-                SET phones_count = (
-                    SELECT COUNT(*) FROM phones WHERE account_id = ?
-                )
-                WHERE account_id = ?
-            ''', (account_id, account_id))
-
-            return added
-
-    def get_accounts_by_status(self, status: str) -> List[Dict]:
-        """Получить аккаунты по статусу"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM accounts WHERE status = ?
-                ORDER BY id
-            ''', (status,))
-            return [dict(row) for row in cursor.fetchall()]
-
-    def get_account(self, account_id: str) -> Optional[Dict]:
-        """Получить аккаунт по ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM accounts WHERE account_id = ?
-            ''', (account_id,))
-            row = cursor.fetchone()
-            return dict(row) if row else None
-
-    def get_all_accounts_summary(self) -> List[Dict]:
-        """Получить сводку по всем аккаунтам"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT account_id, username, status, phones_count
-                FROM accounts
-                ORDER BY id
-            ''')
-            return [dict(row) for row in cursor.fetchall()]
-
-    def get_total_phones(self) -> int:
-        """Получить общее количество уникальных номеров"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('SELECT COUNT(*) FROM phones')
-            return cursor.fetchone()[0]
-
-    def backup(self):
-        """Создать резервную копию БД"""
-        Path(config.BACKUP_DIR).mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_path = f"{config.BACKUP_DIR}/phones_backup_{timestamp}.db"
-        shutil.copy2(self.db_path, backup_path)
-        return backup_path
-
-    # НОВЫЕ МЕТОДЫ ДЛЯ ПАРАЛЛЕЛИЗАЦИИ
-
-    def acquire_account_for_processing(self) -> Optional[Dict]:
-        """
-        Атомарно получить следующий аккаунт для обработки
-        (thread-safe операция для мультипроцессинга)
-        """
-        with sqlite3.connect(self.db_path, timeout=30) as conn:
-            conn.row_factory = sqlite3.Row
-
-            # Начинаем транзакцию
-            conn.execute('BEGIN IMMEDIATE')
-
-            try:
-                # Ищем аккаунт со статусом pending или in_progress
-                cursor = conn.execute('''
-                    SELECT * FROM accounts 
-                    WHERE status IN ('pending', 'in_progress')
-                    ORDER BY 
-                        CASE status 
-                            WHEN 'in_progress' THEN 1 
-                            WHEN 'pending' THEN 2 
-                        END,
-                        id
-                    LIMIT 1
-                ''')
-
-                account = cursor.fetchone()
-
-                if account:
-                    # Помечаем как обрабатываемый
-                    account_id = account['account_id']
-                    conn.execute('''
-                        UPDATE accounts 
-                        SET status = 'in_progress', updated_at = CURRENT_TIMESTAMP
-                        WHERE account_id = ?
-                    ''', (account_id,))
-
-                    conn.commit()
-                    return dict(account)
-                else:
-                    conn.rollback()
-                    return None
-
-            except Exception as e:
-                conn.rollback()
-                raise e
-
-    def get_pending_count(self) -> int:
-        """Получить количество необработанных аккаунтов"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute('''
-                SELECT COUNT(*) FROM accounts 
-                WHERE status IN ('pending', 'in_progress')
-            ''')
-            return cursor.fetchone()[0]
-    
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Set
+import config
+from utils.logger import logger
+from database.connection import ConnectionManager
+from database.backup import create_backup
+from database.migrations import get_phone_storage, convert_phone_storage
+from database.page_bitmap import set_page, done_pages, contiguous_done
+
+
+class Database:
+    def __init__(self, db_path: str = config.DB_PATH,
+                 phone_storage: str = config.PHONE_STORAGE):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Одно соединение на поток, схема применяется при первом открытии
+        self.connections = ConnectionManager.for_path(db_path)
+        self.connections.connection()
+        self._ensure_phone_storage(phone_storage)
+
+    def _ensure_phone_storage(self, storage: str):
+        """Пустую таблицу phones сразу переводим на нужный вариант хранения"""
+        if self.get_phone_storage() != storage and self.get_total_phones() == 0:
+            self.migrate_phone_storage(storage)
+
+    def check_phone_storage(self, storage: str = config.PHONE_STORAGE) -> bool:
+        """
+        Предупредить, если номера хранятся не в режиме из config
+
+        Вызывается один раз при запуске (main), а не при каждом
+        Database(): воркеры и потоки открывают базу многократно.
+        """
+        current = self.get_phone_storage()
+        if current == storage:
+            return True
+        logger.warning(
+            f"⚠️ Номера хранятся в режиме '{current}', в config указан '{storage}'. "
+            f"Запустите --mode migrate --storage {storage}")
+        return False
+
+    def get_phone_storage(self) -> str:
+        """Вариант хранения номеров: 'text' или 'integer'"""
+        return get_phone_storage(self.connections.connection())
+
+    def migrate_phone_storage(self, storage: str, vacuum: bool = False) -> int:
+        """
+        Перевести таблицу phones на другой вариант хранения
+
+        Args:
+            storage: 'text' или 'integer'
+            vacuum: Сжать файл БД после миграции
+
+        Returns:
+            Количество перенесенных номеров
+        """
+        with self.connections.transaction() as conn:
+            if get_phone_storage(conn) == storage:
+                return self.get_total_phones()
+            moved = convert_phone_storage(conn, storage)
+
+        if vacuum:
+            self.connections.connection().execute('VACUUM')
+        return moved
+
+    def get_connection_stats(self) -> Dict:
+        """Статистика соединений и ожидания блокировок"""
+        return self.connections.get_stats()
+
+    def add_account(self, account_id: str, username: str, token_url: Optional[str]):
+        """
+        Добавить аккаунт или обновить его токен
+
+        token_url=None (токен сгенерирует воркер) не затирает сохраненный
+        токен; аккаунт, который сейчас обрабатывает воркер, остается в работе,
+        а отложенный (parked) возвращается в очередь только после retry_after.
+        """
+        with self.connections.transaction() as conn:
+            conn.execute('''
+                INSERT INTO accounts (account_id, username, token_url, status, token_created_at)
+                VALUES (?, ?, ?, 'pending', CASE WHEN ? IS NULL THEN NULL ELSE CURRENT_TIMESTAMP END)
+                ON CONFLICT(account_id) DO UPDATE SET
+                    username = excluded.username,
+                    token_url = COALESCE(excluded.token_url, token_url),
+                    token_created_at = COALESCE(excluded.token_created_at, token_created_at),
+                    status = CASE 
+                        WHEN status IN ('completed', 'in_progress') THEN status
+                        WHEN status = 'parked'
+                             AND (retry_after IS NULL OR retry_after > ?) THEN status
+                        ELSE 'pending'
+                    END
+            ''', (account_id, username, token_url, token_url, time.time()))
+
+    def update_account_token(self, account_id: str, token_url: str):
+        """Обновить токен-ссылку"""
+        with self.connections.transaction() as conn:
+            conn.execute('''
+                UPDATE accounts 
+                SET token_url = ?, token_created_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE account_id = ?
+            ''', (token_url, account_id))
+
+    def get_valid_tokens(self, account_ids: List[str],
+                         max_age_hours: float = config.TOKEN_MAX_AGE_HOURS) -> Dict[str, str]:
+        """
+        Токены аккаунтов, которые еще не устарели
+
+        Args:
+            max_age_hours: Срок жизни токена; 0 — токены не устаревают
+
+        Returns:
+            account_id -> token_url для аккаунтов с действующим токеном
+        """
+        if not account_ids:
+            return {}
+        conn = self.connections.connection()
+        placeholders = ','.join('?' * len(account_ids))
+        query = f'''
+            SELECT account_id, token_url FROM accounts
+            WHERE account_id IN ({placeholders}) AND token_url IS NOT NULL
+        '''
+        params = list(account_ids)
+        if max_age_hours:
+            query += " AND token_created_at >= datetime('now', ?)"
+            params.append(f'-{max_age_hours} hours')
+        return {row[0]: row[1] for row in conn.execute(query, params).fetchall()}
+
+    def get_harvest_checkpoint(self, mode: str) -> Optional[Dict]:
+        """Точка продолжения сбора аккаунтов для режима обхода списка"""
+        conn = self.connections.connection()
+        row = conn.execute('''
+            SELECT listing_page, last_account_id, updated_at
+            FROM harvest_checkpoint WHERE mode = ?
+        ''', (mode,)).fetchone()
+        return dict(row) if row else None
+
+    def save_harvest_checkpoint(self, mode: str, listing_page: int, last_account_id: str):
+        """Запомнить последнюю полностью обработанную страницу списка"""
+        with self.connections.transaction() as conn:
+            conn.execute('''
+                INSERT INTO harvest_checkpoint (mode, listing_page, last_account_id, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(mode) DO UPDATE SET
+                    listing_page = excluded.listing_page,
+                    last_account_id = excluded.last_account_id,
+                    updated_at = excluded.updated_at
+            ''', (mode, listing_page, last_account_id))
+
+    def clear_harvest_checkpoint(self):
+        """Сбор завершен (или начинается заново) — точка продолжения не нужна"""
+        with self.connections.transaction() as conn:
+            conn.execute('DELETE FROM harvest_checkpoint')
+
+    def update_account_status(self, account_id: str, status: str, last_page: int = None):
+        """Обновить статус аккаунта (аренда снимается при выходе из in_progress)"""
+        with self.connections.transaction() as conn:
+            if last_page is not None:
+                conn.execute('''
+                    UPDATE accounts 
+                    SET status = ?, last_page = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE account_id = ?
+                ''', (status, last_page, account_id))
+            else:
+                conn.execute('''
+                    UPDATE accounts 
+                    SET status = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE account_id = ?
+                ''', (status, account_id))
+
+            if status != 'in_progress':
+                conn.execute('''
+                    UPDATE accounts 
+                    SET lease_owner = NULL, lease_expires_at = NULL
+                    WHERE account_id = ?
+                ''', (account_id,))
+
+            # Успешная обработка сбрасывает счетчик неудач
+            if status == 'completed':
+                conn.execute('''
+                    UPDATE accounts 
+                    SET fail_count = 0, last_error = NULL, retry_after = NULL
+                    WHERE account_id = ?
+                ''', (account_id,))
+
+    def record_account_failure(self, account_id: str, error: str,
+                               threshold: int = config.CIRCUIT_BREAKER_THRESHOLD,
+                               retry_delay: float = config.ACCOUNT_RETRY_DELAY,
+                               max_retry_delay: float = config.ACCOUNT_RETRY_MAX_DELAY) -> str:
+        """
+        Учесть неудачную обработку аккаунта (circuit breaker)
+
+        Аккаунт возвращается в очередь ('pending') с сохраненным прогрессом,
+        а после threshold неудач подряд откладывается ('parked') и больше
+        не захватывается воркерами до ручного сброса.
+
+        Повторный захват возможен не раньше retry_after: пауза retry_delay
+        удваивается с каждой неудачей подряд (до max_retry_delay), чтобы
+        короткий сбой CRM не исчерпал попытки за секунды.
+
+        Returns:
+            Новый статус аккаунта
+        """
+        with self.connections.transaction() as conn:
+            row = conn.execute('''
+                UPDATE accounts 
+                SET fail_count = fail_count + 1,
+                    status = CASE WHEN fail_count + 1 >= ? THEN 'parked' ELSE 'pending' END,
+                    last_error = ?,
+                    retry_after = ? + MIN(? * (1 << MIN(fail_count, 16)), ?),
+                    lease_owner = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE account_id = ?
+                RETURNING status
+            ''', (threshold, error, time.time(), retry_delay, max_retry_delay,
+                  account_id)).fetchone()
+            return row['status'] if row else 'pending'
+
+    def add_phones(self, account_id: str, phone_numbers: List[str]) -> int:
+        """Добавить номера (с дедупликацией)"""
+        with self.connections.transaction() as conn:
+            return self._insert_phones(conn, account_id, phone_numbers)
+
+    def add_phones_page(self, account_id: str, phone_numbers: List[str], page: int) -> int:
+        """
+        Сохранить страницу номеров и прогресс аккаунта одной транзакцией
+
+        Returns:
+            Количество новых (ранее не встречавшихся) номеров
+        """
+        with self.connections.transaction() as conn:
+            added = self._insert_phones(conn, account_id, phone_numbers)
+
+            # Страница отмечается в битовой карте, last_page — непрерывный
+            # префикс обработанных страниц (страницы могут идти не по порядку)
+            row = conn.execute(
+                'SELECT last_page, pages_done FROM accounts WHERE account_id = ?',
+                (account_id,)
+            ).fetchone()
+            previous, last_page = (row['pages_done'], row['last_page'] or 0) if row else (None, 0)
+            pages_done = set_page(previous, page)
+            last_page = contiguous_done(pages_done, last_page)
+
+            conn.execute('''
+                UPDATE accounts 
+                SET status = 'in_progress', last_page = ?, pages_done = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE account_id = ?
+            ''', (last_page, pages_done, account_id))
+            return added
+
+    def set_total_pages(self, account_id: str, total_pages: int):
+        """Запомнить число страниц аккаунта, найденное на первой странице"""
+        with self.connections.transaction() as conn:
+            conn.execute(
+                'UPDATE accounts SET total_pages = ? WHERE account_id = ?',
+                (total_pages, account_id))
+
+    def get_done_pages(self, account_id: str) -> Set[int]:
+        """Обработанные страницы аккаунта (префикс last_page и битовая карта)"""
+        conn = self.connections.connection()
+        row = conn.execute(
+            'SELECT last_page, pages_done FROM accounts WHERE account_id = ?',
+            (account_id,)
+        ).fetchone()
+        if row is None:
+            return set()
+        return set(range(1, (row['last_page'] or 0) + 1)) | done_pages(row['pages_done'])
+
+    def _insert_phones(self, conn: sqlite3.Connection, account_id: str,
+                       phone_numbers: List[str]) -> int:
+        """Пакетная вставка номеров, дубликаты пропускаются на уровне SQLite"""
+        cursor = conn.executemany('''
+            INSERT OR IGNORE INTO phones (account_id, phone_number)
+            VALUES (?, ?)
+        ''', [(account_id, phone) for phone in phone_numbers])
+        # rowcount у executemany — сумма changes() по всем строкам; изменения,
+        # сделанные триггерами (phones_count, stats), в него не входят
+        return cursor.rowcount
+
+    def get_accounts_by_status(self, status: str) -> List[Dict]:
+        """Получить аккаунты по статусу"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT * FROM accounts WHERE status = ?
+            ORDER BY id
+        ''', (status,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_account(self, account_id: str) -> Optional[Dict]:
+        """Получить аккаунт по ID"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT * FROM accounts WHERE account_id = ?
+        ''', (account_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_all_accounts_summary(self) -> List[Dict]:
+        """Получить сводку по всем аккаунтам"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT account_id, username, status, phones_count
+            FROM accounts
+            ORDER BY id
+        ''')
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_account_phones(self, account_id: str) -> List[str]:
+        """Номера аккаунта (всегда строками, независимо от варианта хранения)"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT CAST(phone_number AS TEXT) FROM phones WHERE account_id = ?
+        ''', (account_id,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_total_phones(self) -> int:
+        """Получить общее количество уникальных номеров"""
+        return self._get_stat('phones:total')
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Количество аккаунтов по статусам (из счетчиков, без сканирования)"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT substr(key, 10), value FROM stats
+            WHERE key LIKE 'accounts:%' AND key != 'accounts:total' AND value != 0
+            ORDER BY key
+        ''')
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    def count_accounts(self) -> int:
+        """Общее количество аккаунтов"""
+        return self._get_stat('accounts:total')
+
+    def _get_stat(self, key: str) -> int:
+        conn = self.connections.connection()
+        row = conn.execute('SELECT value FROM stats WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def backup(self) -> str:
+        """Создать резервную копию БД (онлайн, со сжатием и ротацией)"""
+        return create_backup(self.db_path)
+
+    # НОВЫЕ МЕТОДЫ ДЛЯ ПАРАЛЛЕЛИЗАЦИИ
+
+    def acquire_account_for_processing(self, worker_id: str = 'main') -> Optional[Dict]:
+        """
+        Атомарно получить следующий аккаунт для обработки
+        (thread-safe операция для мультипроцессинга)
+        """
+        accounts = self.claim_accounts(worker_id, limit=1)
+        return accounts[0] if accounts else None
+
+    def claim_accounts(self, worker_id: str, limit: int = config.CLAIM_BATCH_SIZE,
+                       lease_seconds: int = config.LEASE_DURATION) -> List[Dict]:
+        """
+        Захватить до limit аккаунтов в аренду одним UPDATE ... RETURNING
+
+        Берутся pending-аккаунты (кроме ждущих retry_after после неудачи)
+        и in_progress-аккаунты с истекшей арендой (или без аренды — их
+        владелец неизвестен). Аккаунты, арендованные живыми воркерами, не
+        трогаются.
+        """
+        now = time.time()
+        with self.connections.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE accounts 
+                SET status = 'in_progress',
+                    lease_owner = ?,
+                    lease_expires_at = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN (
+                    SELECT id FROM accounts 
+                    WHERE (status = 'pending'
+                           AND (retry_after IS NULL OR retry_after <= ?))
+                       OR (status = 'in_progress'
+                           AND (lease_expires_at IS NULL OR lease_expires_at < ?))
+                    ORDER BY 
+                        CASE status 
+                            WHEN 'in_progress' THEN 1 
+                            WHEN 'pending' THEN 2 
+                        END,
+                        id
+                    LIMIT ?
+                )
+                RETURNING *
+            ''', (worker_id, now + lease_seconds, now, now, limit))
+            accounts = [dict(row) for row in cursor.fetchall()]
+
+        return sorted(accounts, key=lambda account: account['id'])
+
+    def get_retry_wait(self) -> Optional[float]:
+        """
+        Сколько ждать, пока аккаунт на паузе после неудачи станет доступен
+
+        Returns:
+            Секунды до ближайшего retry_after или None, если таких аккаунтов нет
+        """
+        conn = self.connections.connection()
+        row = conn.execute('''
+            SELECT MIN(retry_after) FROM accounts
+            WHERE status = 'pending' AND retry_after > ?
+        ''', (time.time(),)).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def renew_leases(self, worker_id: str, lease_seconds: int = config.LEASE_DURATION) -> int:
+        """Продлить аренду всех аккаунтов воркера (heartbeat)"""
+        with self.connections.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE accounts 
+                SET lease_expires_at = ?
+                WHERE lease_owner = ? AND status = 'in_progress'
+            ''', (time.time() + lease_seconds, worker_id))
+            return cursor.rowcount
+
+    def release_leases(self, worker_id: str) -> int:
+        """Вернуть в очередь аккаунты, которые воркер захватил, но не обработал"""
+        with self.connections.transaction() as conn:
+            cursor = conn.execute('''
+                UPDATE accounts 
+                SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE lease_owner = ? AND status = 'in_progress'
+            ''', (worker_id,))
+            return cursor.rowcount
+
+    def owns_lease(self, account_id: str, worker_id: str) -> bool:
+        """Аккаунт все еще арендован этим воркером"""
+        conn = self.connections.connection()
+        cursor = conn.execute('''
+            SELECT 1 FROM accounts 
+            WHERE account_id = ? AND lease_owner = ? AND status = 'in_progress'
+        ''', (account_id, worker_id))
+        return cursor.fetchone() is not None
+
+    def count_accounts_by_status(self, status: str) -> int:
+        """Количество аккаунтов с указанным статусом"""
+        return self._get_stat(f'accounts:{status}')
+
+    def get_pending_count(self) -> int:
+        """Получить количество необработанных аккаунтов"""
+        return self.count_accounts_by_status('pending') + \
+            self.count_accounts_by_status('in_progress')
@@ -0,0 +1,43 @@
+import os
+import socket
+import threading
+import config
+from utils.logger import logger
+
+
+def make_worker_id(worker_id: int, pid: int = None) -> str:
+    """Уникальный идентификатор воркера для аренды аккаунтов (pid — другого процесса)"""
+    return f"{socket.gethostname()}:{pid or os.getpid()}:w{worker_id}"
+
+
+class LeaseHeartbeat:
+    """
+    Фоновое продление аренды аккаунтов воркера
+
+    Пока воркер жив, его аккаунты не может забрать другой воркер. Если процесс
+    упал, продления прекращаются и аренда истекает через LEASE_DURATION.
+    """
+
+    def __init__(self, db, owner: str, interval: float = config.LEASE_HEARTBEAT_INTERVAL):
+        self.db = db
+        self.owner = owner
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(
+            target=self._run, name=f'heartbeat-{self.owner}', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.db.renew_leases(self.owner)
+            except Exception as e:
+                logger.warning(f"⚠️ Не удалось продлить аренду ({self.owner}): {e}")
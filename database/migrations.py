@@ -0,0 +1,255 @@
+import sqlite3
+from pathlib import Path
+
+
+def _base_schema(conn: sqlite3.Connection):
+    """Версия 1: исходная схема из schema.sql"""
+    schema_path = Path(__file__).parent / 'schema.sql'
+    with open(schema_path, 'r', encoding='utf-8') as f:
+        schema = f.read()
+    # executescript сам делает COMMIT, поэтому выполняем по одному выражению
+    for statement in schema.split(';'):
+        if statement.strip():
+            conn.execute(statement)
+
+
+def _bump(key: str, delta: str) -> str:
+    """UPSERT счетчика в таблице stats (для тел триггеров)"""
+    return (f"INSERT INTO stats (key, value) VALUES ({key}, {delta}) "
+            f"ON CONFLICT(key) DO UPDATE SET value = value + ({delta});")
+
+
+# Триггеры счетчиков по таблице phones. Пересоздаются при смене
+# варианта хранения номеров, т.к. DROP TABLE удаляет и триггеры
+PHONE_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_phones_insert AFTER INSERT ON phones
+    BEGIN
+        {_bump("'phones:total'", '1')}
+        UPDATE accounts SET phones_count = phones_count + 1
+        WHERE account_id = NEW.account_id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_phones_delete AFTER DELETE ON phones
+    BEGIN
+        {_bump("'phones:total'", '-1')}
+        UPDATE accounts SET phones_count = phones_count - 1
+        WHERE account_id = OLD.account_id;
+    END
+    ''',
+]
+
+ACCOUNT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_accounts_insert AFTER INSERT ON accounts
+    BEGIN
+        {_bump("'accounts:total'", '1')}
+        {_bump("'accounts:' || IFNULL(NEW.status, '')", '1')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_accounts_status AFTER UPDATE OF status ON accounts
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        {_bump("'accounts:' || IFNULL(OLD.status, '')", '-1')}
+        {_bump("'accounts:' || IFNULL(NEW.status, '')", '1')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_accounts_delete AFTER DELETE ON accounts
+    BEGIN
+        {_bump("'accounts:total'", '-1')}
+        {_bump("'accounts:' || IFNULL(OLD.status, '')", '-1')}
+    END
+    ''',
+]
+
+
+def _create_phone_triggers(conn: sqlite3.Connection):
+    for trigger in PHONE_TRIGGERS:
+        conn.execute(trigger)
+
+
+def _rebuild_stats(conn: sqlite3.Connection):
+    """Пересчитать счетчики по текущим данным"""
+    conn.execute('DELETE FROM stats')
+    conn.execute('''
+        INSERT INTO stats (key, value)
+        SELECT 'accounts:' || IFNULL(status, ''), COUNT(*) FROM accounts GROUP BY status
+    ''')
+    conn.execute("INSERT INTO stats (key, value) SELECT 'accounts:total', COUNT(*) FROM accounts")
+    conn.execute("INSERT INTO stats (key, value) SELECT 'phones:total', COUNT(*) FROM phones")
+    conn.execute('''
+        UPDATE accounts SET phones_count = (
+            SELECT COUNT(*) FROM phones WHERE phones.account_id = accounts.account_id
+        )
+    ''')
+
+
+# (версия, шаги) — шаг это SQL-выражение или функция(conn)
+MIGRATIONS = [
+    (1, [_base_schema]),
+    # Аренда аккаунтов воркерами
+    (2, [
+        'ALTER TABLE accounts ADD COLUMN lease_owner TEXT',
+        'ALTER TABLE accounts ADD COLUMN lease_expires_at REAL',
+        'CREATE INDEX IF NOT EXISTS idx_accounts_lease ON accounts(status, lease_expires_at)',
+    ]),
+    # Счетчики статусов и номеров, поддерживаемые триггерами
+    (3, [
+        '''
+        CREATE TABLE IF NOT EXISTS stats (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+        ''',
+        *ACCOUNT_TRIGGERS,
+        *PHONE_TRIGGERS,
+        _rebuild_stats,
+    ]),
+    # Инкрементальный экспорт по created_at
+    (4, [
+        'CREATE INDEX IF NOT EXISTS idx_phones_created ON phones(created_at)',
+    ]),
+    # План страниц аккаунта и битовая карта обработанных страниц
+    (5, [
+        'ALTER TABLE accounts ADD COLUMN total_pages INTEGER',
+        'ALTER TABLE accounts ADD COLUMN pages_done BLOB',
+    ]),
+    # Счетчик неудач подряд для отложенных (parked) аккаунтов
+    (6, [
+        'ALTER TABLE accounts ADD COLUMN fail_count INTEGER NOT NULL DEFAULT 0',
+        'ALTER TABLE accounts ADD COLUMN last_error TEXT',
+    ]),
+    # Возраст токенов и точка продолжения сбора аккаунтов
+    (7, [
+        'ALTER TABLE accounts ADD COLUMN token_created_at TIMESTAMP',
+        '''
+        UPDATE accounts SET token_created_at = COALESCE(updated_at, created_at)
+        WHERE token_url IS NOT NULL
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS harvest_checkpoint (
+            mode TEXT PRIMARY KEY,
+            listing_page INTEGER NOT NULL,
+            last_account_id TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    # Пауза перед повторным захватом аккаунта после неудачи
+    (8, [
+        'ALTER TABLE accounts ADD COLUMN retry_after REAL',
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Варианты хранения таблицы phones
+PHONE_TABLES = {
+    # Номер строкой + AUTOINCREMENT id + UNIQUE индекс (номер хранится дважды)
+    'text': '''
+        CREATE TABLE {name} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            account_id TEXT NOT NULL,
+            phone_number TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(phone_number),
+            FOREIGN KEY (account_id) REFERENCES accounts(account_id)
+        )
+    ''',
+    # Номер 7XXXXXXXXXX как INTEGER-ключ B-дерева без rowid
+    'integer': '''
+        CREATE TABLE {name} (
+            phone_number INTEGER PRIMARY KEY,
+            account_id TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (account_id) REFERENCES accounts(account_id)
+        ) WITHOUT ROWID
+    ''',
+}
+
+
+def get_phone_storage(conn: sqlite3.Connection) -> str:
+    """Текущий вариант хранения номеров: 'text' или 'integer'"""
+    for column in conn.execute('PRAGMA table_info(phones)').fetchall():
+        if column[1] == 'phone_number':
+            return 'integer' if column[2].upper() == 'INTEGER' else 'text'
+    raise sqlite3.OperationalError('Таблица phones не найдена')
+
+
+def convert_phone_storage(conn: sqlite3.Connection, storage: str) -> int:
+    """
+    Перестроить таблицу phones под другой вариант хранения
+
+    Выполняется внутри уже открытой транзакции. Значения, не похожие на
+    номер из 11 цифр, при переходе на INTEGER пропускаются.
+
+    Returns:
+        Количество перенесенных номеров
+    """
+    if storage not in PHONE_TABLES:
+        raise ValueError(f"Неизвестный вариант хранения номеров: {storage}")
+
+    conn.execute('DROP TABLE IF EXISTS phones_new')
+    conn.execute(PHONE_TABLES[storage].format(name='phones_new'))
+
+    if storage == 'integer':
+        conn.execute('''
+            INSERT OR IGNORE INTO phones_new (phone_number, account_id, created_at)
+            SELECT CAST(phone_number AS INTEGER), account_id, created_at
+            FROM phones
+            WHERE length(phone_number) = 11 AND phone_number NOT GLOB '*[^0-9]*'
+        ''')
+    else:
+        conn.execute('''
+            INSERT OR IGNORE INTO phones_new (phone_number, account_id, created_at)
+            SELECT CAST(phone_number AS TEXT), account_id, created_at
+            FROM phones
+            ORDER BY created_at
+        ''')
+
+    moved = conn.execute('SELECT COUNT(*) FROM phones_new').fetchone()[0]
+
+    conn.execute('DROP TABLE phones')
+    conn.execute('ALTER TABLE phones_new RENAME TO phones')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_phones_account ON phones(account_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_phones_created ON phones(created_at)')
+    _create_phone_triggers(conn)
+
+    # Номера с некорректным форматом могли быть отброшены — сверяем счетчики
+    _rebuild_stats(conn)
+
+    return moved
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """
+    Довести схему до SCHEMA_VERSION
+
+    Версия перечитывается под блокировкой записи, поэтому одновременный
+    запуск нескольких процессов безопасен.
+
+    Returns:
+        Версия схемы после миграции
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target_version, steps in MIGRATIONS:
+            if target_version <= version:
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f'PRAGMA user_version = {target_version}')
+            version = target_version
+        conn.execute('COMMIT')
+        return version
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
@@ -0,0 +1,41 @@
+from typing import Optional, Set
+
+
+def set_page(bitmap: Optional[bytes], page: int) -> bytes:
+    """Отметить страницу (нумерация с 1) в битовой карте"""
+    index = page - 1
+    data = bytearray(bitmap or b'')
+    if len(data) <= index // 8:
+        data.extend(b'\x00' * (index // 8 + 1 - len(data)))
+    data[index // 8] |= 1 << (index % 8)
+    return bytes(data)
+
+
+def is_page_done(bitmap: Optional[bytes], page: int) -> bool:
+    index = page - 1
+    if not bitmap or index < 0 or index // 8 >= len(bitmap):
+        return False
+    return bool(bitmap[index // 8] & (1 << (index % 8)))
+
+
+def done_pages(bitmap: Optional[bytes]) -> Set[int]:
+    """Номера отмеченных страниц"""
+    pages = set()
+    for byte_index, byte in enumerate(bitmap or b''):
+        for bit in range(8):
+            if byte & (1 << bit):
+                pages.add(byte_index * 8 + bit + 1)
+    return pages
+
+
+def contiguous_done(bitmap: Optional[bytes], last_page: int = 0) -> int:
+    """
+    Последняя страница непрерывного префикса обработанных страниц
+
+    Страницы до last_page считаются обработанными (прогресс, записанный
+    до появления битовой карты).
+    """
+    page = last_page
+    while is_page_done(bitmap, page + 1):
+        page += 1
+    return page
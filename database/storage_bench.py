@@ -0,0 +1,96 @@
+"""
+Сравнение вариантов хранения номеров на большом объеме
+
+Запуск:
+    python -m database.storage_bench --rows 10000000
+"""
+import os
+import random
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from database.db import Database
+
+
+def _random_phones(count: int, seed: int):
+    rnd = random.Random(seed)
+    return [f"7{rnd.randrange(10 ** 10):010d}" for _ in range(count)]
+
+
+def _lookup_probes(rows: int, batch_size: int, lookups: int):
+    """Половина — вставленные номера из разных пачек, половина — отсутствующие"""
+    rnd = random.Random(42)
+    existing = []
+    batch_starts = list(range(0, rows, batch_size))
+    per_batch = 100
+    while len(existing) < lookups // 2:
+        batch_start = rnd.choice(batch_starts)
+        batch = _random_phones(min(batch_size, rows - batch_start), seed=batch_start)
+        existing.extend(rnd.sample(batch, min(per_batch, len(batch))))
+    missing = _random_phones(lookups - lookups // 2, seed=-1)
+    probes = existing[:lookups // 2] + missing
+    rnd.shuffle(probes)
+    return probes
+
+
+def run_benchmark(storage: str, rows: int, batch_size: int, lookups: int, workdir: str) -> dict:
+    """Вставка rows номеров пачками и lookups точечных поисков"""
+    db_path = os.path.join(workdir, f'bench_{storage}.db')
+    db = Database(db_path, phone_storage=storage)
+    db.add_account('bench', 'bench', None)
+
+    started = time.perf_counter()
+    inserted = 0
+    for batch_start in range(0, rows, batch_size):
+        phones = _random_phones(min(batch_size, rows - batch_start), seed=batch_start)
+        inserted += db.add_phones('bench', phones)
+    insert_time = time.perf_counter() - started
+
+    conn = db.connections.connection()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    size_mb = Path(db_path).stat().st_size / 1024 / 1024
+
+    probes = _lookup_probes(rows, batch_size, lookups)
+    started = time.perf_counter()
+    found = 0
+    for phone in probes:
+        if conn.execute('SELECT 1 FROM phones WHERE phone_number = ?', (phone,)).fetchone():
+            found += 1
+    lookup_time = time.perf_counter() - started
+
+    db.connections.close_all()
+
+    return {
+        'storage': storage,
+        'rows': inserted,
+        'size_mb': size_mb,
+        'insert_rows_per_sec': inserted / insert_time,
+        'lookups_per_sec': lookups / lookup_time,
+        'found': found,
+    }
+
+
+def main():
+    parser = ArgumentParser(description='Бенчмарк хранения номеров')
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    parser.add_argument('--dir', default=None, help='Каталог для временных БД')
+    args = parser.parse_args()
+
+    workdir = args.dir or tempfile.mkdtemp(prefix='phones_bench_')
+    print(f"Каталог: {workdir}")
+
+    for storage in ('text', 'integer'):
+        result = run_benchmark(storage, args.rows, args.batch_size, args.lookups, workdir)
+        print(
+            f"{result['storage']:>8}: {result['rows']:,} номеров, "
+            f"{result['size_mb']:.0f} МБ, "
+            f"вставка {result['insert_rows_per_sec']:,.0f} строк/сек, "
+            f"поиск {result['lookups_per_sec']:,.0f} запросов/сек "
+            f"(найдено {result['found']:,})")
+
+
+if __name__ == '__main__':
+    main()
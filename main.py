@@ -1,302 +1,447 @@
-import sys
-import time
-import random
-import signal
-import sqlite3
-from pathlib import Path
-from argparse import ArgumentParser
-import config
-from database.db import Database
-from scraper.browser import BrowserManager
-from scraper.auth import login_to_admin
-from scraper.harvester import AccountHarvester
-from scraper.phone_scraper import PhoneScraper
-from utils.report import generate_excel_report
-from utils.logger import logger
-from scraper.parallel_scraper import ParallelScraper
-
-
-class ScraperOrchestrator:
-    """Главный оркестратор процесса парсинга"""
-
-    def __init__(self):
-        self.db = Database()
-        self.interrupted = False
-        self.accounts_processed = 0
-
-        # Обработка Ctrl+C
-        signal.signal(signal.SIGINT, self._signal_handler)
-
-    def _signal_handler(self, sig, frame):
-        """Обработчик прерывания"""
-        logger.warning(
-            "\n⚠️ Получен сигнал остановки. Завершаем текущую операцию...")
-        self.interrupted = True
-
-    def run_harvest(self):
-        """Фаза 1: Сбор аккаунтов и генерация токенов"""
-        logger.info("=" * 60)
-        logger.info("🌾 ФАЗА 1: Сбор аккаунтов и генерация токенов")
-        logger.info("=" * 60)
-
-        with BrowserManager() as browser:
-            page = browser.new_page()
-
-            # Авторизация
-            if not login_to_admin(page):
-                logger.error(
-                    "❌ Не удалось авторизоваться. Проверьте credentials в .env")
-                return False
-
-            # Сбор аккаунтов
-            harvester = AccountHarvester(page, self.db)
-            harvester.harvest_all_accounts()
-
-        return True
-
-    def run_scrape(self):
-        """Фаза 2: Парсинг номеров из аккаунтов"""
-        logger.info("=" * 60)
-        logger.info("📞 ФАЗА 2: Парсинг номеров из аккаунтов")
-        logger.info("=" * 60)
-
-        # Получаем аккаунты для обработки
-        pending_accounts = self.db.get_accounts_by_status('pending')
-        in_progress_accounts = self.db.get_accounts_by_status('in_progress')
-
-        accounts_to_process = in_progress_accounts + pending_accounts
-        total = len(accounts_to_process)
-
-        if total == 0:
-            logger.info("✅ Все аккаунты уже обработаны!")
-            return True
-
-        logger.info(f"📋 Аккаунтов к обработке: {total}")
-        logger.info(f"   • В процессе: {len(in_progress_accounts)}")
-        logger.info(f"   • Ожидают: {len(pending_accounts)}")
-
-        with BrowserManager() as browser:
-            page = browser.new_page()
-            scraper = PhoneScraper(page, self.db)
-
-            for idx, account in enumerate(accounts_to_process, 1):
-                if self.interrupted:
-                    logger.warning("⏸️ Парсинг приостановлен пользователем")
-                    break
-
-                account_id = account['account_id']
-                username = account['username']
-                token_url = account['token_url']
-                last_page = account['last_page']
-
-                logger.info(
-                    f"\n[{idx}/{total}] 🔄 Обработка: {username} (ID: {account_id})")
-
-                if not token_url:
-                    logger.error(
-                        f"❌ Нет токен-ссылки для аккаунта {account_id}")
-                    self.db.update_account_status(account_id, 'failed')
-                    continue
-
-                # Парсинг номеров
-                start_page = last_page + 1 if last_page > 0 else 1
-                scraper.scrape_account(account_id, token_url, start_page)
-
-                self.accounts_processed += 1
-
-                # Резервное копирование
-                if self.accounts_processed % config.BACKUP_INTERVAL == 0:
-                    backup_path = self.db.backup()
-                    logger.info(f"💾 Создан бэкап: {backup_path}")
-
-                # Задержка между аккаунтами
-                if idx < total:
-                    delay = random.uniform(*config.DELAY_BETWEEN_ACCOUNTS)
-                    logger.info(
-                        f"⏳ Ожидание {delay:.1f}сек перед следующим аккаунтом...")
-                    time.sleep(delay)
-
-        # Финальный бэкап
-        if self.accounts_processed > 0:
-            backup_path = self.db.backup()
-            logger.info(f"💾 Финальный бэкап: {backup_path}")
-
-        return True
-
-    def run_full(self):
-        """Полный цикл: сбор + парсинг"""
-        logger.info("🚀 ЗАПУСК ПОЛНОГО ЦИКЛА ПАРСИНГА")
-
-        # Фаза 1
-        if not self.run_harvest():
-            return False
-
-        if self.interrupted:
-            return False
-
-        # Пауза между фазами
-        logger.info("\n⏳ Пауза 5 секунд перед началом парсинга номеров...")
-        time.sleep(5)
-
-        # Фаза 2
-        return self.run_scrape()
-
-    def resume(self):
-        """Возобновление прерванной работы"""
-        logger.info("🔄 ВОЗОБНОВЛЕНИЕ ПАРСИНГА")
-        return self.run_scrape()
-
-    def generate_report(self):
-        """Генерация отчета"""
-        generate_excel_report(self.db)
-
-    # ✅ ИСПРАВЛЕНИЕ (в main.py, строки 172-192)
-    @staticmethod
-    def show_stats():
-        db = Database()
-        
-        logger.info("📊 Статистика аккаунтов:")
-        
-        # Получаем статистику через SQL
-        with sqlite3.connect(config.DB_PATH) as conn:
-            cursor = conn.execute('''
-                SELECT status, COUNT(*) as count 
-                FROM accounts 
-                GROUP BY status
-            ''')
-            for row in cursor:
-                logger.info(f"   {row[0]}: {row[1]}")
-        
-        # Общие данные через методы Database
-        logger.info(f"\n📋 Всего аккаунтов: {len(db.get_all_accounts_summary())}")
-        logger.info(f"📞 Всего номеров: {db.get_total_phones()}")
-
-
-def main():
-    # ИСПРАВЛЕНИЕ: Создаем parser перед использованием
-    parser = ArgumentParser(
-        description='CRM Scraper - Автоматизация парсинга номеров')
-    parser.add_argument(
-        '--mode',
-        choices=['full', 'harvest', 'scrape', 'report',
-                 'parallel', 'clear'],  # ДОБАВЛЕНО clear
-        default='full',
-        help='Режим работы'
-    )
-    parser.add_argument(
-        '--clear',
-        choices=['tokens', 'accounts', 'phones',
-                 'all', 'reset-failed', 'reset-progress'],
-        help='Тип очистки (используется с --mode clear)'
-    )
-
-    parser.add_argument(
-        '--workers',
-        type=int,
-        default=config.MAX_WORKERS,
-        help=f'Количество параллельных воркеров (по умолчанию: {config.MAX_WORKERS})'
-    )
-    parser.add_argument(
-        '--resume',
-        action='store_true',
-        help='Возобновить прерванную работу'
-    )
-    parser.add_argument(
-        '--headless',
-        action='store_true',
-        default=True,
-        help='Запуск браузера в headless режиме'
-    )
-
-    args = parser.parse_args()
-
-    # Проверка credentials
-    if not config.ADMIN_LOGIN or not config.ADMIN_PASSWORD:
-        logger.error("❌ Не заданы ADMIN_LOGIN и ADMIN_PASSWORD в файле .env")
-        sys.exit(1)
-
-    # Установка headless режима
-    config.HEADLESS = args.headless
-
-    # Запуск
-    orchestrator = ScraperOrchestrator()
-
-    try:
-        if args.resume:
-            orchestrator.resume()
-        elif args.mode == 'full':
-            orchestrator.run_full()
-        elif args.mode == 'harvest':
-            orchestrator.run_harvest()
-        elif args.mode == 'scrape':
-            orchestrator.run_scrape()
-        elif args.mode == 'parallel':
-            parallel_scraper = ParallelScraper(max_workers=args.workers)
-            parallel_scraper.run()
-        elif args.mode == 'report':
-            orchestrator.generate_report()
-        elif args.mode == 'clear':
-            if not args.clear:
-                logger.error(
-                    "❌ Укажите тип очистки: --clear <tokens|accounts|phones|all>")
-                sys.exit(1)
-
-            # Подтверждение
-            confirm = input(
-                f"⚠️ Подтверждаете очистку '{args.clear}'? (yes/no): ")
-            if confirm.lower() not in ['yes', 'y', 'да']:
-                logger.info("❌ Отменено")
-                return
-
-            import sqlite3
-
-            if args.clear == 'tokens':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    conn.execute(
-                        'UPDATE accounts SET token_url = NULL, status = "pending"')
-                logger.info("✅ Токены очищены")
-
-            elif args.clear == 'accounts':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    conn.execute('DELETE FROM accounts')
-                logger.info("✅ Аккаунты удалены")
-
-            elif args.clear == 'phones':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    conn.execute('DELETE FROM phones')
-                    conn.execute('UPDATE accounts SET phones_count = 0')
-                logger.info("✅ Номера удалены")
-
-            elif args.clear == 'all':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    conn.execute('DELETE FROM phones')
-                    conn.execute('DELETE FROM accounts')
-                logger.info("✅ БД очищена")
-
-            elif args.clear == 'reset-failed':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    cursor = conn.execute(
-                        'UPDATE accounts SET status = "pending" WHERE status = "failed"')
-                    logger.info(f"✅ Сброшено {cursor.rowcount} аккаунтов")
-
-            elif args.clear == 'reset-progress':
-                with sqlite3.connect(config.DB_PATH) as conn:
-                    cursor = conn.execute(
-                        'UPDATE accounts SET status = "pending" WHERE status = "in_progress"')
-                    logger.info(f"✅ Сброшено {cursor.rowcount} аккаунтов")
-
-            return
-
-        # Генерация отчета в конце
-        logger.info("\n" + "=" * 60)
-        orchestrator.generate_report()
-        logger.info("=" * 60)
-        logger.info("🎉 ПАРСИНГ ЗАВЕРШЕН!")
-
-    except Exception as e:
-        logger.error(f"❌ Критическая ошибка: {e}", exc_info=True)
-        sys.exit(1)
-
-
-if __name__ == '__main__':
-    main()
+import sys
+import time
+import random
+import signal
+import sqlite3
+from pathlib import Path
+from argparse import ArgumentParser
+import config
+from database.db import Database
+from database.backup import BackgroundBackup
+from scraper.browser import BrowserManager, ContextPool
+from scraper import session_store
+from scraper.auth import ensure_logged_in
+from scraper.harvester import AccountHarvester
+from scraper.http_scraper import create_phone_scraper
+from scraper.waits import wait_stats
+from utils.report import generate_excel_report
+from utils.export import export_phones
+from utils.logger import logger
+from scraper.parallel_scraper import ParallelScraper, log_progress
+from scraper.async_scraper import AsyncScraper
+from scraper.pipeline import PipelineScraper
+
+
+class ScraperOrchestrator:
+    """Главный оркестратор процесса парсинга"""
+
+    def __init__(self):
+        self.db = Database()
+        self.interrupted = False
+        self.accounts_processed = 0
+        self.accounts_failed = 0
+
+        # Обработка Ctrl+C
+        signal.signal(signal.SIGINT, self._signal_handler)
+
+    def _signal_handler(self, sig, frame):
+        """Обработчик прерывания"""
+        logger.warning(
+            "\n⚠️ Получен сигнал остановки. Завершаем текущую операцию...")
+        self.interrupted = True
+
+    def run_harvest(self, fresh: bool = False):
+        """Фаза 1: Сбор аккаунтов и генерация токенов (fresh — заново, для всех аккаунтов)"""
+        logger.info("=" * 60)
+        logger.info("🌾 ФАЗА 1: Сбор аккаунтов и генерация токенов")
+        logger.info("=" * 60)
+
+        # Контекст сразу с cookies прошлого входа, если они сохранены
+        state = session_store.load_state()
+        with BrowserManager(phase='login', storage_state=state) as browser:
+            page = browser.new_page()
+
+            # Авторизация
+            if not ensure_logged_in(page, restored=state is not None):
+                logger.error(
+                    "❌ Не удалось авторизоваться. Проверьте credentials в .env")
+                return False
+
+            browser.set_phase('harvest')
+
+            # Сбор аккаунтов
+            harvester = AccountHarvester(page, self.db, fresh=fresh)
+            harvester.harvest_all_accounts()
+
+        return True
+
+    def run_scrape(self):
+        """Фаза 2: Парсинг номеров из аккаунтов"""
+        logger.info("=" * 60)
+        logger.info("📞 ФАЗА 2: Парсинг номеров из аккаунтов")
+        logger.info("=" * 60)
+
+        # Получаем аккаунты для обработки
+        pending_accounts = self.db.get_accounts_by_status('pending')
+        in_progress_accounts = self.db.get_accounts_by_status('in_progress')
+
+        accounts_to_process = in_progress_accounts + pending_accounts
+        total = len(accounts_to_process)
+
+        if total == 0:
+            logger.info("✅ Все аккаунты уже обработаны!")
+            return True
+
+        logger.info(f"📋 Аккаунтов к обработке: {total}")
+        logger.info(f"   • В процессе: {len(in_progress_accounts)}")
+        logger.info(f"   • Ожидают: {len(pending_accounts)}")
+
+        # Бэкапы по ходу парсинга выполняются в фоне
+        background_backup = BackgroundBackup(self.db.db_path)
+        start_time = time.time()
+
+        with BrowserManager() as browser:
+            pool = ContextPool(browser)
+            scraper = create_phone_scraper(None, self.db, config.SCRAPE_ENGINE)
+
+            for idx, account in enumerate(accounts_to_process, 1):
+                if self.interrupted:
+                    logger.warning("⏸️ Парсинг приостановлен пользователем")
+                    break
+
+                account_id = account['account_id']
+                username = account['username']
+                token_url = account['token_url']
+                last_page = account['last_page']
+
+                logger.info(
+                    f"\n[{idx}/{total}] 🔄 Обработка: {username} (ID: {account_id})")
+
+                if not token_url:
+                    logger.error(
+                        f"❌ Нет токен-ссылки для аккаунта {account_id}")
+                    self.db.update_account_status(account_id, 'failed')
+                    continue
+
+                # Парсинг номеров
+                start_page = last_page + 1 if last_page > 0 else 1
+                with pool.page() as page:
+                    scraper.page = page
+                    phones_count = scraper.scrape_account(account_id, token_url, start_page)
+
+                # Аккаунт возвращен в очередь или отложен — не засчитывается
+                if phones_count is None:
+                    self.accounts_failed += 1
+                else:
+                    self.accounts_processed += 1
+                    log_progress(self.db, self.accounts_processed, time.time() - start_time)
+
+                    # Резервное копирование
+                    if self.accounts_processed % config.BACKUP_INTERVAL == 0:
+                        background_backup.start()
+
+                # Задержка между аккаунтами (с лимитером темп задает он)
+                if idx < total and scraper.limiter is None:
+                    delay = random.uniform(*config.DELAY_BETWEEN_ACCOUNTS)
+                    logger.info(
+                        f"⏳ Ожидание {delay:.1f}сек перед следующим аккаунтом...")
+                    time.sleep(delay)
+
+            if self.accounts_failed:
+                logger.warning(
+                    f"⚠️ Не обработано аккаунтов: {self.accounts_failed} "
+                    f"(вернутся в очередь или отложены)")
+            scraper.log_summary()
+            pool.log_summary()
+            if scraper.limiter:
+                scraper.limiter.log_summary()
+
+        wait_stats.log_summary()
+
+        # Финальный бэкап
+        background_backup.wait()
+        if self.accounts_processed > 0:
+            backup_path = self.db.backup()
+            logger.info(f"💾 Финальный бэкап: {backup_path}")
+
+        return True
+
+    def run_full(self, fresh: bool = False):
+        """Полный цикл: сбор + парсинг"""
+        logger.info("🚀 ЗАПУСК ПОЛНОГО ЦИКЛА ПАРСИНГА")
+
+        # Фаза 1
+        if not self.run_harvest(fresh):
+            return False
+
+        if self.interrupted:
+            return False
+
+        # Пауза между фазами
+        logger.info("\n⏳ Пауза 5 секунд перед началом парсинга номеров...")
+        time.sleep(5)
+
+        # Фаза 2
+        return self.run_scrape()
+
+    def resume(self):
+        """Возобновление прерванной работы"""
+        logger.info("🔄 ВОЗОБНОВЛЕНИЕ ПАРСИНГА")
+        return self.run_scrape()
+
+    def generate_report(self):
+        """Генерация отчета"""
+        generate_excel_report(self.db)
+
+    @staticmethod
+    def show_stats():
+        db = Database()
+        
+        logger.info("📊 Статистика аккаунтов:")
+        
+        # Счетчики поддерживаются триггерами — чтение не сканирует таблицы
+        for status, count in db.get_status_counts().items():
+            logger.info(f"   {status}: {count}")
+        
+        logger.info(f"\n📋 Всего аккаунтов: {db.count_accounts()}")
+        logger.info(f"📞 Всего номеров: {db.get_total_phones()}")
+
+
+# Режимы, которые не используют ScraperOrchestrator
+STANDALONE_MODES = ('parallel', 'async', 'pipeline', 'export', 'migrate')
+
+
+def run_standalone(args):
+    """Запуск режима из STANDALONE_MODES"""
+    db = Database()
+
+    try:
+        if args.mode == 'parallel':
+            ParallelScraper(
+                max_workers=args.workers, writer_mode=args.writer,
+                engine=args.engine, autoscale=args.autoscale).run()
+        elif args.mode == 'async':
+            AsyncScraper(concurrency=args.concurrency).run()
+        elif args.mode == 'pipeline':
+            PipelineScraper(
+                max_workers=args.workers, writer_mode=args.writer,
+                engine=args.engine, fresh=args.fresh,
+                autoscale=args.autoscale).run()
+        elif args.mode == 'export':
+            export_phones(
+                db,
+                output_path=args.output,
+                fmt=args.format,
+                since=args.since,
+                with_accounts=args.with_accounts
+            )
+            return
+
+        elif args.mode == 'migrate':
+            storage = args.storage or config.PHONE_STORAGE
+            logger.info(f"🔧 Перевод хранения номеров в режим '{storage}'...")
+            moved = db.migrate_phone_storage(storage, vacuum=True)
+            logger.info(f"✅ Готово. Номеров в БД: {moved}")
+            return
+
+        # Генерация отчета в конце
+        logger.info("\n" + "=" * 60)
+        generate_excel_report(db)
+        logger.info("=" * 60)
+        logger.info("🎉 ПАРСИНГ ЗАВЕРШЕН!")
+
+    except Exception as e:
+        logger.error(f"❌ Критическая ошибка: {e}", exc_info=True)
+        sys.exit(1)
+
+
+def main():
+    # ИСПРАВЛЕНИЕ: Создаем parser перед использованием
+    parser = ArgumentParser(
+        description='CRM Scraper - Автоматизация парсинга номеров')
+    parser.add_argument(
+        '--mode',
+        choices=['full', 'harvest', 'scrape', 'report',
+                 'parallel', 'async', 'pipeline', 'clear', 'migrate', 'export'],  # ДОБАВЛЕНО clear
+        default='full',
+        help='Режим работы'
+    )
+    parser.add_argument(
+        '--clear',
+        choices=['tokens', 'accounts', 'phones',
+                 'all', 'reset-failed', 'reset-progress'],
+        help='Тип очистки (используется с --mode clear)'
+    )
+
+    parser.add_argument(
+        '--storage',
+        choices=['text', 'integer'],
+        help='Вариант хранения номеров (используется с --mode migrate)'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Формат выгрузки (используется с --mode export)'
+    )
+    parser.add_argument(
+        '--output',
+        help='Файл выгрузки (по умолчанию data/exports/phones_<время>.<формат>)'
+    )
+    parser.add_argument(
+        '--since',
+        help='Выгрузить номера с created_at >= даты (YYYY-MM-DD[ HH:MM:SS], UTC) '
+             'или "last" — только новые с прошлой выгрузки'
+    )
+    parser.add_argument(
+        '--with-accounts',
+        action='store_true',
+        help='Добавить в выгрузку username аккаунта'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=config.MAX_WORKERS,
+        help=f'Количество параллельных воркеров (по умолчанию: {config.MAX_WORKERS})'
+    )
+    parser.add_argument(
+        '--autoscale',
+        action='store_true',
+        default=config.AUTOSCALE,
+        help='Подбирать число воркеров по скорости, --workers — потолок (для --mode parallel/pipeline)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=config.ASYNC_CONCURRENCY,
+        help=f'Аккаунтов одновременно в --mode async (по умолчанию: {config.ASYNC_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--writer',
+        action='store_true',
+        default=config.WRITER_MODE,
+        help='Запись в БД через отдельный процесс-писатель (для --mode parallel)'
+    )
+    parser.add_argument(
+        '--engine',
+        choices=['browser', 'http'],
+        default=config.SCRAPE_ENGINE,
+        help='Движок парсинга номеров: рендеринг в браузере или HTTP-запросы'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Возобновить прерванную работу'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='Собрать аккаунты заново: с первой страницы и с новыми токенами для всех'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        default=True,
+        help='Запуск браузера в headless режиме'
+    )
+
+    args = parser.parse_args()
+
+    # Проверка credentials (экспорт и миграция работают только с локальной БД)
+    if args.mode not in ('export', 'migrate') and \
+            (not config.ADMIN_LOGIN or not config.ADMIN_PASSWORD):
+        logger.error("❌ Не заданы ADMIN_LOGIN и ADMIN_PASSWORD в файле .env")
+        sys.exit(1)
+
+    # Установка headless режима
+    config.HEADLESS = args.headless
+    config.SCRAPE_ENGINE = args.engine
+
+    # Режим хранения номеров сверяется с config один раз на запуск
+    if args.mode != 'migrate':
+        Database().check_phone_storage()
+
+    # Режимы со своей обработкой Ctrl+C запускаются без оркестратора: его
+    # обработчик SIGINT только ставит флаг, и KeyboardInterrupt не дошел бы
+    # до супервизора воркеров и asyncio.run
+    if not args.resume and args.mode in STANDALONE_MODES:
+        run_standalone(args)
+        return
+
+    # Запуск
+    orchestrator = ScraperOrchestrator()
+
+    try:
+        if args.resume:
+            orchestrator.resume()
+        elif args.mode == 'full':
+            orchestrator.run_full(fresh=args.fresh)
+        elif args.mode == 'harvest':
+            orchestrator.run_harvest(fresh=args.fresh)
+        elif args.mode == 'scrape':
+            orchestrator.run_scrape()
+        elif args.mode == 'report':
+            orchestrator.generate_report()
+        elif args.mode == 'clear':
+            if not args.clear:
+                logger.error(
+                    "❌ Укажите тип очистки: --clear <tokens|accounts|phones|all>")
+                sys.exit(1)
+
+            # Подтверждение
+            confirm = input(
+                f"⚠️ Подтверждаете очистку '{args.clear}'? (yes/no): ")
+            if confirm.lower() not in ['yes', 'y', 'да']:
+                logger.info("❌ Отменено")
+                return
+
+            import sqlite3
+
+            if args.clear == 'tokens':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    conn.execute(
+                        'UPDATE accounts SET token_url = NULL, token_created_at = NULL, '
+                        'status = "pending"')
+                    conn.execute('DELETE FROM harvest_checkpoint')
+                logger.info("✅ Токены очищены")
+
+            elif args.clear == 'accounts':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    conn.execute('DELETE FROM accounts')
+                    conn.execute('DELETE FROM harvest_checkpoint')
+                logger.info("✅ Аккаунты удалены")
+
+            elif args.clear == 'phones':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    conn.execute('DELETE FROM phones')
+                    conn.execute('UPDATE accounts SET phones_count = 0')
+                logger.info("✅ Номера удалены")
+
+            elif args.clear == 'all':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    conn.execute('DELETE FROM phones')
+                    conn.execute('DELETE FROM accounts')
+                    conn.execute('DELETE FROM harvest_checkpoint')
+                logger.info("✅ БД очищена")
+
+            elif args.clear == 'reset-failed':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    cursor = conn.execute(
+                        'UPDATE accounts SET status = "pending", fail_count = 0, retry_after = NULL '
+                        'WHERE status IN ("failed", "parked")')
+                    logger.info(f"✅ Сброшено {cursor.rowcount} аккаунтов")
+
+            elif args.clear == 'reset-progress':
+                with sqlite3.connect(config.DB_PATH) as conn:
+                    cursor = conn.execute(
+                        'UPDATE accounts SET status = "pending", lease_owner = NULL, '
+                        'lease_expires_at = NULL WHERE status = "in_progress"')
+                    logger.info(f"✅ Сброшено {cursor.rowcount} аккаунтов")
+
+            return
+
+        # Генерация отчета в конце
+        logger.info("\n" + "=" * 60)
+        orchestrator.generate_report()
+        logger.info("=" * 60)
+        logger.info("🎉 ПАРСИНГ ЗАВЕРШЕН!")
+
+    except Exception as e:
+        logger.error(f"❌ Критическая ошибка: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+import json
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from playwright.sync_api import Page, Response
+import config
+from scraper.rate_limiter import classify_status, get_limiter
+from utils.logger import logger
+
+# Поля записи аккаунта в JSON списка
+ID_KEYS = ('id', 'user_id', 'userId', 'account_id')
+USERNAME_KEYS = ('username', 'login', 'email', 'name')
+
+# Параметры пагинации (первый найденный в запросе таблицы; по умолчанию — Yii2)
+PAGE_KEYS = ('page', 'pageNumber', 'page_number')
+SIZE_KEYS = ('per-page', 'per_page', 'perPage', 'pageSize', 'page_size', 'rowsPerPage', 'limit', 'size')
+OFFSET_KEYS = ('offset', 'start', 'skip')
+TOTAL_KEYS = ('total', 'totalCount', 'total_count', 'count', 'recordsTotal')
+TOTAL_HEADERS = ('x-pagination-total-count', 'x-total-count')
+
+# Заголовки исходного запроса, которые нужно повторить (авторизация, CSRF, AJAX)
+FORWARD_HEADERS = ('accept', 'authorization', 'content-type', 'x-csrf-token', 'x-requested-with')
+
+
+def find_records(data) -> Optional[List[Dict]]:
+    """Самый длинный список объектов с полем id в JSON-ответе"""
+    best = None
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            if value and all(isinstance(item, dict) for item in value) \
+                    and any(key in value[0] for key in ID_KEYS):
+                if best is None or len(value) > len(best):
+                    best = value
+            else:
+                stack.extend(value)
+    return best
+
+
+def find_total(data, headers: Dict[str, str]) -> Optional[int]:
+    """Общее число записей из заголовков или полей ответа"""
+    for header in TOTAL_HEADERS:
+        value = headers.get(header)
+        if value and value.isdigit():
+            return int(value)
+
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key in TOTAL_KEYS:
+                if isinstance(value.get(key), int):
+                    return value[key]
+            stack.extend(v for v in value.values() if isinstance(v, dict))
+    return None
+
+
+def record_to_account(record: Dict) -> Optional[Dict]:
+    """Запись JSON -> {'account_id', 'username'} как у разбора строк таблицы"""
+    account_id = next((record[key] for key in ID_KEYS if record.get(key) not in (None, '')), None)
+    username = next((record[key] for key in USERNAME_KEYS if record.get(key)), None)
+    if account_id is None or not username:
+        return None
+    return {'account_id': str(account_id), 'username': str(username).lstrip('@')}
+
+
+class AccountsApi:
+    """
+    Список аккаунтов через JSON-запросы Vue-таблицы
+
+    При открытии ACCOUNTS_URL ответы страницы слушаются через
+    page.on('response'); первый JSON со списком записей считается
+    источником таблицы. Дальше список запрашивается напрямую через
+    page.request (cookies контекста) по ACCOUNTS_PER_PAGE записей —
+    без отрисовки строк и кликов по пагинации.
+    """
+
+    def __init__(self, page: Page, per_page: int = config.ACCOUNTS_PER_PAGE):
+        self.page = page
+        self.per_page = per_page
+        self.limiter = get_limiter()
+
+        self._source = None  # (method, url, headers, тело или None, 'json' | 'form' | 'raw')
+        # Фактический размер страницы (сервер может урезать per_page)
+        self._step = per_page
+
+        # Статистика
+        self.calls = 0
+        self.seconds = 0.0
+
+    def listen(self):
+        """Начать ловить ответы таблицы (вызывать до перехода на ACCOUNTS_URL)"""
+        self.page.on('response', self._on_response)
+
+    def stop(self):
+        self.page.remove_listener('response', self._on_response)
+
+    @property
+    def discovered(self) -> bool:
+        return self._source is not None
+
+    def _on_response(self, response: Response):
+        if self._source is not None:
+            return
+        request = response.request
+        if request.resource_type not in ('xhr', 'fetch'):
+            return
+        if 'json' not in response.headers.get('content-type', ''):
+            return
+        try:
+            records = find_records(response.json())
+        except Exception:
+            return
+        if not records or not any(record_to_account(r) for r in records):
+            return
+
+        body, body_kind = request.post_data, 'raw'
+        if body:
+            try:
+                body, body_kind = json.loads(body), 'json'
+            except ValueError:
+                if 'x-www-form-urlencoded' in request.headers.get('content-type', ''):
+                    body, body_kind = dict(parse_qsl(body, keep_blank_values=True)), 'form'
+        headers = {k: v for k, v in request.headers.items() if k.lower() in FORWARD_HEADERS}
+        self._source = (request.method, response.url, headers, body, body_kind)
+        logger.info(f"   🛰️ Источник таблицы: {request.method} {response.url.split('?')[0]}")
+
+    def _page_request(self, page_num: int) -> Tuple[str, Union[Dict, str, None]]:
+        """
+        URL и тело запроса страницы page_num с размером per_page
+
+        Параметры страницы пишутся в JSON- или form-тело, если список
+        запрашивается им, иначе в query; тело другого формата
+        передается без изменений.
+        """
+        method, url, headers, body, body_kind = self._source
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        if isinstance(body, dict):
+            body = dict(body)
+            target = body
+        else:
+            target = params
+
+        page_key = next((k for k in PAGE_KEYS if k in target), None)
+        size_key = next((k for k in SIZE_KEYS if k in target), 'per-page')
+        offset_key = next((k for k in OFFSET_KEYS if k in target), None)
+
+        target[size_key] = self.per_page
+        if offset_key:
+            target[offset_key] = (page_num - 1) * self._step
+        else:
+            target[page_key or 'page'] = page_num
+
+        query = urlencode(params)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path, query, '')), body
+
+    def fetch_page(self, page_num: int) -> Tuple[List[Dict], Optional[int]]:
+        """Одна страница списка: (аккаунты, всего записей или None)"""
+        method, _, headers, _, body_kind = self._source
+        url, body = self._page_request(page_num)
+
+        if self.limiter:
+            self.limiter.acquire()
+        started = time.time()
+        if method == 'POST':
+            if body_kind == 'form':
+                response = self.page.request.post(url, form=body, headers=headers)
+            else:
+                response = self.page.request.post(url, data=body, headers=headers)
+        else:
+            response = self.page.request.get(url, headers=headers)
+        latency = time.time() - started
+        self.calls += 1
+        self.seconds += latency
+        if self.limiter:
+            self.limiter.record(latency, classify_status(response.status))
+
+        if not response.ok:
+            raise RuntimeError(f"HTTP {response.status} для {url}")
+
+        data = response.json()
+        records = find_records(data) or []
+        accounts = [a for a in (record_to_account(r) for r in records) if a]
+        return accounts, find_total(data, response.headers)
+
+    def iter_pages(self, start_page: int = 1) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Все страницы списка: (номер страницы, аккаунты)
+
+        Сервер может урезать размер страницы, поэтому конец списка
+        определяется по общему числу записей, пустой странице или
+        повтору уже полученных id.
+        """
+        seen = set()
+        page_num = start_page
+        while True:
+            accounts, total = self.fetch_page(page_num)
+            new_ids = {a['account_id'] for a in accounts} - seen
+            if not new_ids:
+                break
+
+            if page_num == start_page and len(accounts) < self.per_page \
+                    and (total is None or total > len(accounts)):
+                logger.debug(f"   Сервер отдает по {len(accounts)} записей вместо {self.per_page}")
+                self._step = len(accounts)
+
+            seen |= new_ids
+            yield page_num, accounts
+
+            if len(accounts) < self._step:
+                break
+            if total is not None and page_num * self._step >= total:
+                break
+            page_num += 1
+
+    def log_summary(self, log=logger):
+        if self.calls:
+            log.info(f"🛰️ Список аккаунтов через API: {self.calls} запросов за {self.seconds:.1f} сек")
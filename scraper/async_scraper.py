@@ -0,0 +1,323 @@
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
+import config
+from database.db import Database
+from database.backup import BackgroundBackup
+from database.leases import LeaseHeartbeat, make_worker_id
+from scraper.browser import CONTEXT_OPTIONS, LAUNCH_ARGS, RequestBlocker
+from scraper.extractors import PHONE_EXTRACT_SCRIPT, ROW_SELECTORS, NEXT_PAGE_SELECTORS, CAPTCHA_SELECTOR
+from scraper.rate_limiter import classify_status, get_limiter
+from scraper.retry import RetryPolicy, TableNotFound
+from scraper.phone_scraper import set_page_param
+from scraper.parallel_scraper import log_progress
+from scraper.waits import wait_for_grid_async, wait_stats
+from utils.logger import logger
+
+
+class AsyncScraper:
+    """
+    Парсинг номеров корутинами в одном процессе
+
+    Один Chromium на все аккаунты, у каждого аккаунта свой контекст
+    (cookies токен-входа не пересекаются). Число одновременно
+    обрабатываемых аккаунтов ограничено семафором. Захват аккаунтов,
+    аренда и сохранение страниц — те же, что у воркеров --mode parallel;
+    вызовы БД выполняются в пуле потоков через asyncio.to_thread.
+    """
+
+    def __init__(self, concurrency: int = config.ASYNC_CONCURRENCY):
+        self.concurrency = concurrency
+        self.db = Database()
+        self.owner = make_worker_id(0)
+        self.background_backup = BackgroundBackup(self.db.db_path)
+        self.blocker = RequestBlocker() if config.BLOCK_REQUESTS else None
+        self.limiter = get_limiter()
+        self.retry = RetryPolicy()
+        if self.blocker:
+            self.blocker.set_phase('scrape')
+
+        self.processed = 0
+        self.pages_fetched = 0
+        self.fetch_seconds = 0.0
+        self._claimed = deque()
+        self._claim_lock: Optional[asyncio.Lock] = None
+
+    def run(self):
+        """Запустить обработку всех доступных аккаунтов"""
+        pending_count = self.db.get_pending_count()
+        if pending_count == 0:
+            logger.info("✅ Все аккаунты уже обработаны!")
+            return
+
+        logger.info("=" * 60)
+        logger.info(f"🚀 ASYNC-ОБРАБОТКА: до {self.concurrency} аккаунтов одновременно")
+        logger.info(f"📋 Аккаунтов к обработке: {pending_count}")
+        logger.info("=" * 60)
+
+        start_time = time.time()
+        try:
+            with LeaseHeartbeat(self.db, self.owner):
+                asyncio.run(self._run(start_time))
+        except KeyboardInterrupt:
+            logger.warning("\n⚠️ Прерывание пользователем")
+        finally:
+            released = self.db.release_leases(self.owner)
+            if released:
+                logger.info(f"↩️ Возвращено в очередь: {released} аккаунтов")
+
+        elapsed_time = time.time() - start_time
+        logger.info("\n" + "=" * 60)
+        logger.info(f"🎉 ASYNC-ОБРАБОТКА ЗАВЕРШЕНА")
+        logger.info(f"⏱️ Время выполнения: {elapsed_time/60:.1f} минут")
+        logger.info(f"📊 Обработано аккаунтов: {self.processed}")
+        if self.pages_fetched and self.fetch_seconds > 0:
+            logger.info(
+                f"📊 Движок async: {self.pages_fetched} стр., "
+                f"{self.pages_fetched / self.fetch_seconds:.2f} стр/сек без пауз на корутину")
+        logger.info("=" * 60)
+        wait_stats.log_summary()
+        if self.limiter:
+            self.limiter.log_summary()
+        if self.blocker:
+            self.blocker.log_summary()
+
+        self.background_backup.wait()
+        if self.processed > 0:
+            backup_path = self.db.backup()
+            logger.info(f"💾 Бэкап создан: {backup_path}")
+
+    async def _run(self, start_time: float):
+        self._claim_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(
+                headless=config.HEADLESS, args=LAUNCH_ARGS)
+            try:
+                while True:
+                    await semaphore.acquire()
+                    account = await self._next_account()
+                    if account is None:
+                        semaphore.release()
+                        break
+
+                    task = asyncio.create_task(self._process(browser, account, start_time))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    task.add_done_callback(self._log_task_error)
+                    task.add_done_callback(lambda _: semaphore.release())
+
+                if tasks:
+                    # Ошибки уже в логе (_log_task_error): браузер закрывается
+                    # только после того, как доработают все корутины
+                    await asyncio.gather(*tasks, return_exceptions=True)
+            finally:
+                await browser.close()
+
+    async def _next_account(self) -> Optional[Dict]:
+        """Следующий арендованный аккаунт (захват пачками, как у воркеров)"""
+        async with self._claim_lock:
+            while True:
+                if not self._claimed:
+                    self._claimed.extend(
+                        await asyncio.to_thread(self.db.claim_accounts, self.owner))
+                if not self._claimed:
+                    # Остались аккаунты на паузе после неудачи — ждем их
+                    retry_wait = await asyncio.to_thread(self.db.get_retry_wait)
+                    if retry_wait is None:
+                        return None
+                    await asyncio.sleep(min(retry_wait, config.PIPELINE_POLL_INTERVAL))
+                    continue
+
+                account = self._claimed.popleft()
+                if await asyncio.to_thread(self.db.owns_lease, account['account_id'], self.owner):
+                    return account
+                logger.warning(
+                    f"⚠️ Аренда {account['account_id']} перехвачена другим воркером, пропускаю")
+
+    async def _process(self, browser: Browser, account: Dict, start_time: float):
+        account_id = account['account_id']
+        token_url = account['token_url']
+        last_page = account['last_page']
+
+        logger.info(f"🔄 Обработка: {account['username']} (ID: {account_id})")
+
+        if not token_url:
+            logger.error(f"❌ Нет токен-ссылки для {account_id}")
+            await asyncio.to_thread(self.db.update_account_status, account_id, 'failed')
+            return
+
+        start_page = last_page + 1 if last_page > 0 else 1
+        try:
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+        except Exception as e:
+            await self._fail_account(account_id, e)
+            return
+        try:
+            context.set_default_timeout(config.BROWSER_TIMEOUT)
+            context.set_default_navigation_timeout(config.PAGE_LOAD_TIMEOUT)
+            if self.blocker:
+                await self.blocker.attach_async(context)
+            page = await context.new_page()
+            phones_count = await self._scrape_account(page, account_id, token_url, start_page)
+        except Exception as e:
+            # Сбой до парсинга (блокировщик, вкладка) — только этот аккаунт возвращается в очередь
+            await self._fail_account(account_id, e)
+            return
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                logger.debug(f"   Контекст {account_id} не закрыт: {e}")
+
+        # Аккаунт возвращен в очередь или отложен — не засчитывается
+        if phones_count is None:
+            return
+
+        self.processed += 1
+        await asyncio.to_thread(log_progress, self.db, self.processed, time.time() - start_time)
+        if self.processed % config.BACKUP_INTERVAL == 0:
+            self.background_backup.start()
+
+        if not self.limiter:
+            await asyncio.sleep(random.uniform(*config.DELAY_BETWEEN_ACCOUNTS))
+
+    async def _scrape_account(self, page: Page, account_id: str, token_url: str,
+                              start_page: int) -> Optional[int]:
+        """Парсинг всех номеров аккаунта (как PhoneScraper.scrape_account, None — не обработан)"""
+        try:
+            logger.info(f"📞 Парсинг аккаунта {account_id}...")
+
+            await self.retry.run_async(
+                lambda attempt: self._open_account(page, token_url), 'вход по токену')
+
+            await asyncio.to_thread(self.db.update_account_status, account_id, 'in_progress')
+
+            current_page = start_page
+            total_phones = 0
+            # После неудачного перехода page.url — страница ошибки браузера
+            grid_url = page.url
+
+            while True:
+                fetch_started = time.perf_counter()
+                phones = await self.retry.run_async(
+                    lambda attempt: self._load_page(page, grid_url, current_page, attempt),
+                    f'{account_id}, стр. {current_page}',
+                    recover=lambda: self._open_account(page, token_url))
+                self.pages_fetched += 1
+                self.fetch_seconds += time.perf_counter() - fetch_started
+
+                added = await asyncio.to_thread(
+                    self.db.add_phones_page, account_id, phones, current_page)
+                total_phones += added
+                logger.info(
+                    f"  📄 {account_id}, стр. {current_page}: +{added} номеров "
+                    f"(всего: {total_phones})")
+
+                if not await self._has_next_page(page):
+                    break
+
+                current_page += 1
+                await self._pace()
+
+            await asyncio.to_thread(self.db.update_account_status, account_id, 'completed')
+            logger.info(f"✅ Аккаунт {account_id} обработан: {total_phones} номеров")
+            return total_phones
+
+        except Exception as e:
+            await self._fail_account(account_id, e)
+            return None
+
+    async def _fail_account(self, account_id: str, error: Exception):
+        """Вернуть аккаунт в очередь с учетом неудачи (circuit breaker)"""
+        logger.error(f"❌ Ошибка парсинга аккаунта {account_id}: {error}")
+        status = await asyncio.to_thread(self.db.record_account_failure, account_id, str(error))
+        if status == 'parked':
+            logger.warning(f"🅿️ Аккаунт {account_id} отложен после серии неудач")
+
+    @staticmethod
+    def _log_task_error(task: asyncio.Task):
+        """Ошибка корутины аккаунта — в лог; остальные корутины продолжают работу"""
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logger.error(f"❌ Ошибка обработки аккаунта: {error}",
+                     exc_info=(type(error), error, error.__traceback__))
+
+    async def _open_account(self, page: Page, token_url: str):
+        """Вход по токен-ссылке и 50 записей на странице"""
+        await self._pace(first=True)
+        await self._navigate(page, token_url)
+        await wait_for_grid_async(page, 'token_page')
+        await self._set_page_size(page, 50)
+
+    async def _load_page(self, page: Page, grid_url: str, page_num: int,
+                         attempt: int) -> List[str]:
+        """Открыть страницу page_num (при повторе — заново) и разобрать номера"""
+        if page_num > 1 or attempt > 1:
+            await self._navigate(page, set_page_param(grid_url, page_num))
+            await wait_for_grid_async(page, 'page_change')
+        return await self._extract_phones(page)
+
+    async def _pace(self, first: bool = False):
+        """Очередь на запрос через общий лимитер (без лимитера — фиксированные паузы)"""
+        if self.limiter:
+            await asyncio.sleep(self.limiter.reserve())
+        elif not first:
+            await asyncio.sleep(random.uniform(*config.DELAY_BETWEEN_REQUESTS))
+
+    async def _navigate(self, page: Page, url: str):
+        started = time.time()
+        try:
+            response = await page.goto(url)
+        except PlaywrightTimeout:
+            if self.limiter:
+                self.limiter.record(time.time() - started, 'timeout')
+            raise
+        if self.limiter:
+            signal = classify_status(response.status if response else None)
+            if signal == 'ok' and await page.query_selector(CAPTCHA_SELECTOR):
+                signal = 'ban'
+            self.limiter.record(time.time() - started, signal)
+        return response
+
+    async def _set_page_size(self, page: Page, size: int = 50):
+        """Выбрать размер страницы ссылкой updatepagesize из меню"""
+        try:
+            link = await page.query_selector(f'a[href*="updatepagesize?pageSize={size}"]')
+            if not link:
+                logger.debug(f"   Ссылка на {size} записей не найдена")
+                return
+
+            parent_class = await link.evaluate('a => a.parentElement.className')
+            if 'active' in (parent_class or ''):
+                return
+
+            # Клик через DOM: меню скрыто, пока его не открыть
+            try:
+                async with page.expect_navigation(timeout=config.WAIT_TIMEOUT):
+                    await link.evaluate('a => a.click()')
+            except PlaywrightTimeout:
+                pass
+            await wait_for_grid_async(page, 'page_size')
+
+        except Exception as e:
+            logger.warning(f"  ⚠️ Не удалось установить размер страницы: {e}")
+
+    async def _extract_phones(self, page: Page) -> List[str]:
+        await wait_for_grid_async(page, 'parse', timeout=config.WAIT_SHORT_TIMEOUT)
+        result = await page.evaluate(PHONE_EXTRACT_SCRIPT, ROW_SELECTORS)
+        if result is None:
+            raise TableNotFound("на странице нет таблицы номеров")
+        return result['phones']
+
+    async def _has_next_page(self, page: Page) -> bool:
+        for selector in NEXT_PAGE_SELECTORS:
+            if await page.query_selector(selector):
+                return True
+        return False
@@ -0,0 +1,211 @@
+import time
+from typing import Dict, Optional, Tuple
+import config
+from scraper.rate_limiter import RateLimiter
+from utils.logger import logger
+
+
+def system_load() -> Tuple[Optional[float], Optional[float]]:
+    """
+    Загрузка CPU и занятая RAM системы, %
+
+    Требует psutil; без него возвращает (None, None) и ограничение по
+    ресурсам отключается.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None, None
+    # cpu_percent без interval — среднее с прошлого вызова (с прошлого окна)
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+
+class Autoscaler:
+    """
+    Подбор числа воркеров по фактической скорости
+
+    Раз в AUTOSCALE_INTERVAL считается скорость (страниц/сек по всем
+    воркерам) и доля ошибок, таймаутов и блокировок по счетчикам общего
+    лимитера. Решение на окно:
+    - блокировки, ошибки, рост задержки CRM или нехватка CPU/RAM —
+      на один воркер меньше, текущее число становится потолком;
+    - добавленный воркер не дал AUTOSCALE_MIN_GAIN прироста — откат,
+      потолок найден; через AUTOSCALE_REPROBE окон — новая попытка;
+    - иначе, пока есть запас до потолка, — на один воркер больше.
+    Каждое решение пишется в лог вместе с метриками окна.
+    """
+
+    def __init__(self, max_workers: int, limiter: RateLimiter = None,
+                 min_workers: int = config.AUTOSCALE_MIN_WORKERS,
+                 interval: float = config.AUTOSCALE_INTERVAL,
+                 warmup: float = config.AUTOSCALE_WARMUP,
+                 min_gain: float = config.AUTOSCALE_MIN_GAIN,
+                 max_error_rate: float = config.AUTOSCALE_MAX_ERROR_RATE,
+                 latency_factor: float = config.AUTOSCALE_LATENCY_FACTOR,
+                 max_cpu: float = config.AUTOSCALE_MAX_CPU,
+                 max_memory: float = config.AUTOSCALE_MAX_MEMORY,
+                 reprobe: int = config.AUTOSCALE_REPROBE):
+        self.max_workers = max_workers
+        self.min_workers = max(1, min(min_workers, max_workers))
+        self.limiter = limiter
+        self.interval = interval
+        self.warmup = warmup
+        self.min_gain = min_gain
+        self.max_error_rate = max_error_rate
+        self.latency_factor = latency_factor
+        self.max_cpu = max_cpu
+        self.max_memory = max_memory
+        self.reprobe = reprobe
+
+        # Скорость (стр/сек) в последнем окне для каждого числа воркеров
+        self.rates: Dict[int, float] = {}
+        self.ceiling = max_workers
+        self._ceiling_windows = 0
+        self._probing: Optional[int] = None  # Число воркеров после добавления (первое окно)
+        self._best_latency: Optional[float] = None
+
+        self._window_start: Optional[float] = None
+        self._window_pages: Optional[int] = None
+        self._window_stats: Optional[Dict] = None
+
+        # Статистика
+        self.scaled_up = 0
+        self.scaled_down = 0
+
+    def update(self, workers: int, pages: int, now: float = None) -> int:
+        """
+        Решение по итогам окна
+
+        Args:
+            workers: Воркеров сейчас
+            pages: Загружено страниц всеми воркерами с начала работы
+
+        Returns:
+            Нужное число воркеров (то же, если окно еще не закончилось)
+        """
+        now = time.time() if now is None else now
+
+        # Окно начинается после прогрева: замер идет при постоянном числе воркеров
+        if self._window_start is None or self._window_pages is None:
+            if self._window_start is None or now >= self._window_start:
+                self._start_window(now, pages)
+            return workers
+        if now - self._window_start < self.interval:
+            return workers
+
+        metrics = self._measure(pages, now)
+        target, reason = self._decide(workers, metrics)
+        self._log_decision(workers, target, reason, metrics)
+
+        if target != workers:
+            self._window_start = now + self.warmup
+            self._window_pages = None
+        else:
+            self._start_window(now, pages)
+        return target
+
+    def _start_window(self, now: float, pages: int):
+        self._window_start = now
+        self._window_pages = pages
+        self._window_stats = self.limiter.snapshot() if self.limiter else None
+        system_load()
+
+    def _measure(self, pages: int, now: float) -> Dict:
+        elapsed = max(now - self._window_start, 1e-6)
+        metrics = {
+            'rate': (pages - self._window_pages) / elapsed,
+            'error_rate': 0.0,
+            'bans': 0,
+            'latency': None,
+            'paused': 0.0,
+        }
+        if self.limiter and self._window_stats is not None:
+            stats = self.limiter.snapshot()
+            requests = stats['requests'] - self._window_stats['requests']
+            failures = (stats['errors'] - self._window_stats['errors']) + \
+                (stats['timeouts'] - self._window_stats['timeouts'])
+            metrics['bans'] = stats['bans'] - self._window_stats['bans']
+            metrics['error_rate'] = (failures + metrics['bans']) / requests if requests else 0.0
+            metrics['latency'] = stats['latency']
+            metrics['paused'] = stats['paused']
+        metrics['cpu'], metrics['memory'] = system_load()
+        return metrics
+
+    def _decide(self, workers: int, m: Dict) -> Tuple[int, str]:
+        """(нужное число воркеров, причина)"""
+        down = max(self.min_workers, workers - 1)
+        probing, self._probing = self._probing == workers, None
+
+        overload = self._overload(m)
+        if overload:
+            if down < workers:
+                self.ceiling = down
+                self._ceiling_windows = 0
+            elif m['latency']:
+                # Убирать уже некого: медленная CRM — новая точка отсчета задержки
+                self._best_latency = m['latency']
+            return down, overload
+
+        if m['latency']:
+            self._best_latency = min(self._best_latency or m['latency'], m['latency'])
+        self.rates[workers] = m['rate']
+
+        # Добавленный воркер не ускорил работу — потолок найден
+        previous = self.rates.get(workers - 1)
+        if probing and previous is not None and m['rate'] < previous * (1 + self.min_gain):
+            self.ceiling = workers - 1
+            self._ceiling_windows = 0
+            gain = (m['rate'] / previous - 1) * 100 if previous > 0 else 0.0
+            return workers - 1, f"прирост {gain:+.0f}% при {workers}, нужно +{self.min_gain:.0%}"
+
+        if self.ceiling < self.max_workers:
+            self._ceiling_windows += 1
+            if self._ceiling_windows >= self.reprobe:
+                self.ceiling = self.max_workers
+                self._ceiling_windows = 0
+
+        if workers < min(self.ceiling, self.max_workers) and m['rate'] > 0:
+            self._probing = workers + 1
+            return workers + 1, "ошибок мало, есть запас"
+
+        return workers, "без изменений"
+
+    def _overload(self, m: Dict) -> Optional[str]:
+        """Причина убрать воркер или None"""
+        if m['bans'] > 0 or m['paused'] > 0:
+            return f"признаки блокировки CRM ({m['bans']})"
+        if m['error_rate'] > self.max_error_rate:
+            return f"ошибок {m['error_rate']:.1%} > {self.max_error_rate:.0%}"
+        if m['latency'] and self._best_latency and \
+                m['latency'] > self._best_latency * self.latency_factor:
+            return f"CRM замедлилась: задержка {m['latency']:.1f} сек при лучшей {self._best_latency:.1f}"
+        if m['cpu'] is not None and m['cpu'] > self.max_cpu:
+            return f"CPU {m['cpu']:.0f}% > {self.max_cpu}%"
+        if m['memory'] is not None and m['memory'] > self.max_memory:
+            return f"RAM {m['memory']:.0f}% > {self.max_memory}%"
+        return None
+
+    def _log_decision(self, workers: int, target: int, reason: str, m: Dict):
+        details = f"{m['rate']:.2f} стр/сек, ошибок {m['error_rate']:.1%}"
+        if m['latency'] is not None:
+            details += f", задержка {m['latency']:.1f} сек"
+        if m['cpu'] is not None:
+            details += f", CPU {m['cpu']:.0f}%, RAM {m['memory']:.0f}%"
+
+        if target > workers:
+            self.scaled_up += 1
+            logger.info(f"⚖️ Автомасштаб: {workers} → {target} воркеров ({reason}): {details}")
+        elif target < workers:
+            self.scaled_down += 1
+            logger.warning(f"⚖️ Автомасштаб: {workers} → {target} воркеров ({reason}): {details}")
+        else:
+            logger.debug(f"   Автомасштаб: {workers} воркеров ({reason}): {details}")
+
+    def log_summary(self, log=logger):
+        if not self.rates:
+            return
+        rates = ", ".join(f"{n}: {rate:.2f}" for n, rate in sorted(self.rates.items()))
+        best = max(self.rates, key=self.rates.get)
+        log.info(
+            f"⚖️ Автомасштаб: добавлений {self.scaled_up}, сокращений {self.scaled_down}; "
+            f"стр/сек по числу воркеров — {rates}; лучшее: {best}")
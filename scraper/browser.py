@@ -1,42 +1,367 @@
-from playwright.sync_api import sync_playwright, Browser, Page, TimeoutError
-import config
-
-
-class BrowserManager:
-    def __init__(self, headless: bool = config.HEADLESS):
-        self.headless = headless
-        self.playwright = None
-        self.browser = None
-        self.context = None
-
-    def __enter__(self):
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        self.context = self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            # ДОБАВЛЕНО: разрешение на clipboard
-            permissions=['clipboard-read', 'clipboard-write']
-        )
-        self.context.set_default_timeout(config.BROWSER_TIMEOUT)
-        self.context.set_default_navigation_timeout(config.PAGE_LOAD_TIMEOUT)
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.context:
-            self.context.close()
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
-
-    def new_page(self) -> Page:
-        """Создать новую страницу"""
-        page = self.context.new_page()
-        # Устанавливаем увеличенный таймаут для страницы
-        page.set_default_timeout(config.BROWSER_TIMEOUT)
-        page.set_default_navigation_timeout(config.PAGE_LOAD_TIMEOUT)
-        return page
+import re
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, Route, Response, TimeoutError
+import config
+from utils.logger import logger
+
+
+# Параметры контекста браузера (общие для sync и async движков)
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    # ДОБАВЛЕНО: разрешение на clipboard
+    'permissions': ['clipboard-read', 'clipboard-write'],
+}
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+
+class RequestBlocker:
+    """
+    Политика context.route: отмена тяжелых ресурсов и трекеров
+
+    Трекеры отменяются всегда (маршрут только на их домены), типы ресурсов
+    (картинки, шрифты, CSS) — только в фазах, где это разрешено
+    BLOCK_PHASES: маршрут на все запросы ставится лишь на эти фазы, чтобы
+    в остальных не платить за перехват каждого запроса и не отключать
+    HTTP-кэш. Для отмененных запросов ответа нет, поэтому сэкономленные
+    байты оцениваются по Content-Length того же URL, если он уже
+    загружался, иначе — по BLOCKED_SIZE_ESTIMATES_KB для типа.
+    """
+
+    def __init__(self, resource_types=config.BLOCKED_RESOURCE_TYPES,
+                 hosts=config.BLOCKED_HOSTS,
+                 size_estimates_kb: Dict[str, int] = config.BLOCKED_SIZE_ESTIMATES_KB):
+        self.resource_types = set(resource_types)
+        self.hosts = tuple(hosts)
+        self.size_estimates_kb = dict(size_estimates_kb)
+        self.block_resources = False
+        self.phase = None
+
+        # Статистика по типу ресурса: отменено запросов и оценка байтов
+        self.blocked_requests = defaultdict(int)
+        self.blocked_bytes = defaultdict(int)
+
+        self._url_sizes = {}
+        self._contexts: List[BrowserContext] = []
+        self._tracker_pattern = re.compile(
+            r'^[a-z]+://([^/]*\.)?(' + '|'.join(re.escape(host) for host in self.hosts) + r')(:\d+)?/'
+        ) if self.hosts else None
+
+    def attach(self, context: BrowserContext):
+        if self._tracker_pattern:
+            context.route(self._tracker_pattern, self._handle)
+        if self.block_resources:
+            context.route('**/*', self._handle)
+        context.on('response', self._learn_size)
+        # Смена фазы переключает маршрут ресурсов у уже открытых контекстов
+        self._contexts.append(context)
+        context.on('close', lambda _: self._forget(context))
+
+    async def attach_async(self, context):
+        """То же для контекста из playwright.async_api (фаза задается до подключения)"""
+        if self._tracker_pattern:
+            await context.route(self._tracker_pattern, self._handle_async)
+        if self.block_resources:
+            await context.route('**/*', self._handle_async)
+        context.on('response', self._learn_size)
+
+    def set_phase(self, phase: str):
+        """Включить/выключить блокировку ресурсов для фазы работы"""
+        self.phase = phase
+        block_resources = config.BLOCK_PHASES.get(phase, True)
+        if block_resources != self.block_resources:
+            for context in list(self._contexts):
+                try:
+                    if block_resources:
+                        context.route('**/*', self._handle)
+                    else:
+                        context.unroute('**/*', self._handle)
+                except Exception as e:
+                    logger.debug(f"   Маршрут контекста не переключен: {e}")
+                    self._forget(context)
+        self.block_resources = block_resources
+        logger.debug(
+            f"   Фаза '{phase}': блокировка ресурсов "
+            f"{'включена' if self.block_resources else 'выключена'}")
+
+    def _forget(self, context: BrowserContext):
+        if context in self._contexts:
+            self._contexts.remove(context)
+
+    def _is_tracker(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ''
+        return any(host == blocked or host.endswith('.' + blocked) for blocked in self.hosts)
+
+    def _classify(self, url: str, resource_type: str):
+        """Причина отмены запроса (тип ресурса или 'tracker'), None — пропустить"""
+        if self._is_tracker(url):
+            kind = 'tracker'
+        elif self.block_resources and resource_type in self.resource_types:
+            kind = resource_type
+        else:
+            return None
+
+        self.blocked_requests[kind] += 1
+        self.blocked_bytes[kind] += self._estimate_size(url, kind)
+        return kind
+
+    def _handle(self, route: Route):
+        request = route.request
+        if self._classify(request.url, request.resource_type):
+            route.abort('blockedbyclient')
+        else:
+            route.continue_()
+
+    async def _handle_async(self, route):
+        request = route.request
+        if self._classify(request.url, request.resource_type):
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    def _learn_size(self, response: Response):
+        """Запомнить Content-Length ресурсов, загруженных без блокировки"""
+        if response.request.resource_type not in self.resource_types:
+            return
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self._url_sizes[response.url] = int(length)
+
+    def _estimate_size(self, url: str, kind: str) -> int:
+        if url in self._url_sizes:
+            return self._url_sizes[url]
+        return self.size_estimates_kb.get(kind, 0) * 1024
+
+    def log_summary(self, log=logger):
+        """Сводка отмененных запросов по типам"""
+        if not self.blocked_requests:
+            return
+        total_requests = sum(self.blocked_requests.values())
+        total_mb = sum(self.blocked_bytes.values()) / 1024 / 1024
+        log.info(f"🚫 Заблокировано запросов: {total_requests}, сэкономлено ~{total_mb:.1f} МБ")
+        for kind, count in sorted(self.blocked_requests.items()):
+            log.info(f"   {kind}: {count} запросов, ~{self.blocked_bytes[kind] / 1024:.0f} КБ")
+
+
+class BrowserManager:
+    def __init__(self, headless: bool = config.HEADLESS, phase: str = 'scrape',
+                 storage_state: str = None):
+        self.headless = headless
+        self.phase = phase
+        # Сохраненная сессия админки для основного контекста (контексты
+        # аккаунтов из ContextPool всегда чистые)
+        self.storage_state = storage_state
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.blocker = RequestBlocker() if config.BLOCK_REQUESTS else None
+
+    def __enter__(self):
+        self.playwright = sync_playwright().start()
+        self._launch()
+        self.context = self.new_context(self.storage_state)
+
+        # Отмена картинок, шрифтов, CSS и аналитики
+        if self.blocker:
+            self.blocker.set_phase(self.phase)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.blocker:
+            self.blocker.log_summary()
+        if self.context:
+            self.context.close()
+        if self.browser:
+            self.browser.close()
+        if self.playwright:
+            self.playwright.stop()
+
+    def _launch(self):
+        self.browser = self.playwright.chromium.launch(
+            headless=self.headless,
+            args=LAUNCH_ARGS
+        )
+
+    def new_context(self, storage_state: str = None) -> BrowserContext:
+        """Новый контекст с общими настройками и политикой блокировки"""
+        context = self.browser.new_context(storage_state=storage_state, **CONTEXT_OPTIONS)
+        context.set_default_timeout(config.BROWSER_TIMEOUT)
+        context.set_default_navigation_timeout(config.PAGE_LOAD_TIMEOUT)
+        if self.blocker:
+            self.blocker.attach(context)
+        return context
+
+    def restart(self):
+        """Перезапустить Chromium (все контексты закрываются)"""
+        self.browser.close()
+        self._launch()
+        self.context = self.new_context(self.storage_state)
+
+    def set_phase(self, phase: str):
+        """Сменить фазу работы (login / harvest / scrape) — меняет политику блокировки"""
+        self.phase = phase
+        if self.blocker:
+            self.blocker.set_phase(phase)
+
+    def new_page(self, context: BrowserContext = None) -> Page:
+        """Создать новую страницу"""
+        page = (context or self.context).new_page()
+        # Устанавливаем увеличенный таймаут для страницы
+        page.set_default_timeout(config.BROWSER_TIMEOUT)
+        page.set_default_navigation_timeout(config.PAGE_LOAD_TIMEOUT)
+        return page
+
+
+def browser_rss_mb() -> Optional[float]:
+    """
+    Суммарный RSS дочерних процессов (драйвер Playwright и Chromium), МБ
+
+    Требует psutil; без него возвращает None и проверка памяти отключается.
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            total += child.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / 1024 / 1024
+
+
+class ContextPool:
+    """
+    Контексты браузера для обработки аккаунтов
+
+    Каждый аккаунт получает новый контекст или сброшенный (cookies,
+    localStorage и страница очищаются), поэтому следы токен-входов
+    предыдущих аккаунтов не копятся. Живых контекстов не больше
+    max_contexts. Chromium перезапускается после recycle_after аккаунтов
+    или когда RSS превышает max_rss_mb — перед выдачей следующего контекста,
+    когда занятых контекстов нет.
+    """
+
+    def __init__(self, manager: BrowserManager,
+                 max_contexts: int = config.CONTEXT_POOL_SIZE,
+                 reuse: bool = config.CONTEXT_REUSE,
+                 recycle_after: int = config.BROWSER_RECYCLE_ACCOUNTS,
+                 max_rss_mb: float = config.BROWSER_MAX_RSS_MB):
+        self.manager = manager
+        self.max_contexts = max_contexts
+        self.reuse = reuse
+        self.recycle_after = recycle_after
+        self.max_rss_mb = max_rss_mb
+
+        self._idle: List[Tuple[BrowserContext, Page]] = []
+        self._in_use = 0
+        self._accounts_since_recycle = 0
+        self._rss_warned = False
+
+        # Статистика
+        self.hits = 0
+        self.misses = 0
+        self.recycles = 0
+
+    @property
+    def live_contexts(self) -> int:
+        return len(self._idle) + self._in_use
+
+    @contextmanager
+    def page(self):
+        """Страница в отдельном контексте на время обработки одного аккаунта"""
+        context, page = self.acquire()
+        try:
+            yield page
+        finally:
+            self.release(context, page)
+
+    def acquire(self) -> Tuple[BrowserContext, Page]:
+        if self._in_use == 0 and self._needs_recycle():
+            self.recycle()
+
+        if self._idle:
+            context, page = self._idle.pop()
+            self.hits += 1
+        else:
+            if self.live_contexts >= self.max_contexts:
+                raise RuntimeError(f"Пул контекстов исчерпан ({self.max_contexts})")
+            context = self.manager.new_context()
+            page = self.manager.new_page(context)
+            self.misses += 1
+
+        self._in_use += 1
+        self._accounts_since_recycle += 1
+        return context, page
+
+    def release(self, context: BrowserContext, page: Page):
+        self._in_use -= 1
+        if self.reuse and len(self._idle) < self.max_contexts and self._reset(context, page):
+            self._idle.append((context, page))
+        else:
+            self._close(context)
+
+    def _reset(self, context: BrowserContext, page: Page) -> bool:
+        """Очистить состояние контекста. False — контекст не пригоден к повторному использованию"""
+        try:
+            if page.is_closed():
+                return False
+            for extra_page in context.pages:
+                if extra_page != page:
+                    extra_page.close()
+            page.evaluate('() => { try { localStorage.clear(); sessionStorage.clear(); } catch (e) {} }')
+            page.goto('about:blank')
+            context.clear_cookies()
+            return True
+        except Exception as e:
+            logger.debug(f"   Сброс контекста не удался: {e}")
+            return False
+
+    def _close(self, context: BrowserContext):
+        try:
+            context.close()
+        except Exception as e:
+            logger.debug(f"   Закрытие контекста не удалось: {e}")
+
+    def _needs_recycle(self) -> bool:
+        if self.recycle_after and self._accounts_since_recycle >= self.recycle_after:
+            logger.info(f"♻️ Перезапуск браузера после {self._accounts_since_recycle} аккаунтов")
+            return True
+
+        if self.max_rss_mb:
+            rss = browser_rss_mb()
+            if rss is None:
+                if not self._rss_warned:
+                    logger.debug("   psutil не установлен — контроль памяти браузера отключен")
+                    self._rss_warned = True
+            elif rss > self.max_rss_mb:
+                logger.info(f"♻️ Перезапуск браузера: RSS {rss:.0f} МБ > {self.max_rss_mb} МБ")
+                return True
+        return False
+
+    def recycle(self):
+        """Закрыть контексты и перезапустить Chromium"""
+        for context, _ in self._idle:
+            self._close(context)
+        self._idle.clear()
+        self.manager.restart()
+        self._accounts_since_recycle = 0
+        self.recycles += 1
+
+    def get_stats(self) -> Dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'recycles': self.recycles,
+            'live_contexts': self.live_contexts,
+        }
+
+    def log_summary(self, log=logger):
+        log.info(
+            f"🧩 Контексты: переиспользовано {self.hits}, создано {self.misses}, "
+            f"перезапусков браузера {self.recycles}")
@@ -0,0 +1,259 @@
+import signal
+import time
+import queue
+from collections import deque
+from typing import Dict, List
+import config
+from database.db import Database
+from scraper.metrics import count
+from utils.logger import logger
+
+
+class WriteLost(Exception):
+    """Писатель не смог записать данные аккаунтов (они возвращены в очередь)"""
+
+    def __init__(self, accounts: List[str], error: str, added: Dict[str, int] = None):
+        super().__init__(f"данные не записаны ({error}): {', '.join(accounts)}")
+        self.accounts = accounts
+        # Добавлено номеров по остальным аккаунтам (как у checkpoint)
+        self.added = added or {}
+
+
+def writer_process(write_queue, ack_queues, db_path: str = config.DB_PATH):
+    """
+    Единственный процесс, пишущий в БД в режиме писателя
+
+    Воркеры присылают в write_queue сообщения:
+        ('page', worker_id, seq, account_id, phones, page)
+        ('status', worker_id, seq, account_id, status, last_page)
+        ('failure', worker_id, seq, account_id, error)
+        ('stop',)
+
+    Сообщения копятся до WRITER_BATCH_SIZE штук или WRITER_FLUSH_INTERVAL секунд
+    и применяются одной транзакцией. После коммита каждому воркеру
+    отправляется подтверждение (последний seq, добавлено номеров по аккаунтам,
+    ошибка, аккаунты с потерянными записями).
+    """
+    from utils.logger import setup_logger
+    writer_logger = setup_logger('Writer')
+
+    # Ctrl+C обрабатывает главный процесс: писатель дописывает очередь до ('stop',)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    db = Database(db_path)
+    writer_logger.info("✍️ Процесс-писатель запущен")
+    # Прокси очередей подтверждений (ack_queues может быть общим словарем менеджера)
+    acks_to = {}
+
+    batches = 0
+    messages = 0
+    stopping = False
+
+    while not stopping:
+        batch = [write_queue.get()]
+        deadline = time.monotonic() + config.WRITER_FLUSH_INTERVAL
+
+        # Добираем сообщения, пока не наберется пачка или не выйдет время
+        while len(batch) < config.WRITER_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        stopping = any(msg[0] == 'stop' for msg in batch)
+        batch = [msg for msg in batch if msg[0] != 'stop']
+        if not batch:
+            continue
+
+        acks = _apply_batch(db, batch, writer_logger)
+
+        for worker_id, ack in acks.items():
+            if worker_id not in acks_to:
+                acks_to[worker_id] = ack_queues[worker_id]
+            acks_to[worker_id].put(ack)
+
+        batches += 1
+        messages += len(batch)
+
+    stats = db.get_connection_stats()
+    writer_logger.info(
+        f"🏁 Писатель завершен: {messages} сообщений в {batches} транзакциях, "
+        f"ожидание блокировок {stats['lock_wait_seconds']:.1f} сек")
+
+
+def _apply_batch(db: Database, batch: List[tuple], writer_logger) -> Dict[int, tuple]:
+    """Применить пачку сообщений одной транзакцией с повторами"""
+    for attempt in range(1, config.RETRY_ATTEMPTS + 1):
+        acks = {}
+        try:
+            with db.connections.transaction():
+                for msg in batch:
+                    kind, worker_id, seq = msg[0], msg[1], msg[2]
+                    last_seq, added_by_account, _, _ = acks.get(worker_id, (0, {}, None, []))
+
+                    if kind == 'page':
+                        _, _, _, account_id, phones, page = msg
+                        added = db.add_phones_page(account_id, phones, page)
+                        added_by_account[account_id] = added_by_account.get(account_id, 0) + added
+                    elif kind == 'status':
+                        _, _, _, account_id, status, last_page = msg
+                        db.update_account_status(account_id, status, last_page)
+                    elif kind == 'failure':
+                        _, _, _, account_id, error = msg
+                        db.record_account_failure(account_id, error)
+
+                    acks[worker_id] = (max(last_seq, seq), added_by_account, None, [])
+            return acks
+
+        except Exception as e:
+            writer_logger.warning(
+                f"⚠️ Ошибка записи пачки (попытка {attempt}/{config.RETRY_ATTEMPTS}): {e}")
+            if attempt < config.RETRY_ATTEMPTS:
+                time.sleep(config.RETRY_DELAY)
+            else:
+                writer_logger.error(f"❌ Пачка из {len(batch)} сообщений не записана")
+                return _fail_batch(db, batch, str(e), writer_logger)
+
+
+def _fail_batch(db: Database, batch: List[tuple], error: str, writer_logger) -> Dict[int, tuple]:
+    """
+    Пачка не записана: ее аккаунты возвращаются в очередь
+
+    Номера страниц пропали, поэтому аккаунт нельзя оставлять in_progress
+    (или позже отметить completed) — неудача записывается отдельной
+    транзакцией, и аккаунт будет обработан заново с последней записанной
+    страницы. Воркеры получают подтверждение с ошибкой и списком аккаунтов.
+    """
+    accounts_by_worker: Dict[int, List[str]] = {}
+    last_seq: Dict[int, int] = {}
+    for msg in batch:
+        worker_id, seq, account_id = msg[1], msg[2], msg[3]
+        last_seq[worker_id] = max(last_seq.get(worker_id, 0), seq)
+        accounts = accounts_by_worker.setdefault(worker_id, [])
+        if account_id not in accounts:
+            accounts.append(account_id)
+
+    for accounts in accounts_by_worker.values():
+        for account_id in accounts:
+            try:
+                db.record_account_failure(account_id, f"Запись в БД не удалась: {error}")
+            except Exception as e:
+                writer_logger.error(f"❌ Не удалось вернуть {account_id} в очередь: {e}")
+
+    # Подтверждаем с ошибкой, чтобы воркеры не ждали вечно
+    return {
+        worker_id: (last_seq[worker_id], {}, error, accounts)
+        for worker_id, accounts in accounts_by_worker.items()
+    }
+
+
+class WriterClient:
+    """
+    Замена Database для воркера в режиме писателя
+
+    Записи (номера и статусы) отправляются в очередь писателя, чтение и
+    захват аккаунтов выполняются напрямую через Database.
+    """
+
+    # Сколько номеров новые, становится известно из подтверждений писателя
+    deferred_writes = True
+
+    def __init__(self, db: Database, worker_id: int, write_queue, ack_queue):
+        self.db = db
+        self.worker_id = worker_id
+        self.write_queue = write_queue
+        self.ack_queue = ack_queue
+        self._seq = 0
+        self._acked = 0
+        self._added = {}
+        self._lost = {}  # account_id -> ошибка писателя (аккаунт уже возвращен в очередь)
+        self._sent = deque()  # (seq, номеров) неподтвержденных страниц — для счетчика дублей
+
+    def __getattr__(self, name):
+        # Все остальные методы — напрямую в БД
+        return getattr(self.db, name)
+
+    def add_phones_page(self, account_id: str, phone_numbers: List[str], page: int) -> int:
+        """Отправить страницу писателю. Возвращает число отправленных номеров"""
+        seq = self._next_seq()
+        self._sent.append((seq, len(phone_numbers)))
+        self._send(('page', self.worker_id, seq, account_id, list(phone_numbers), page))
+        return len(phone_numbers)
+
+    def update_account_status(self, account_id: str, status: str, last_page: int = None):
+        """
+        Отправить обновление статуса писателю
+
+        Перед 'completed' ждем подтверждения всех записей: если часть страниц
+        аккаунта не записана, завершать его нельзя — WriteLost.
+        """
+        if status == 'completed':
+            while self._acked < self._seq:
+                self._receive_ack()
+            if account_id in self._lost:
+                raise WriteLost([account_id], self._lost[account_id])
+        self._send(('status', self.worker_id, self._next_seq(),
+                    account_id, status, last_page))
+
+    def record_account_failure(self, account_id: str, error: str) -> str:
+        """Отправить неудачу писателю и дождаться записи, чтобы узнать новый статус"""
+        while self._acked < self._seq:
+            self._receive_ack()
+        # Неудачу потерянной записи писатель уже учел сам
+        if self._lost.pop(account_id, None) is not None:
+            account = self.db.get_account(account_id)
+            return account['status'] if account else 'pending'
+        self._send(('failure', self.worker_id, self._next_seq(), account_id, error))
+        while self._acked < self._seq:
+            self._receive_ack()
+        account = self.db.get_account(account_id)
+        return account['status'] if account else 'pending'
+
+    def checkpoint(self, timeout: float = None) -> Dict[str, int]:
+        """
+        Дождаться подтверждения всех отправленных записей
+
+        Returns:
+            Количество реально добавленных номеров по аккаунтам с прошлого checkpoint
+
+        Raises:
+            WriteLost: часть записей не сохранена, аккаунты возвращены в очередь
+        """
+        while self._acked < self._seq:
+            self._receive_ack(timeout)
+        added, self._added = self._added, {}
+        if self._lost:
+            lost, self._lost = self._lost, {}
+            raise WriteLost(list(lost), next(iter(lost.values())), added)
+        return added
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    def _send(self, msg: tuple):
+        # Ограничиваем число неподтвержденных сообщений (backpressure)
+        while self._seq - self._acked > config.WRITER_MAX_PENDING:
+            self._receive_ack()
+        self.write_queue.put(msg)
+
+    def _receive_ack(self, timeout: float = None):
+        seq, added_by_account, error, lost_accounts = self.ack_queue.get(timeout=timeout)
+        if error:
+            logger.error(f"❌ Писатель не смог сохранить данные: {error}")
+            for account_id in lost_accounts:
+                self._lost[account_id] = error
+        self._acked = max(self._acked, seq)
+        for account_id, added in added_by_account.items():
+            self._added[account_id] = self._added.get(account_id, 0) + added
+
+        sent = 0
+        while self._sent and self._sent[0][0] <= self._acked:
+            sent += self._sent.popleft()[1]
+        added = sum(added_by_account.values())
+        count('phones_added', added)
+        if not error:
+            count('duplicates', sent - added)
@@ -0,0 +1,236 @@
+import re
+from typing import Dict, List, Optional
+from playwright.sync_api import Page
+from utils.logger import logger
+
+# Селекторы строк в порядке приоритета (как в DOM-парсере)
+ROW_SELECTORS = [
+    'table tbody tr',
+    'table tr',
+    'tr[data-key]',
+    '.grid-view tbody tr',
+    'div[role="row"]',
+]
+
+# Признаки ссылки на следующую страницу пагинации
+NEXT_PAGE_SELECTORS = [
+    'li.next:not(.disabled) a',
+    'a[data-page]:not(.disabled)',
+    '.pagination .next:not(.disabled)',
+    'li:not(.disabled) > a[rel="next"]',
+]
+
+# Признаки страницы с капчей вместо таблицы
+CAPTCHA_SELECTOR = ', '.join([
+    'iframe[src*="captcha"]',
+    '.g-recaptcha',
+    '.smart-captcha',
+    '#captcha',
+    'form[action*="captcha"]',
+])
+
+# Сводка GridView («Показаны записи 1-50 из 1 234.») и номера страниц
+# в пагинации (data-page считается с нуля). li.last — ссылка на последнюю
+# страницу, если она выводится; без нее пагинация показывает только окно.
+PAGINATION_INFO_SCRIPT = '''() => {
+    const summary = document.querySelector('.summary');
+    const pages = [];
+    let lastPage = null;
+    for (const link of document.querySelectorAll('.pagination a')) {
+        let num = null;
+        if (link.dataset.page !== undefined) {
+            num = parseInt(link.dataset.page, 10) + 1;
+        } else {
+            const match = (link.getAttribute('href') || '').match(/[?&]page=(\\d+)/);
+            if (match) {
+                num = parseInt(match[1], 10);
+            }
+        }
+        if (num === null || isNaN(num)) {
+            continue;
+        }
+        pages.push(num);
+        const item = link.closest('li');
+        if (item && item.classList.contains('last')) {
+            lastPage = num;
+        }
+    }
+    return {
+        summary: summary ? summary.innerText : null,
+        pages: pages,
+        lastPage: lastPage,
+    };
+}'''
+
+# Весь разбор таблицы выполняется в браузере за один вызов evaluate.
+# Колонка телефона определяется по заголовку один раз; если заголовка нет,
+# номера ищутся регуляркой по тексту строки и по ячейкам из 11 цифр.
+PHONE_EXTRACT_SCRIPT = '''(rowSelectors) => {
+    let rows = [];
+    let usedSelector = null;
+    for (const selector of rowSelectors) {
+        rows = document.querySelectorAll(selector);
+        if (rows.length > 0) {
+            usedSelector = selector;
+            break;
+        }
+    }
+    if (rows.length === 0) {
+        return null;
+    }
+
+    let phoneColumn = -1;
+    const headers = document.querySelectorAll('table thead th, table tr:first-child th');
+    for (let i = 0; i < headers.length; i++) {
+        if ((headers[i].innerText || '').toUpperCase().includes('ТЕЛЕФОН')) {
+            phoneColumn = headers[i].cellIndex;
+            break;
+        }
+    }
+
+    const isPhone = (text) => /^7\\d{10}$/.test(text);
+    const phones = new Set();
+
+    for (const row of rows) {
+        const rowText = row.innerText || '';
+        const cells = row.cells || [];
+        // Заголовки — по разметке, а не по тексту: строка в thead, строка
+        // таблицы без td или строка div-грида с заголовками колонок
+        if (row.closest('thead') ||
+                (cells.length > 0 && !row.querySelector('td')) ||
+                row.querySelector('[role="columnheader"]')) {
+            continue;
+        }
+
+        if (phoneColumn >= 0 && cells[phoneColumn]) {
+            const digits = (cells[phoneColumn].innerText || '').replace(/\\D/g, '');
+            if (isPhone(digits)) {
+                phones.add(digits);
+                continue;
+            }
+        }
+
+        const matches = rowText.match(/\\b7\\d{10}\\b/g);
+        if (matches) {
+            matches.forEach((phone) => phones.add(phone));
+            continue;
+        }
+
+        for (const cell of cells) {
+            const text = (cell.innerText || '').trim();
+            if (isPhone(text)) {
+                phones.add(text);
+            }
+        }
+    }
+
+    return {
+        selector: usedSelector,
+        rows: rows.length,
+        phoneColumn: phoneColumn,
+        phones: Array.from(phones),
+    };
+}'''
+
+
+def total_pages_from(info: Dict, per_page: int) -> Optional[int]:
+    """
+    Число страниц по сводке или ссылке на последнюю страницу
+
+    Returns:
+        Число страниц или None, если по странице его не определить
+    """
+    summary = (info.get('summary') or '').replace('\xa0', ' ')
+    total_match = re.search(r'из\s*(\d[\d ]*)', summary)
+    if total_match:
+        total = int(total_match.group(1).replace(' ', ''))
+        # Размер страницы — по диапазону первой страницы, если он полный
+        range_match = re.search(r'(\d[\d ]*?)\s*[-–—]\s*(\d[\d ]*)', summary)
+        if range_match:
+            first = int(range_match.group(1).replace(' ', ''))
+            last = int(range_match.group(2).replace(' ', ''))
+            if first == 1 and last < total:
+                per_page = last
+        return max(1, -(-total // per_page))
+
+    if info.get('lastPage'):
+        return info['lastPage']
+
+    return None
+
+
+def read_total_pages(page: Page, per_page: int) -> Optional[int]:
+    """Определить число страниц таблицы по открытой странице"""
+    return total_pages_from(page.evaluate(PAGINATION_INFO_SCRIPT), per_page)
+
+
+def has_captcha(page: Page) -> bool:
+    """На странице капча (признак блокировки по частоте запросов)"""
+    try:
+        return page.query_selector(CAPTCHA_SELECTOR) is not None
+    except Exception:
+        return False
+
+
+def extract_phones(page: Page) -> Optional[List[str]]:
+    """
+    Извлечь номера со страницы одним вызовом page.evaluate
+
+    Returns:
+        Уникальные номера или None, если таблица не найдена
+    """
+    result = page.evaluate(PHONE_EXTRACT_SCRIPT, ROW_SELECTORS)
+    if result is None:
+        return None
+
+    logger.debug(
+        f"   ✓ Найдено {result['rows']} строк (селектор: {result['selector']}, "
+        f"колонка телефона: {result['phoneColumn']})")
+    return result['phones']
+
+
+PHONE_PATTERN = re.compile(r'\b7\d{10}\b', re.ASCII)
+PHONE_CELL_PATTERN = re.compile(r'7\d{10}', re.ASCII)
+
+
+def phones_from_rows(headers: List[str], rows: List[List[str]]) -> List[str]:
+    """
+    Тот же разбор, что в PHONE_EXTRACT_SCRIPT, по уже извлеченным текстам
+    ячеек (для HTML, полученного без браузера)
+
+    Args:
+        headers: Тексты ячеек строки заголовков
+        rows: Строки данных — заголовки отделяются по разметке при разборе
+              HTML (GridHTMLParser), текст ячеек здесь не проверяется
+
+    Returns:
+        Уникальные номера в порядке появления
+    """
+    phone_column = -1
+    for index, header in enumerate(headers):
+        if 'ТЕЛЕФОН' in header.upper():
+            phone_column = index
+            break
+
+    phones = {}
+    for cells in rows:
+        row_text = '\t'.join(cells)
+
+        if 0 <= phone_column < len(cells):
+            digits = re.sub(r'\D', '', cells[phone_column])
+            if PHONE_CELL_PATTERN.fullmatch(digits):
+                phones[digits] = True
+                continue
+
+        matches = PHONE_PATTERN.findall(row_text)
+        if matches:
+            for phone in matches:
+                phones[phone] = True
+            continue
+
+        for cell in cells:
+            text = cell.strip()
+            if PHONE_CELL_PATTERN.fullmatch(text):
+                phones[text] = True
+
+    return list(phones)
@@ -0,0 +1,137 @@
+"""
+Сравнение скорости движков парсинга номеров на локальном стенде
+
+Локальный HTTP-сервер отдает сохраненные страницы таблицы номеров
+(файлы *.html из каталога, по порядку имен: ?page=1 — первый файл) или
+сгенерированные страницы в верстке Yii2 GridView.
+
+Запуск:
+    python -m scraper.fetch_bench --pages 200
+    python -m scraper.fetch_bench --pages-dir data/recorded_pages --no-browser
+"""
+import random
+import threading
+import time
+from argparse import ArgumentParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+from urllib.parse import parse_qs, urlsplit
+from scraper.http_scraper import create_http_session, fetch_grid
+from scraper.phone_scraper import set_page_param
+
+
+def _generate_pages(pages: int, rows: int) -> List[bytes]:
+    """Страницы в верстке GridView: колонка «Телефон», пагинация li.next"""
+    rnd = random.Random(42)
+    result = []
+    for page_num in range(1, pages + 1):
+        body = [
+            '<html><body><div class="grid-view">',
+            f'<div class="summary">Показаны <b>{(page_num - 1) * rows + 1}-{page_num * rows}</b> '
+            f'из <b>{pages * rows}</b> записей.</div>',
+            '<table class="table table-striped table-bordered"><thead><tr>'
+            '<th>#</th><th>Проект</th><th>Телефон</th><th>Дата</th></tr></thead><tbody>',
+        ]
+        for row in range(rows):
+            body.append(
+                f'<tr data-key="{page_num * rows + row}"><td>{row + 1}</td>'
+                f'<td>Кампания {rnd.randrange(100)}</td>'
+                f'<td>7{rnd.randrange(10 ** 10):010d}</td><td>2024-01-01 12:00</td></tr>')
+        next_class = 'next disabled' if page_num == pages else 'next'
+        body.append(
+            '</tbody></table><ul class="pagination">'
+            '<li class="prev"><a href="?page=1">&laquo;</a></li>'
+            f'<li class="active"><a href="?page={page_num}">{page_num}</a></li>'
+            f'<li class="{next_class}"><a href="?page={page_num + 1}">&raquo;</a></li>'
+            '</ul></div></body></html>')
+        result.append(''.join(body).encode('utf-8'))
+    return result
+
+
+def _load_pages(pages_dir: str) -> List[bytes]:
+    return [path.read_bytes() for path in sorted(Path(pages_dir).glob('*.html'))]
+
+
+def start_server(pages: List[bytes]) -> ThreadingHTTPServer:
+    """Поднять сервер-заглушку на свободном порту localhost"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlsplit(self.path).query)
+            page_num = int(query.get('page', ['1'])[0])
+            body = pages[min(max(page_num, 1), len(pages)) - 1]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_http(base_url: str, pages: int) -> dict:
+    session = create_http_session()
+    phones = set()
+    started = time.perf_counter()
+    for page_num in range(1, pages + 1):
+        grid = fetch_grid(session, set_page_param(base_url, page_num))
+        if grid is None:
+            raise RuntimeError(f"Нет таблицы на странице {page_num}")
+        phones.update(grid['phones'])
+    elapsed = time.perf_counter() - started
+    return {'engine': 'http', 'pages': pages, 'seconds': elapsed, 'phones': len(phones)}
+
+
+def bench_browser(base_url: str, pages: int) -> dict:
+    from scraper.browser import BrowserManager
+    from scraper.extractors import extract_phones
+    from scraper.waits import wait_for_grid
+
+    phones = set()
+    with BrowserManager(headless=True) as browser:
+        page = browser.new_page()
+        started = time.perf_counter()
+        for page_num in range(1, pages + 1):
+            page.goto(set_page_param(base_url, page_num))
+            wait_for_grid(page, 'bench')
+            phones.update(extract_phones(page) or [])
+        elapsed = time.perf_counter() - started
+    return {'engine': 'browser', 'pages': pages, 'seconds': elapsed, 'phones': len(phones)}
+
+
+def main():
+    parser = ArgumentParser(description='Бенчмарк движков парсинга номеров')
+    parser.add_argument('--pages-dir', default=None, help='Каталог с сохраненными страницами *.html')
+    parser.add_argument('--pages', type=int, default=200, help='Число сгенерированных страниц')
+    parser.add_argument('--rows', type=int, default=50, help='Строк на сгенерированной странице')
+    parser.add_argument('--no-browser', action='store_true', help='Только HTTP-движок')
+    args = parser.parse_args()
+
+    pages = _load_pages(args.pages_dir) if args.pages_dir else _generate_pages(args.pages, args.rows)
+    if not pages:
+        raise SystemExit(f"Нет страниц *.html в {args.pages_dir}")
+
+    server = start_server(pages)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/phones"
+    print(f"Стенд: {base_url}, страниц: {len(pages)}")
+
+    engines = [bench_http] if args.no_browser else [bench_http, bench_browser]
+    try:
+        for bench in engines:
+            result = bench(base_url, len(pages))
+            print(
+                f"{result['engine']:>8}: {result['pages']} стр. за {result['seconds']:.2f} сек, "
+                f"{result['pages'] / result['seconds']:.1f} стр/сек, "
+                f"уникальных номеров {result['phones']:,}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
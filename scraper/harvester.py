@@ -1,407 +1,585 @@
-import time
-import random
-import re
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
-from typing import List, Dict
-import config
-from database.db import Database
-from utils.logger import logger
-
-
-class AccountHarvester:
-    def __init__(self, page: Page, db: Database):
-        self.page = page
-        self.db = db
-
-    def harvest_all_accounts(self):
-        """Собрать все аккаунты со всех страниц"""
-        logger.info("🌾 Начало сбора аккаунтов...")
-
-        # Переход на страницу с retry логикой
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                logger.info(
-                    f"⏳ Загрузка страницы (попытка {attempt}/{max_retries})...")
-                logger.info(
-                    "   (Страница может грузиться до 2 минут - это нормально)")
-
-                self.page.goto(config.ACCOUNTS_URL,
-                               timeout=config.PAGE_LOAD_TIMEOUT)
-
-                # Ждем загрузки
-                logger.info("⏳ Ожидание полной загрузки контента...")
-                time.sleep(5)
-
-                break  # Успешно загрузилось
-
-            except PlaywrightTimeout:
-                if attempt < max_retries:
-                    logger.warning(
-                        f"⚠️ Таймаут загрузки. Повтор через {config.RETRY_DELAY} сек...")
-                    time.sleep(config.RETRY_DELAY)
-                else:
-                    logger.error(
-                        "❌ Не удалось загрузить страницу после всех попыток")
-                    raise
-
-        current_page = 1
-        total_accounts = 0
-
-        while True:
-            logger.info(f"📄 Обработка страницы {current_page}...")
-
-            # Ждем загрузки контента (динамическая таблица)
-            time.sleep(3)
-
-            # Парсим аккаунты на текущей странице
-            accounts = self._parse_accounts_on_page()
-
-            if not accounts:
-                logger.warning("⚠️ Аккаунты не найдены на странице")
-
-                # Отладка
-                if current_page == 1:
-                    self.page.screenshot(path='debug_screenshot.png')
-                    logger.info("📸 Скриншот: debug_screenshot.png")
-
-                    html_content = self.page.content()
-                    with open('debug_page.html', 'w', encoding='utf-8') as f:
-                        f.write(html_content)
-                    logger.info("📄 HTML сохранен: debug_page.html")
-
-                    all_tr = self.page.query_selector_all('tr')
-                    logger.info(f"   Всего <tr> элементов: {len(all_tr)}")
-                break
-
-            # Генерируем токены для каждого аккаунта
-            for idx, account in enumerate(accounts, 1):
-                logger.info(
-                    f"   [{idx}/{len(accounts)}] Обработка: {account['username']}")
-
-                token_url = self._generate_token(account['account_id'])
-
-                if token_url:
-                    self.db.add_account(
-                        account_id=account['account_id'],
-                        username=account['username'],
-                        token_url=token_url
-                    )
-                    total_accounts += 1
-                    logger.info(f"   ✅ Токен получен")
-                else:
-                    logger.error(f"   ❌ Не удалось получить токен")
-
-                time.sleep(random.uniform(*config.DELAY_BETWEEN_REQUESTS))
-
-            # Проверяем следующую страницу
-            if not self._has_next_page():
-                logger.info("📭 Достигнута последняя страница")
-                break
-
-            # Переход на следующую страницу
-            self._go_to_next_page()
-            current_page += 1
-            time.sleep(random.uniform(3, 5))
-
-        logger.info(f"🎉 Сбор завершен! Всего аккаунтов: {total_accounts}")
-
-    def _parse_accounts_on_page(self) -> List[Dict]:
-        """Парсинг аккаунтов на текущей странице"""
-        accounts = []
-
-        try:
-            # ИСПРАВЛЕНИЕ: Разные варианты селекторов для таблицы
-            selectors = [
-                'table tbody tr',           # Стандартная таблица
-                'table tr',                 # Без tbody
-                'div[role="row"]',          # Grid/DataTable
-                'tr[data-key]',             # Yii2 GridView
-                '.grid-view tbody tr',      # Yii2 с классом
-            ]
-
-            rows = []
-            for selector in selectors:
-                rows = self.page.query_selector_all(selector)
-                if len(rows) > 0:
-                    logger.info(
-                        f"   ✓ Найдено {len(rows)} строк с селектором: {selector}")
-                    break
-
-            if len(rows) == 0:
-                logger.error(
-                    "   ✗ Не найдено ни одной строки с любым селектором")
-                return []
-
-            # Парсим каждую строку
-            for idx, row in enumerate(rows):
-                try:
-                    # Получаем весь текст строки
-                    row_text = row.inner_text()
-
-                    # Пропускаем заголовки и пустые строки
-                    if not row_text or 'Пользователь' in row_text:
-                        continue
-
-                    # Проверяем наличие ID и username (не полагаемся на слово "клиент")
-                    # ✅ ИСПРАВЛЕННАЯ ВЕРСИЯ
-                    # Проверяем наличие ID и username
-                    id_match = re.search(r'#(\d+)', row_text)
-                    username_match = re.search(r'@([\w\-\.]+)', row_text)
-
-                    if not id_match or not username_match:
-                        continue  # Это не строка с аккаунтом
-
-                    # Извлекаем значения
-                    account_id = id_match.group(1)
-                    username = username_match.group(1)
-
-                    # Добавляем в список
-                    accounts.append({
-                        'account_id': account_id,
-                        'username': username
-                    })
-
-                    if idx < 3:  # Логируем первые 3 для проверки
-                        logger.debug(f"   Найден: ID={account_id}, User={username}")
-
-
-                except Exception as e:
-                    logger.debug(f"   Ошибка парсинга строки {idx}: {e}")
-                    continue
-
-        except Exception as e:
-            logger.error(f"Критическая ошибка парсинга: {e}")
-
-        return accounts
-
-    def _generate_token(self, account_id: str) -> str:
-        """Генерация токена через клик на кнопку"""
-        try:
-            # Ищем строку с нужным account_id
-            row_xpath = f'//tr[contains(., "#{account_id}")]'
-            row = self.page.query_selector(row_xpath)
-
-            if not row:
-                logger.error(f"   Строка с ID {account_id} не найдена")
-                return None
-
-            # Ищем кнопку генерации токена
-            button = row.query_selector('a[onclick*="create-token"]')
-
-            if not button:
-                button = row.query_selector('[data-url*="create-token"]')
-
-            if not button:
-                button = row.query_selector('a[title*="ссылк"]')
-
-            if not button:
-                links = row.query_selector_all('a')
-                if len(links) > 0:
-                    button = links[0]
-
-            if not button:
-                logger.error(
-                    f"   Кнопка токена не найдена для ID {account_id}")
-                return None
-
-            # СПОСОБ 1: Перехватываем network request
-            token_url = None
-            network_intercepted = False
-
-
-            # СПОСОБ 2: Перехватываем dialog
-            dialog_appeared = False
-
-            def handle_dialog(dialog):
-                nonlocal token_url, dialog_appeared
-                dialog_appeared = True
-                message = dialog.message
-                logger.debug(f"   Dialog: {message[:100]}...")
-
-                # Извлекаем токен из сообщения
-                if 'signin?token=' in message:
-                    import re
-                    match = re.search(r'(http[s]?://[^\s]+)', message)
-                    if match:
-                        token_url = match.group(1)
-
-                dialog.accept()
-
-            self.page.on('dialog', handle_dialog)
-
-            # СПОСОБ 3: Читаем буфер обмена (после клика токен копируется туда)
-            # Для этого нужно дать разрешение на чтение clipboard
-
-            # Кликаем на кнопку
-            try:
-                button.click(timeout=5000)
-            except Exception as e:
-                logger.error(f"   Ошибка клика: {e}")
-
-            # Ждем результата
-            time.sleep(2)
-
-            # Пробуем прочитать из буфера обмена
-            if not token_url:
-                try:
-                    # Выполняем JS для чтения clipboard
-                    clipboard_text = self.page.evaluate(
-                        '() => navigator.clipboard.readText()')
-                    if clipboard_text and 'signin?token=' in clipboard_text:
-                        token_url = clipboard_text
-                        logger.debug(
-                            f"   Токен из буфера: {clipboard_text[:50]}...")
-                except Exception as e:
-                    logger.debug(f"   Не удалось прочитать буфер: {e}")
-
-            # Ищем toast/notification на странице
-            if not token_url:
-                try:
-                    # Ищем уведомление с токеном
-                    notification_selectors = [
-                        '.alert:has-text("http")',
-                        '.notification:has-text("signin")',
-                        '[role="alert"]:has-text("token")',
-                        '.toast:has-text("http")',
-                        'div:has-text("signin?token=")',
-                    ]
-
-                    for selector in notification_selectors:
-                        notification = self.page.query_selector(selector)
-                        if notification:
-                            text = notification.inner_text()
-                            if 'signin?token=' in text:
-                                import re
-                                match = re.search(r'(http[s]?://[^\s]+)', text)
-                                if match:
-                                    token_url = match.group(1)
-                                    logger.debug(
-                                        f"   Токен из уведомления: {token_url[:50]}...")
-                                    break
-                except:
-                    pass
-
-            # Убираем listeners
-            self.page.remove_listener('dialog', handle_dialog)
-
-            if token_url:
-                # Очищаем токен от мусора
-                if '?' in token_url:
-                    # Убираем пробелы и лишнее
-                    token_url = token_url.split()[0]
-                return token_url
-
-            logger.error(f"   Dialog не появился или токен не найден")
-
-            # ОТЛАДКА: Сохраняем скриншот
-            self.page.screenshot(path=f'debug_token_{account_id}.png')
-            logger.info(f"   📸 Скриншот: debug_token_{account_id}.png")
-
-            return None
-
-        except Exception as e:
-            logger.error(f"   Ошибка генерации токена: {e}")
-            return None
-
-    def _has_next_page(self) -> bool:
-        """Проверка наличия следующей страницы (Vue.js)"""
-        try:
-            # ИСПРАВЛЕНИЕ: Селекторы для Vue.js
-            next_selectors = [
-                # Vue.js кнопки (НЕ disabled)
-                'button.v-btn:has(.icon-chevron_right):not(:disabled)',
-                'button[aria-label*="next"]:not(:disabled)',
-                
-                # Fallback для HTML
-                'li.next:not(.disabled) a',
-                'a[data-page]:not(.disabled)',
-            ]
-            
-            for selector in next_selectors:
-                next_button = self.page.query_selector(selector)
-                if next_button:
-                    # Дополнительно проверяем, что кнопка видна
-                    is_visible = self.page.is_visible(selector)
-                    if is_visible:
-                        logger.debug(f"   ✓ Найдена активная кнопка 'Next'")
-                        return True
-            
-            logger.debug("   ℹ️ Кнопка 'Next' disabled или не найдена")
-            return False
-            
-        except Exception as e:
-            logger.debug(f"   Ошибка проверки next page: {e}")
-            return False
-
-
-    def _go_to_next_page(self):
-        """Переход на следующую страницу (Vue.js DataTable)"""
-        try:
-            # ИСПРАВЛЕНИЕ: Селекторы для Vue.js кнопок
-            next_selectors = [
-                # Vue.js Material Design кнопки
-                'button.v-btn:has(.icon-chevron_right):not(:disabled)',
-                'button[aria-label*="next"]:not(:disabled)',
-                'button:has-text("Next"):not(:disabled)',
-                
-                # Fallback для обычных HTML ссылок
-                'li.next:not(.disabled) a',
-                'a[rel="next"]:not(.disabled)',
-            ]
-            
-            # Запоминаем текущие данные ПЕРЕД кликом
-            old_pagination_text = None
-            try:
-                pagination = self.page.query_selector('.v-datatable_actions_pagination')
-                if pagination:
-                    old_pagination_text = pagination.inner_text()
-                    logger.debug(f"   До клика: {old_pagination_text}")
-            except:
-                pass
-            
-            # Ищем и кликаем кнопку
-            next_button = None
-            for selector in next_selectors:
-                next_button = self.page.query_selector(selector)
-                if next_button:
-                    logger.debug(f"   ✓ Найдена кнопка: {selector}")
-                    break
-            
-            if not next_button:
-                logger.error("❌ Кнопка 'Следующая страница' не найдена")
-                return False
-            
-            # Кликаем
-            next_button.click()
-            logger.info("   🖱️ Клик по кнопке 'Следующая'")
-            
-            # ИСПРАВЛЕНИЕ: Ждём обновления данных (AJAX)
-            max_wait = 10  # Максимум 10 секунд
-            updated = False
-            
-            for i in range(max_wait):
-                time.sleep(1)
-                
-                # Проверяем, изменился ли текст пагинации
-                try:
-                    pagination = self.page.query_selector('.v-datatable_actions_pagination')
-                    if pagination:
-                        new_text = pagination.inner_text()
-                        if new_text != old_pagination_text:
-                            logger.info(f"   ✅ Страница обновлена: {new_text}")
-                            updated = True
-                            break
-                except:
-                    pass
-            
-            if not updated:
-                logger.warning("   ⚠️ Данные не обновились после клика")
-            
-            # Дополнительная задержка для стабильности
-            time.sleep(2)
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Ошибка перехода на следующую страницу: {e}")
-            return False
+import time
+import random
+import re
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
+from typing import List, Dict, Tuple
+import config
+from database.db import Database
+from scraper.accounts_api import AccountsApi
+from scraper.token_service import TokenService, probe_tokens
+from scraper.waits import (wait_for_grid, wait_for_network_idle,
+                           wait_for_text_change, wait_until, wait_stats)
+from utils.logger import logger
+
+PAGINATION_SELECTOR = '.v-datatable_actions_pagination'
+TOKEN_IN_TEXT = re.compile(r'(http[s]?://[^\s]+)')
+
+
+class AccountHarvester:
+    def __init__(self, page: Page, db: Database, fresh: bool = False,
+                 tokens_on_demand: bool = False):
+        self.page = page
+        self.db = db
+        # fresh — собрать заново: без точки продолжения и с новыми токенами для всех
+        self.fresh = fresh
+        # Только список аккаунтов, токены генерируют воркеры конвейера
+        self.tokens_on_demand = tokens_on_demand
+        self.skipped = 0
+        self.missing_tokens = 0  # Аккаунты, для которых токен не получен
+        # Токены прямыми запросами к API; клик по кнопке — запасной путь
+        self.token_service = TokenService() if config.TOKEN_MODE == 'api' else None
+        # Список аккаунтов из JSON-ответов таблицы вместо разбора строк
+        self.accounts_api = AccountsApi(page) if config.HARVEST_MODE == 'xhr' else None
+
+        # Один обработчик диалогов на всю страницу (не по одному на аккаунт)
+        self._dialog_token = None
+        self.page.on('dialog', self._on_dialog)
+
+    def harvest_all_accounts(self):
+        """Собрать все аккаунты со всех страниц"""
+        logger.info("🌾 Начало сбора аккаунтов...")
+
+        # Ответы Vue-таблицы ловим с первой загрузки страницы
+        if self.accounts_api:
+            self.accounts_api.listen()
+
+        # Переход на страницу с retry логикой
+        max_retries = 3
+        for attempt in range(1, max_retries + 1):
+            try:
+                logger.info(
+                    f"⏳ Загрузка страницы (попытка {attempt}/{max_retries})...")
+                logger.info(
+                    "   (Страница может грузиться до 2 минут - это нормально)")
+
+                self.page.goto(config.ACCOUNTS_URL,
+                               timeout=config.PAGE_LOAD_TIMEOUT)
+
+                # Ждем загрузки
+                logger.info("⏳ Ожидание полной загрузки контента...")
+                wait_for_grid(self.page, 'accounts_page')
+
+                break  # Успешно загрузилось
+
+            except PlaywrightTimeout:
+                if attempt < max_retries:
+                    logger.warning(
+                        f"⚠️ Таймаут загрузки. Повтор через {config.RETRY_DELAY} сек...")
+                    time.sleep(config.RETRY_DELAY)
+                else:
+                    logger.error(
+                        "❌ Не удалось загрузить страницу после всех попыток")
+                    raise
+
+        # Cookies и CSRF авторизованной сессии для запросов create-token
+        if self.token_service:
+            self.token_service.load_session(self.page)
+
+        if self.accounts_api:
+            self.accounts_api.stop()
+            if not self.accounts_api.discovered:
+                logger.warning("⚠️ JSON-источник таблицы не найден, разбираю строки таблицы")
+
+        use_api = self.accounts_api is not None and self.accounts_api.discovered
+        if use_api and not self.token_service and not self.tokens_on_demand:
+            # Строки списка из API не отрисованы — кнопкой токены не сгенерировать
+            logger.info("   Токены генерируются кнопкой (TOKEN_MODE='ui'), разбираю строки таблицы")
+            use_api = False
+
+        if use_api:
+            total_accounts, complete = self._harvest_api()
+            if self.missing_tokens or not complete:
+                logger.warning(
+                    f"⚠️ Без токена после API: {self.missing_tokens}"
+                    + ("" if complete else ", список прочитан не полностью")
+                    + " — дополняю по строкам таблицы")
+                # Уже полученные токены действуют и не генерируются повторно
+                self.fresh = False
+                self.missing_tokens = 0
+                total_accounts += self._harvest_dom()
+        else:
+            total_accounts = self._harvest_dom()
+
+        logger.info(f"🎉 Сбор завершен! Новых токенов: {total_accounts}")
+        if self.skipped:
+            logger.info(f"⏭️ Пропущено аккаунтов с действующим токеном: {self.skipped}")
+        if self.token_service:
+            self.token_service.log_summary()
+        wait_stats.log_summary()
+
+    def _harvest_api(self) -> Tuple[int, bool]:
+        """
+        Обход списка JSON-запросами по ACCOUNTS_PER_PAGE записей
+
+        Returns:
+            (аккаунтов с новым токеном, список прочитан до конца)
+        """
+        total_accounts = 0
+        complete = False
+        held = False
+        start_page = self._resume_page('xhr')
+        try:
+            for page_num, accounts in self.accounts_api.iter_pages(start_page):
+                logger.info(f"📄 Страница {page_num} списка (API): {len(accounts)} аккаунтов")
+                missing_before = self.missing_tokens
+                total_accounts += self._save_accounts(accounts, ui_fallback=False)
+                held = self._checkpoint('xhr', page_num, accounts, missing_before, held)
+            if not held:
+                self.db.clear_harvest_checkpoint()
+            complete = True
+        except Exception as e:
+            logger.error(f"❌ Ошибка запроса списка аккаунтов: {e}")
+        self.accounts_api.log_summary()
+        return total_accounts, complete
+
+    def _resume_page(self, mode: str) -> int:
+        """
+        Страница списка, с которой начинать сбор
+
+        Последняя сохраненная страница читается повторно: новые аккаунты
+        сдвигают список, а аккаунты с действующим токеном все равно
+        пропускаются без запросов.
+        """
+        if self.fresh:
+            self.db.clear_harvest_checkpoint()
+            return 1
+        checkpoint = self.db.get_harvest_checkpoint(mode)
+        if not checkpoint:
+            return 1
+        logger.info(
+            f"↪️ Продолжение сбора со страницы {checkpoint['listing_page']} "
+            f"(последний аккаунт #{checkpoint['last_account_id']}, {checkpoint['updated_at']})")
+        return checkpoint['listing_page']
+
+    def _checkpoint(self, mode: str, page_num: int, accounts: List[Dict],
+                    missing_before: int, held: bool) -> bool:
+        """
+        Сдвинуть точку продолжения на обработанную страницу
+
+        Точка сдвигается, только пока все аккаунты страниц сохранены с токеном
+        или поставлены в очередь: иначе повторный сбор начнется после
+        аккаунтов, оставшихся без токена, и они не попадут в базу.
+
+        Returns:
+            True — точка продолжения остановлена на предыдущей полной странице
+        """
+        if held or self.missing_tokens > missing_before:
+            if not held:
+                logger.warning(
+                    f"⚠️ На странице {page_num} есть аккаунты без токена — "
+                    f"точка продолжения остается на предыдущей странице")
+            return True
+        self.db.save_harvest_checkpoint(mode, page_num, accounts[-1]['account_id'])
+        return False
+
+    def _harvest_dom(self) -> int:
+        """Обход отрисованной таблицы по страницам (клик «Следующая»)"""
+        current_page = 1
+        total_accounts = 0
+        held = False
+
+        # Продолжение: листаем таблицу до сохраненной страницы без разбора
+        start_page = self._resume_page('dom')
+        while current_page < start_page and self._has_next_page():
+            if not self._go_to_next_page():
+                break
+            current_page += 1
+
+        while True:
+            logger.info(f"📄 Обработка страницы {current_page}...")
+
+            # Парсим аккаунты на текущей странице
+            accounts = self._parse_accounts_on_page()
+
+            if not accounts:
+                logger.warning("⚠️ Аккаунты не найдены на странице")
+
+                # Отладка
+                if current_page == 1:
+                    self.page.screenshot(path='debug_screenshot.png')
+                    logger.info("📸 Скриншот: debug_screenshot.png")
+
+                    html_content = self.page.content()
+                    with open('debug_page.html', 'w', encoding='utf-8') as f:
+                        f.write(html_content)
+                    logger.info("📄 HTML сохранен: debug_page.html")
+
+                    all_tr = self.page.query_selector_all('tr')
+                    logger.info(f"   Всего <tr> элементов: {len(all_tr)}")
+                break
+
+            missing_before = self.missing_tokens
+            total_accounts += self._save_accounts(accounts)
+            held = self._checkpoint('dom', current_page, accounts, missing_before, held)
+
+            # Проверяем следующую страницу
+            if not self._has_next_page():
+                logger.info("📭 Достигнута последняя страница")
+                if not held:
+                    self.db.clear_harvest_checkpoint()
+                break
+
+            # Переход на следующую страницу (ждет обновления таблицы)
+            self._go_to_next_page()
+            current_page += 1
+
+        return total_accounts
+
+    def _save_accounts(self, accounts: List[Dict], ui_fallback: bool = True) -> int:
+        """
+        Получить токены и сохранить аккаунты
+
+        Args:
+            ui_fallback: Генерировать кнопкой токены, не полученные через API
+                (только когда строки аккаунтов отрисованы на странице)
+
+        Returns:
+            Количество аккаунтов, сохраненных с новым токеном
+        """
+        # Аккаунты с действующим токеном из прошлых сборов не трогаем
+        if not self.fresh:
+            valid = self.db.get_valid_tokens([account['account_id'] for account in accounts])
+            if valid and config.TOKEN_PROBE:
+                valid = probe_tokens(valid, self.token_service.limiter if self.token_service else None)
+            if valid:
+                logger.info(f"   ⏭️ С действующим токеном: {len(valid)}/{len(accounts)}")
+                self.skipped += len(valid)
+                accounts = [account for account in accounts if account['account_id'] not in valid]
+            if not accounts:
+                return 0
+
+        # Токен сгенерирует воркер перед парсингом — сохраняем только список
+        if self.tokens_on_demand:
+            for account in accounts:
+                self.db.add_account(account['account_id'], account['username'], None)
+            logger.info(f"   📥 В очередь без токена: {len(accounts)}")
+            return 0
+
+        # Токены всей страницы — параллельными запросами к API; каждый аккаунт
+        # сохраняется сразу, чтобы воркеры конвейера могли его забрать
+        saved = 0
+        tokens = {}
+        if self.token_service and not self.token_service.disabled:
+            by_id = {account['account_id']: account for account in accounts}
+            for account_id, token_url in self.token_service.iter_tokens(by_id):
+                if token_url:
+                    account = by_id[account_id]
+                    self.db.add_account(account_id, account['username'], token_url)
+                    tokens[account_id] = token_url
+                    saved += 1
+            logger.info(f"   🔑 Токенов через API: {len(tokens)}/{len(accounts)}")
+
+        # Без токена из API — генерация кнопкой
+        for idx, account in enumerate(accounts, 1):
+            if account['account_id'] in tokens:
+                continue
+
+            token_url = None
+            if ui_fallback:
+                logger.info(
+                    f"   [{idx}/{len(accounts)}] Обработка: {account['username']}")
+                token_url = self._generate_token(account['account_id'])
+                time.sleep(random.uniform(*config.DELAY_BETWEEN_REQUESTS))
+
+            if token_url:
+                self.db.add_account(
+                    account_id=account['account_id'],
+                    username=account['username'],
+                    token_url=token_url
+                )
+                saved += 1
+                logger.debug(f"   ✅ Токен получен: {account['username']}")
+            else:
+                self.missing_tokens += 1
+                logger.error(f"   ❌ Не удалось получить токен: {account['username']}")
+
+        return saved
+
+    def _parse_accounts_on_page(self) -> List[Dict]:
+        """Парсинг аккаунтов на текущей странице"""
+        accounts = []
+
+        try:
+            # ИСПРАВЛЕНИЕ: Разные варианты селекторов для таблицы
+            selectors = [
+                'table tbody tr',           # Стандартная таблица
+                'table tr',                 # Без tbody
+                'div[role="row"]',          # Grid/DataTable
+                'tr[data-key]',             # Yii2 GridView
+                '.grid-view tbody tr',      # Yii2 с классом
+            ]
+
+            rows = []
+            for selector in selectors:
+                rows = self.page.query_selector_all(selector)
+                if len(rows) > 0:
+                    logger.info(
+                        f"   ✓ Найдено {len(rows)} строк с селектором: {selector}")
+                    break
+
+            if len(rows) == 0:
+                logger.error(
+                    "   ✗ Не найдено ни одной строки с любым селектором")
+                return []
+
+            # Парсим каждую строку
+            for idx, row in enumerate(rows):
+                try:
+                    # Получаем весь текст строки
+                    row_text = row.inner_text()
+
+                    # Пропускаем заголовки и пустые строки
+                    if not row_text or 'Пользователь' in row_text:
+                        continue
+
+                    # Проверяем наличие ID и username (не полагаемся на слово "клиент")
+                    # ✅ ИСПРАВЛЕННАЯ ВЕРСИЯ
+                    # Проверяем наличие ID и username
+                    id_match = re.search(r'#(\d+)', row_text)
+                    username_match = re.search(r'@([\w\-\.]+)', row_text)
+
+                    if not id_match or not username_match:
+                        continue  # Это не строка с аккаунтом
+
+                    # Извлекаем значения
+                    account_id = id_match.group(1)
+                    username = username_match.group(1)
+
+                    # Добавляем в список
+                    accounts.append({
+                        'account_id': account_id,
+                        'username': username
+                    })
+
+                    if idx < 3:  # Логируем первые 3 для проверки
+                        logger.debug(f"   Найден: ID={account_id}, User={username}")
+
+
+                except Exception as e:
+                    logger.debug(f"   Ошибка парсинга строки {idx}: {e}")
+                    continue
+
+        except Exception as e:
+            logger.error(f"Критическая ошибка парсинга: {e}")
+
+        return accounts
+
+    def _generate_token(self, account_id: str) -> str:
+        """Генерация токена через клик на кнопку"""
+        try:
+            # Ищем строку с нужным account_id
+            row_xpath = f'//tr[contains(., "#{account_id}")]'
+            row = self.page.query_selector(row_xpath)
+
+            if not row:
+                logger.error(f"   Строка с ID {account_id} не найдена")
+                return None
+
+            # Ищем кнопку генерации токена
+            button = row.query_selector('a[onclick*="create-token"]')
+
+            if not button:
+                button = row.query_selector('[data-url*="create-token"]')
+
+            if not button:
+                button = row.query_selector('a[title*="ссылк"]')
+
+            if not button:
+                links = row.query_selector_all('a')
+                if len(links) > 0:
+                    button = links[0]
+
+            if not button:
+                logger.error(
+                    f"   Кнопка токена не найдена для ID {account_id}")
+                return None
+
+            token_url = None
+
+            # СПОСОБ 1: dialog — ловит обработчик _on_dialog
+            self._dialog_token = None
+
+            # СПОСОБ 2: Читаем буфер обмена (после клика токен копируется туда)
+            # Для этого нужно дать разрешение на чтение clipboard
+
+            # Старое содержимое буфера — токен предыдущего аккаунта
+            try:
+                previous_clipboard = self.page.evaluate(
+                    '() => navigator.clipboard.readText()')
+            except Exception:
+                previous_clipboard = None
+
+            # Кликаем на кнопку
+            try:
+                button.click(timeout=5000)
+            except Exception as e:
+                logger.error(f"   Ошибка клика: {e}")
+
+            def read_clipboard():
+                nonlocal token_url
+                try:
+                    # Выполняем JS для чтения clipboard
+                    clipboard_text = self.page.evaluate(
+                        '() => navigator.clipboard.readText()')
+                    if clipboard_text and 'signin?token=' in clipboard_text \
+                            and clipboard_text != previous_clipboard:
+                        token_url = clipboard_text
+                        logger.debug(
+                            f"   Токен из буфера: {clipboard_text[:50]}...")
+                except Exception as e:
+                    logger.debug(f"   Не удалось прочитать буфер: {e}")
+                return token_url is not None
+
+            # Ждем dialog или появления токена в буфере обмена
+            wait_until(self.page, lambda: self._dialog_token is not None or read_clipboard(), 'token')
+            token_url = self._dialog_token or token_url
+
+            # Ищем toast/notification на странице
+            if not token_url:
+                try:
+                    # Ищем уведомление с токеном
+                    notification_selectors = [
+                        '.alert:has-text("http")',
+                        '.notification:has-text("signin")',
+                        '[role="alert"]:has-text("token")',
+                        '.toast:has-text("http")',
+                        'div:has-text("signin?token=")',
+                    ]
+
+                    for selector in notification_selectors:
+                        notification = self.page.query_selector(selector)
+                        if notification:
+                            text = notification.inner_text()
+                            if 'signin?token=' in text:
+                                match = TOKEN_IN_TEXT.search(text)
+                                if match:
+                                    token_url = match.group(1)
+                                    logger.debug(
+                                        f"   Токен из уведомления: {token_url[:50]}...")
+                                    break
+                except:
+                    pass
+
+            if token_url:
+                # Очищаем токен от мусора
+                if '?' in token_url:
+                    # Убираем пробелы и лишнее
+                    token_url = token_url.split()[0]
+                return token_url
+
+            logger.error(f"   Dialog не появился или токен не найден")
+
+            # ОТЛАДКА: Сохраняем скриншот
+            self.page.screenshot(path=f'debug_token_{account_id}.png')
+            logger.info(f"   📸 Скриншот: debug_token_{account_id}.png")
+
+            return None
+
+        except Exception as e:
+            logger.error(f"   Ошибка генерации токена: {e}")
+            return None
+
+    def _on_dialog(self, dialog):
+        """Диалог с токен-ссылкой после клика по кнопке генерации"""
+        message = dialog.message
+        logger.debug(f"   Dialog: {message[:100]}...")
+
+        # Извлекаем токен из сообщения
+        if 'signin?token=' in message:
+            match = TOKEN_IN_TEXT.search(message)
+            if match:
+                self._dialog_token = match.group(1)
+
+        dialog.accept()
+
+    def _has_next_page(self) -> bool:
+        """Проверка наличия следующей страницы (Vue.js)"""
+        try:
+            # ИСПРАВЛЕНИЕ: Селекторы для Vue.js
+            next_selectors = [
+                # Vue.js кнопки (НЕ disabled)
+                'button.v-btn:has(.icon-chevron_right):not(:disabled)',
+                'button[aria-label*="next"]:not(:disabled)',
+                
+                # Fallback для HTML
+                'li.next:not(.disabled) a',
+                'a[data-page]:not(.disabled)',
+            ]
+            
+            for selector in next_selectors:
+                next_button = self.page.query_selector(selector)
+                if next_button:
+                    # Дополнительно проверяем, что кнопка видна
+                    is_visible = self.page.is_visible(selector)
+                    if is_visible:
+                        logger.debug(f"   ✓ Найдена активная кнопка 'Next'")
+                        return True
+            
+            logger.debug("   ℹ️ Кнопка 'Next' disabled или не найдена")
+            return False
+            
+        except Exception as e:
+            logger.debug(f"   Ошибка проверки next page: {e}")
+            return False
+
+
+    def _go_to_next_page(self):
+        """Переход на следующую страницу (Vue.js DataTable)"""
+        try:
+            # ИСПРАВЛЕНИЕ: Селекторы для Vue.js кнопок
+            next_selectors = [
+                # Vue.js Material Design кнопки
+                'button.v-btn:has(.icon-chevron_right):not(:disabled)',
+                'button[aria-label*="next"]:not(:disabled)',
+                'button:has-text("Next"):not(:disabled)',
+                
+                # Fallback для обычных HTML ссылок
+                'li.next:not(.disabled) a',
+                'a[rel="next"]:not(.disabled)',
+            ]
+            
+            # Запоминаем текущие данные ПЕРЕД кликом
+            old_pagination_text = None
+            try:
+                pagination = self.page.query_selector(PAGINATION_SELECTOR)
+                if pagination:
+                    old_pagination_text = pagination.inner_text()
+                    logger.debug(f"   До клика: {old_pagination_text}")
+            except:
+                pass
+            
+            # Ищем и кликаем кнопку
+            next_button = None
+            for selector in next_selectors:
+                next_button = self.page.query_selector(selector)
+                if next_button:
+                    logger.debug(f"   ✓ Найдена кнопка: {selector}")
+                    break
+            
+            if not next_button:
+                logger.error("❌ Кнопка 'Следующая страница' не найдена")
+                return False
+            
+            # Кликаем
+            next_button.click()
+            logger.info("   🖱️ Клик по кнопке 'Следующая'")
+            
+            # Ждём обновления данных (AJAX): текст пагинации должен измениться
+            if old_pagination_text is not None:
+                updated = wait_for_text_change(
+                    self.page, PAGINATION_SELECTOR, old_pagination_text, 'pagination')
+            else:
+                updated = wait_for_network_idle(self.page, 'pagination')
+            
+            if updated:
+                logger.info("   ✅ Страница обновлена")
+            else:
+                logger.warning("   ⚠️ Данные не обновились после клика")
+            
+            # Строки таблицы дорисовываются после ответа сервера
+            wait_for_network_idle(self.page)
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Ошибка перехода на следующую страницу: {e}")
+            return False
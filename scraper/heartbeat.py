@@ -0,0 +1,69 @@
+import os
+import time
+from typing import Optional
+from scraper.metrics import count
+
+# Состояние процесса-воркера под WorkerSupervisor (None — воркер без супервизора)
+_heartbeats = None  # mp.Array('d'): время последнего признака жизни по слотам
+_retire = None  # mp.Array('b'): остановить воркер конкретного слота (автомасштаб)
+_stop_event = None  # mp.Event: мягкая остановка — доделать текущий аккаунт и выйти
+_slot: Optional[int] = None
+_parent_pid: Optional[int] = None
+_max_accounts = 0
+_recycled = False
+
+
+def init_worker_heartbeat(slot: int, heartbeats, retire, stop_event, max_accounts: int = 0):
+    """Привязать процесс к слоту супервизора"""
+    global _heartbeats, _retire, _stop_event, _slot, _parent_pid, _max_accounts
+    _heartbeats = heartbeats
+    _retire = retire
+    _stop_event = stop_event
+    _slot = slot
+    _parent_pid = os.getppid()
+    _max_accounts = max_accounts
+    beat()
+
+
+def beat():
+    """
+    Признак жизни воркера
+
+    Вызывается из рабочего потока (страница загружена, повтор, новый
+    аккаунт), а не из фонового, поэтому зависший page.goto перестает
+    обновлять отметку и супервизор перезапускает воркера.
+    """
+    if _heartbeats is not None:
+        _heartbeats[_slot] = time.time()
+
+
+def page_fetched(seconds: float = 0.0):
+    """Учесть загруженную страницу и время ее загрузки"""
+    count('pages')
+    count('fetch_seconds', seconds)
+    beat()
+
+
+def account_done():
+    """Учесть обработанный аккаунт (счетчик слота переживает перезапуск воркера)"""
+    count('accounts')
+    beat()
+
+
+def stop_requested() -> bool:
+    """Супервизор попросил завершиться после текущего аккаунта (или его больше нет)"""
+    if _stop_event is None:
+        return False
+    return _stop_event.is_set() or bool(_retire[_slot]) or os.getppid() != _parent_pid
+
+
+def recycle_due(processed_count: int) -> bool:
+    """Воркер обработал WORKER_RECYCLE_ACCOUNTS аккаунтов — пора освободить память браузера"""
+    global _recycled
+    if _max_accounts and processed_count >= _max_accounts:
+        _recycled = True
+    return _recycled
+
+
+def recycled() -> bool:
+    return _recycled
@@ -0,0 +1,299 @@
+import time
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from playwright.sync_api import Page, BrowserContext
+import config
+from database.db import Database
+from scraper.extractors import phones_from_rows
+from scraper.metrics import timed
+from scraper.phone_scraper import PhoneScraper, set_page_param
+from scraper.rate_limiter import RateLimiter, classify_status
+from scraper.retry import PageTimeout, RequestFailed
+from utils.logger import logger
+
+# Тот же User-Agent, что у контекста браузера (cookies сессии выданы ему)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class GridHTMLParser(HTMLParser):
+    """
+    Разбор HTML страницы номеров (Yii2 GridView) без браузера
+
+    Собирает тексты заголовков и ячеек таблиц, а также признак ссылки
+    на следующую страницу (как селекторы в PhoneScraper._has_next_page).
+    Строка заголовков — строка в thead или строка без td; в rows попадают
+    только строки данных.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = 0
+        self.headers: List[str] = []
+        self.rows: List[List[str]] = []
+        self.has_next = False
+        self._table_depth = 0
+        self._thead_depth = 0
+        self._row: Optional[List[str]] = None
+        self._row_is_header = False
+        self._cell: Optional[List[str]] = None
+        self._li_classes: List[List[str]] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+
+        if tag == 'table':
+            self.tables += 1
+            self._table_depth += 1
+        elif tag == 'thead' and self._table_depth:
+            self._thead_depth += 1
+        elif tag == 'tr' and self._table_depth:
+            self._finish_row()
+            self._row = []
+            self._row_is_header = True
+        elif tag in ('td', 'th') and self._row is not None:
+            self._finish_cell()
+            self._cell = []
+            if tag == 'td' and not self._thead_depth:
+                self._row_is_header = False
+        elif tag == 'br' and self._cell is not None:
+            self._cell.append(' ')
+        elif tag == 'li':
+            self._li_classes.append((attrs.get('class') or '').split())
+        elif tag == 'a':
+            classes = self._li_classes[-1] if self._li_classes else []
+            if 'disabled' in classes:
+                return
+            if 'next' in classes or attrs.get('rel') == 'next':
+                self.has_next = True
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self._finish_cell()
+        elif tag == 'tr':
+            self._finish_row()
+        elif tag == 'thead' and self._thead_depth:
+            self._finish_row()
+            self._thead_depth -= 1
+        elif tag == 'table' and self._table_depth:
+            self._finish_row()
+            self._table_depth -= 1
+        elif tag == 'li' and self._li_classes:
+            self._li_classes.pop()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _finish_cell(self):
+        if self._cell is not None and self._row is not None:
+            self._row.append(' '.join(''.join(self._cell).split()))
+        self._cell = None
+
+    def _finish_row(self):
+        self._finish_cell()
+        if self._row:
+            if not self._row_is_header:
+                self.rows.append(self._row)
+            elif not self.headers:
+                self.headers = self._row
+        self._row = None
+
+
+def parse_grid_html(html: str) -> Optional[Dict]:
+    """
+    Извлечь номера и пагинацию из HTML страницы
+
+    Returns:
+        {'phones', 'rows', 'has_next'} или None, если таблицы на странице нет
+    """
+    parser = GridHTMLParser()
+    parser.feed(html)
+    parser.close()
+
+    if parser.tables == 0:
+        return None
+
+    return {
+        'phones': phones_from_rows(parser.headers, parser.rows),
+        'rows': len(parser.rows),
+        'has_next': parser.has_next,
+    }
+
+
+def create_http_session(pool_size: int = config.HTTP_POOL_SIZE) -> requests.Session:
+    """Сессия requests с пулом keep-alive соединений"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml',
+        'Accept-Language': 'ru-RU,ru;q=0.9',
+    })
+    return session
+
+
+def load_browser_cookies(session: requests.Session, context: BrowserContext) -> int:
+    """Перенести cookies контекста браузера в сессию requests"""
+    cookies = context.cookies()
+    for cookie in cookies:
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain', ''),
+            path=cookie.get('path', '/'),
+            secure=cookie.get('secure', False)
+        )
+    return len(cookies)
+
+
+def fetch_grid(session: requests.Session, url: str,
+               timeout: float = config.HTTP_TIMEOUT,
+               limiter: RateLimiter = None) -> Optional[Dict]:
+    """
+    GET страницы таблицы и разбор
+
+    Задержка ответа, ошибки, таймауты и признаки блокировки передаются в limiter.
+
+    Returns:
+        Разобранная таблица или None, если ответ пришел, но таблицы в нем
+        нет (страница входа, другая верстка)
+
+    Raises:
+        PageTimeout, RequestFailed: временный сбой — запрос стоит повторить
+    """
+    started = time.time()
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.Timeout as e:
+        if limiter:
+            limiter.record(time.time() - started, 'timeout')
+        raise PageTimeout(f"HTTP-запрос: {e}") from e
+    except requests.RequestException as e:
+        if limiter:
+            limiter.record(time.time() - started, 'error')
+        raise RequestFailed(f"HTTP-запрос: {e}") from e
+
+    latency = time.time() - started
+    signal = classify_status(response.status_code)
+
+    if response.status_code != 200:
+        logger.debug(f"   HTTP {response.status_code} для {url}")
+        if limiter:
+            limiter.record(latency, signal)
+        if signal != 'ok':
+            raise RequestFailed(f"HTTP {response.status_code}")
+        return None
+
+    grid = parse_grid_html(response.text)
+    if grid is not None:
+        logger.debug(f"   ✓ Найдено {grid['rows']} строк (HTTP)")
+    elif 'captcha' in response.text.lower():
+        signal = 'ban'
+    if limiter:
+        limiter.record(latency, signal)
+    return grid
+
+
+class HttpPhoneScraper(PhoneScraper):
+    """
+    Парсинг номеров HTTP-запросами без рендеринга страниц
+
+    Вход по токен-ссылке и выбор размера страницы выполняются в браузере,
+    затем cookies сессии переносятся в requests и страницы таблицы
+    запрашиваются обычным GET с параметром page. Таймауты и сбои сервера
+    повторяются по RetryPolicy; если же в ответе нет таблицы (сессия
+    сброшена, другая верстка), аккаунт дорабатывается браузером с той же
+    страницы.
+    """
+
+    engine = 'http'
+
+    def __init__(self, page: Page, db: Database, session: requests.Session = None):
+        super().__init__(page, db)
+        self.session = session or create_http_session()
+        self.fallbacks = 0
+
+    def scrape_account(self, account_id: str, token_url: str, start_page: int = 1) -> Optional[int]:
+        """Парсинг всех номеров из аккаунта (None — аккаунт не обработан)"""
+        try:
+            logger.info(f"📞 Парсинг аккаунта {account_id} (HTTP)...")
+
+            account_pages = self.pages_fetched
+            account_seconds = self.fetch_seconds
+
+            # Вход по токен-ссылке — в браузере, один раз на аккаунт
+            with timed('open'):
+                self.retry.run(lambda attempt: self._open_account(token_url), 'вход по токену')
+
+            grid_url = self.page.url
+            self.session.cookies.clear()
+            load_browser_cookies(self.session, self.page.context)
+
+            self.db.update_account_status(account_id, 'in_progress')
+
+            current_page = start_page
+            total_phones = 0
+
+            while True:
+                logger.info(f"  📄 Страница {current_page}...")
+
+                fetch_started = time.perf_counter()
+                # Таймауты и сбои сервера повторяются HTTP-запросом с той же страницы
+                page_url = set_page_param(grid_url, current_page)
+                grid = self.retry.run(
+                    lambda attempt: fetch_grid(self.session, page_url, limiter=self.limiter),
+                    f'страница {current_page} (HTTP)')
+                if grid is None:
+                    # Рендеринг — запасной путь с той же страницы
+                    self.fallbacks += 1
+                    logger.warning(
+                        f"  ⚠️ Нет таблицы в HTTP-ответе, продолжаю в браузере "
+                        f"со страницы {current_page}")
+                    rendered = super().scrape_account(account_id, token_url, current_page)
+                    return None if rendered is None else total_phones + rendered
+                self._record_fetch(fetch_started)
+
+                phones = grid['phones']
+                added = self._save_page(account_id, phones, current_page)
+
+                if phones:
+                    total_phones += added
+                    logger.info(f"  ✅ Добавлено {added} номеров (всего: {total_phones})")
+                else:
+                    logger.info(f"  ℹ️ Номеров не найдено на странице {current_page}")
+
+                if not grid['has_next']:
+                    logger.info(f"  📭 Достигнута последняя страница")
+                    break
+
+                current_page += 1
+                self._pace()
+
+            self.db.update_account_status(account_id, 'completed')
+            logger.info(f"✅ Аккаунт {account_id} обработан: {total_phones} номеров")
+            self._log_speed(self.pages_fetched - account_pages,
+                            self.fetch_seconds - account_seconds)
+
+            return total_phones
+
+        except Exception as e:
+            self._fail_account(account_id, e)
+            return None
+
+    def log_summary(self, log=logger):
+        super().log_summary(log)
+        if self.fallbacks:
+            log.info(f"   Переходов на браузер: {self.fallbacks}")
+
+
+def create_phone_scraper(page: Page, db: Database,
+                         engine: str = config.SCRAPE_ENGINE) -> PhoneScraper:
+    """Скрапер номеров для выбранного движка ('browser' или 'http')"""
+    if engine == 'http':
+        return HttpPhoneScraper(page, db)
+    if engine == 'browser':
+        return PhoneScraper(page, db)
+    raise ValueError(f"Неизвестный движок парсинга: {engine}")
@@ -0,0 +1,232 @@
+import threading
+import time
+import multiprocessing as mp
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import config
+from utils.logger import logger
+
+# Счетчики воркера: (имя, описание для /metrics)
+COUNTERS = (
+    ('accounts', 'Обработано аккаунтов'),
+    ('pages', 'Загружено страниц'),
+    ('phones_added', 'Добавлено новых номеров'),
+    ('duplicates', 'Номеров, уже бывших в БД'),
+    ('retries', 'Повторов страниц и входа по токену'),
+    ('errors', 'Неудачных попыток обработать аккаунт'),
+)
+# Этапы обработки аккаунта, время которых копится в '<этап>_seconds'
+PHASES = (
+    ('token', 'токен перед парсингом'),
+    ('open', 'вход по токену'),
+    ('fetch', 'загрузка страниц'),
+    ('write', 'запись номеров'),
+)
+FIELDS = tuple(name for name, _ in COUNTERS) + tuple(f"{phase}_seconds" for phase, _ in PHASES)
+_INDEX = {name: i for i, name in enumerate(FIELDS)}
+
+
+class WorkerMetrics:
+    """
+    Счетчики воркеров в общей памяти: строка из FIELDS на каждый слот
+
+    Строка слота переживает перезапуски воркера, поэтому счетчики только
+    растут — как требует Prometheus для типа counter.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.values = mp.Array('d', slots * len(FIELDS))
+
+    def add(self, slot: int, field: str, value: float = 1):
+        with self.values.get_lock():
+            self.values[slot * len(FIELDS) + _INDEX[field]] += value
+
+    def get(self, slot: int, field: str) -> float:
+        return self.values[slot * len(FIELDS) + _INDEX[field]]
+
+    def slot(self, slot: int) -> Dict[str, float]:
+        start = slot * len(FIELDS)
+        with self.values.get_lock():
+            row = self.values[start:start + len(FIELDS)]
+        return dict(zip(FIELDS, row))
+
+    def total(self, field: str) -> float:
+        return sum(self.get(slot, field) for slot in range(self.slots))
+
+    def totals(self) -> Dict[str, float]:
+        with self.values.get_lock():
+            values = self.values[:]
+        return {
+            field: sum(values[slot * len(FIELDS) + i] for slot in range(self.slots))
+            for i, field in enumerate(FIELDS)
+        }
+
+    def log_summary(self, log=logger):
+        """Итоги по слотам воркеров"""
+        phase_names = dict(PHASES)
+        for slot in range(self.slots):
+            row = self.slot(slot)
+            if not row['accounts'] and not row['pages'] and not row['errors']:
+                continue
+            phases = ", ".join(
+                f"{phase_names[phase]} {row[f'{phase}_seconds'] / 60:.1f} мин"
+                for phase, _ in PHASES if row[f'{phase}_seconds'])
+            log.info(
+                f"   Слот #{slot + 1}: {row['accounts']:.0f} акк, {row['pages']:.0f} стр, "
+                f"+{row['phones_added']:.0f} номеров, дублей {row['duplicates']:.0f}, "
+                f"повторов {row['retries']:.0f}, ошибок {row['errors']:.0f}"
+                + (f"; {phases}" if phases else ''))
+
+
+# Метрики процесса-воркера (None — вне супервизора, счетчики не ведутся)
+_metrics: Optional[WorkerMetrics] = None
+_slot = 0
+
+
+def init_worker_metrics(metrics: WorkerMetrics, slot: int):
+    global _metrics, _slot
+    _metrics = metrics
+    _slot = slot
+
+
+def count(field: str, value: float = 1):
+    """Прибавить к счетчику воркера"""
+    if _metrics is not None and value:
+        _metrics.add(_slot, field, value)
+
+
+def add_time(phase: str, seconds: float):
+    count(f"{phase}_seconds", seconds)
+
+
+@contextmanager
+def timed(phase: str):
+    """Учесть время блока как этап phase"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - started)
+
+
+def format_status(totals: Dict[str, float], elapsed: float, pending: int, workers: int) -> str:
+    """Строка состояния: скорость, номера, ошибки и ETA по оставшимся аккаунтам"""
+    accounts = totals['accounts']
+    hours = elapsed / 3600
+    parts = [
+        f"👷 {workers}",
+        f"{accounts:.0f} акк ({accounts / hours:.0f}/час)" if hours > 0 else f"{accounts:.0f} акк",
+        f"{totals['pages']:.0f} стр",
+    ]
+
+    found = totals['phones_added'] + totals['duplicates']
+    phones = f"+{totals['phones_added']:.0f} ном"
+    if elapsed > 0:
+        phones += f" ({totals['phones_added'] / (elapsed / 60):.0f}/мин)"
+    if found:
+        phones += f", дублей {totals['duplicates'] / found:.0%}"
+    parts.append(phones)
+
+    if totals['retries'] or totals['errors']:
+        parts.append(f"повторов {totals['retries']:.0f}, ошибок {totals['errors']:.0f}")
+
+    remaining = f"осталось {pending}"
+    if accounts > 0 and elapsed > 0:
+        eta_minutes = pending / (accounts / elapsed) / 60
+        remaining += f", ETA {int(eta_minutes // 60)}ч {int(eta_minutes % 60):02d}м"
+    parts.append(remaining)
+
+    return "📊 " + " | ".join(parts)
+
+
+def render_prometheus(metrics: WorkerMetrics, gauges: Dict[str, tuple]) -> str:
+    """
+    Текстовый формат Prometheus
+
+    Args:
+        gauges: имя -> (описание, значение) для показателей оркестратора
+    """
+    rows = [metrics.slot(slot) for slot in range(metrics.slots)]
+    lines = []
+
+    for name, help_text in COUNTERS:
+        metric = f"scraper_{name}_total"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for slot, row in enumerate(rows):
+            lines.append(f'{metric}{{slot="{slot + 1}"}} {row[name]:g}')
+
+    lines.append("# HELP scraper_phase_seconds_total Время этапов обработки аккаунтов")
+    lines.append("# TYPE scraper_phase_seconds_total counter")
+    for phase, _ in PHASES:
+        for slot, row in enumerate(rows):
+            lines.append(
+                f'scraper_phase_seconds_total{{slot="{slot + 1}",phase="{phase}"}} '
+                f'{row[f"{phase}_seconds"]:.3f}')
+
+    for name, (help_text, value) in gauges.items():
+        if value is None:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value:g}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    HTTP-эндпоинт /metrics в фоновом потоке оркестратора
+
+    Счетчики читаются из общей памяти при каждом запросе; показатели из
+    БД (осталось аккаунтов, ETA) оркестратор обновляет в gauges на своем
+    цикле, чтобы запросы Prometheus не нагружали БД.
+    """
+
+    def __init__(self, metrics: WorkerMetrics,
+                 host: str = config.METRICS_HOST, port: int = config.METRICS_PORT):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.gauges: Dict[str, tuple] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> bool:
+        if not self.port:
+            return False
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = render_prometheus(server.metrics, dict(server.gauges)).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            logger.warning(f"⚠️ Метрики недоступны: порт {self.host}:{self.port} занят ({e})")
+            return False
+
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='MetricsServer', daemon=True).start()
+        logger.info(f"📡 Метрики: http://{self.host}:{self._server.server_port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -1,154 +1,398 @@
-import time
-import random
-import multiprocessing as mp
-from typing import Optional
-from pathlib import Path
-import config
-from database.db import Database
-from scraper.browser import BrowserManager
-from scraper.phone_scraper import PhoneScraper
-from utils.logger import logger
-
-
-def worker_process(worker_id: int, total_workers: int):
-    """
-    Воркер процесс для параллельной обработки аккаунтов
-
-    Args:
-        worker_id: ID воркера (1, 2, 3...)
-        total_workers: Общее количество воркеров
-    """
-    # Создаем свою БД для каждого процесса
-    db = Database()
-
-    # Настройка логгера для воркера
-    from utils.logger import setup_logger
-    worker_logger = setup_logger(f'Worker-{worker_id}')
-
-    worker_logger.info(f"🚀 Воркер #{worker_id} запущен")
-
-    # Задержка перед стартом (чтобы не все воркеры стартовали одновременно)
-    if worker_id > 1:
-        delay = random.uniform(*config.WORKER_DELAY)
-        worker_logger.info(f"⏳ Ожидание {delay:.1f}сек перед стартом...")
-        time.sleep(delay)
-
-    processed_count = 0
-
-    try:
-        # Открываем браузер один раз для всех аккаунтов этого воркера
-        with BrowserManager(headless=config.HEADLESS) as browser:
-            page = browser.new_page()
-            scraper = PhoneScraper(page, db)
-
-            while True:
-                # Атомарно получаем следующий аккаунт
-                account = db.acquire_account_for_processing()
-
-                if not account:
-                    worker_logger.info("📭 Нет больше аккаунтов для обработки")
-                    break
-
-                account_id = account['account_id']
-                username = account['username']
-                token_url = account['token_url']
-                last_page = account['last_page']
-
-                worker_logger.info(
-                    f"🔄 Обработка: {username} (ID: {account_id})")
-
-                if not token_url:
-                    worker_logger.error(f"❌ Нет токен-ссылки для {account_id}")
-                    db.update_account_status(account_id, 'failed')
-                    continue
-
-                # Парсим аккаунт
-                start_page = last_page + 1 if last_page > 0 else 1
-                phones_count = scraper.scrape_account(
-                    account_id, token_url, start_page)
-
-                processed_count += 1
-                worker_logger.info(f"✅ Обработано: {phones_count} номеров")
-
-                # Задержка между аккаунтами
-                delay = random.uniform(*config.DELAY_BETWEEN_ACCOUNTS)
-                worker_logger.info(f"⏳ Пауза {delay:.1f}сек...")
-                time.sleep(delay)
-
-    except KeyboardInterrupt:
-        worker_logger.warning("⚠️ Воркер остановлен пользователем")
-    except Exception as e:
-        worker_logger.error(
-            f"❌ Критическая ошибка в воркере: {e}", exc_info=True)
-    finally:
-        worker_logger.info(
-            f"🏁 Воркер #{worker_id} завершен. Обработано: {processed_count} аккаунтов")
-        return processed_count
-
-
-class ParallelScraper:
-    """Оркестратор параллельной обработки"""
-
-    def __init__(self, max_workers: int = config.MAX_WORKERS):
-        self.max_workers = max_workers
-        self.db = Database()
-
-    def run(self):
-        """Запустить параллельную обработку"""
-        pending_count = self.db.get_pending_count()
-
-        if pending_count == 0:
-            logger.info("✅ Все аккаунты уже обработаны!")
-            return
-
-        logger.info("=" * 60)
-        logger.info(f"🚀 ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА: {self.max_workers} воркеров")
-        logger.info(f"📋 Аккаунтов к обработке: {pending_count}")
-        logger.info("=" * 60)
-
-        # Оптимизируем количество воркеров
-        actual_workers = min(self.max_workers, pending_count)
-        logger.info(f"🔢 Запускаю {actual_workers} воркеров...")
-
-        start_time = time.time()
-
-        try:
-            # Создаем пул процессов
-            with mp.Pool(processes=actual_workers) as pool:
-                # Запускаем воркеры
-                results = []
-                for worker_id in range(1, actual_workers + 1):
-                    result = pool.apply_async(
-                        worker_process,
-                        args=(worker_id, actual_workers)
-                    )
-                    results.append(result)
-
-                # Ждем завершения всех воркеров
-                pool.close()
-                pool.join()
-
-                # Собираем результаты
-                total_processed = sum([r.get() for r in results])
-
-        except KeyboardInterrupt:
-            logger.warning(
-                "\n⚠️ Прерывание пользователем. Останавливаю воркеры...")
-            pool.terminate()
-            pool.join()
-            total_processed = 0
-
-        # Финальная статистика
-        elapsed_time = time.time() - start_time
-        logger.info("\n" + "=" * 60)
-        logger.info(f"🎉 ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА ЗАВЕРШЕНА")
-        logger.info(f"⏱️ Время выполнения: {elapsed_time/60:.1f} минут")
-        logger.info(f"📊 Обработано аккаунтов: {total_processed}")
-        if total_processed > 0:
-            logger.info(
-                f"⚡ Скорость: {elapsed_time/total_processed:.1f} сек/аккаунт")
-        logger.info("=" * 60)
-
-        # Создаем бэкап
-        backup_path = self.db.backup()
-        logger.info(f"💾 Бэкап создан: {backup_path}")
+import time
+import random
+import multiprocessing as mp
+from collections import deque
+from multiprocessing.managers import SyncManager
+from typing import Optional
+from pathlib import Path
+import config
+from database.db import Database
+from database.backup import BackgroundBackup
+from database.leases import LeaseHeartbeat, make_worker_id
+from scraper.browser import BrowserManager, ContextPool
+from scraper.http_scraper import create_phone_scraper
+from scraper.db_writer import writer_process, WriteLost, WriterClient
+from scraper.heartbeat import account_done, beat, recycle_due, stop_requested
+from scraper.metrics import MetricsServer, count, format_status, timed
+from scraper.autoscaler import Autoscaler
+from scraper.rate_limiter import get_limiter, init_worker_limiter
+from scraper.supervisor import WorkerSupervisor, ignore_sigint
+from scraper.token_service import OnDemandTokens
+from scraper.waits import wait_stats
+from utils.logger import logger
+
+# Событие «сбор аккаунтов завершен» в режиме конвейера (None — обычный режим)
+_harvest_done = None
+
+
+def init_worker(limiter, harvest_done=None):
+    """Инициализатор процесса-воркера: общий лимитер и событие конвейера"""
+    global _harvest_done
+    init_worker_limiter(limiter)
+    _harvest_done = harvest_done
+
+
+def worker_process(worker_id: int, total_workers: int,
+                   write_queue=None, ack_queue=None,
+                   engine: str = config.SCRAPE_ENGINE):
+    """
+    Воркер процесс для параллельной обработки аккаунтов
+
+    Args:
+        worker_id: ID воркера (1, 2, 3...)
+        total_workers: Общее количество воркеров
+        write_queue: Очередь процесса-писателя (режим писателя)
+        ack_queue: Очередь подтверждений от писателя для этого воркера
+        engine: Движок парсинга номеров ('browser' или 'http')
+    """
+    # Создаем свою БД для каждого процесса
+    db = Database()
+
+    # В режиме писателя записи уходят в очередь, а не напрямую в БД
+    if write_queue is not None:
+        db = WriterClient(db, worker_id, write_queue, ack_queue)
+
+    # Настройка логгера для воркера
+    from utils.logger import setup_logger
+    worker_logger = setup_logger(f'Worker-{worker_id}')
+
+    worker_logger.info(f"🚀 Воркер #{worker_id} запущен")
+
+    # Общий лимитер сам разводит запросы воркеров по времени
+    limiter = get_limiter()
+
+    # Задержка перед стартом (чтобы не все воркеры стартовали одновременно)
+    if worker_id > 1 and limiter is None:
+        delay = random.uniform(*config.WORKER_DELAY)
+        worker_logger.info(f"⏳ Ожидание {delay:.1f}сек перед стартом...")
+        time.sleep(delay)
+
+    processed_count = 0
+    owner = make_worker_id(worker_id)
+    claimed = deque()
+    scraper = None
+    pool = None
+
+    try:
+        # Открываем браузер один раз для всех аккаунтов этого воркера
+        with BrowserManager(headless=config.HEADLESS) as browser, \
+                LeaseHeartbeat(db, owner):
+            # Каждый аккаунт — в новом или сброшенном контексте
+            pool = ContextPool(browser)
+            scraper = create_phone_scraper(None, db, engine)
+            tokens = OnDemandTokens(db) if config.PIPELINE_TOKENS_ON_DEMAND else None
+
+            while True:
+                beat()
+
+                # Статусы предыдущего аккаунта должны быть записаны до захвата нового
+                if write_queue is not None:
+                    try:
+                        db.checkpoint()
+                    except WriteLost as e:
+                        worker_logger.error(f"❌ Писатель: {e} — вернутся в очередь")
+
+                # Супервизор: мягкая остановка или плановый перезапуск процесса
+                if stop_requested():
+                    worker_logger.info("🛑 Остановка по запросу супервизора")
+                    break
+                if not claimed and recycle_due(processed_count):
+                    worker_logger.info(f"♻️ Обработано {processed_count} аккаунтов — перезапуск процесса")
+                    break
+
+                # Захватываем аккаунты пачкой, чтобы реже брать блокировку записи
+                if not claimed:
+                    # Событие читаем до захвата: аккаунты, добавленные сборщиком
+                    # перед завершением, попадут в этот захват
+                    harvest_running = _harvest_done is not None and not _harvest_done.is_set()
+                    claimed.extend(db.claim_accounts(owner))
+
+                    if not claimed and harvest_running:
+                        # Конвейер: сборщик еще добавляет аккаунты
+                        time.sleep(config.PIPELINE_POLL_INTERVAL)
+                        continue
+
+                if not claimed:
+                    # Остались аккаунты на паузе после неудачи — ждем их
+                    retry_wait = db.get_retry_wait()
+                    if retry_wait is not None:
+                        time.sleep(min(retry_wait, config.PIPELINE_POLL_INTERVAL))
+                        continue
+                    worker_logger.info("📭 Нет больше аккаунтов для обработки")
+                    break
+
+                account = claimed.popleft()
+
+                account_id = account['account_id']
+                username = account['username']
+                token_url = account['token_url']
+                last_page = account['last_page']
+
+                # Аренда могла истечь, пока аккаунт ждал в локальной очереди
+                if not db.owns_lease(account_id, owner):
+                    worker_logger.warning(
+                        f"⚠️ Аренда {account_id} перехвачена другим воркером, пропускаю")
+                    continue
+
+                worker_logger.info(
+                    f"🔄 Обработка: {username} (ID: {account_id})")
+
+                # Токен генерируется перед парсингом, если сборщик его не получал
+                if tokens is not None:
+                    with timed('token'):
+                        token_url = tokens.ensure(account)
+
+                if not token_url:
+                    # Сессия админки или create-token могли быть временно
+                    # недоступны — повтор после паузы, после серии неудач parked
+                    worker_logger.error(f"❌ Нет токен-ссылки для {account_id}")
+                    count('errors')
+                    status = db.record_account_failure(account_id, "Нет токен-ссылки")
+                    if status == 'parked':
+                        worker_logger.warning(f"🅿️ Аккаунт {account_id} отложен: токен не получен")
+                    continue
+
+                # Парсим аккаунт
+                start_page = last_page + 1 if last_page > 0 else 1
+                with pool.page() as page:
+                    scraper.page = page
+                    phones_count = scraper.scrape_account(
+                        account_id, token_url, start_page)
+                if phones_count is None:
+                    # Аккаунт возвращен в очередь или отложен, ошибка уже учтена
+                    continue
+
+                if write_queue is not None:
+                    # Завершение засчитывается, только если писатель сохранил все страницы
+                    try:
+                        phones_count = db.checkpoint().get(account_id, 0)
+                    except WriteLost as e:
+                        worker_logger.error(f"❌ Писатель: {e} — вернутся в очередь")
+                        if account_id in e.accounts:
+                            count('errors')
+                            continue
+                        phones_count = e.added.get(account_id, 0)
+
+                processed_count += 1
+                account_done()
+                worker_logger.info(f"✅ Обработано: {phones_count} номеров")
+
+                # Задержка между аккаунтами
+                if limiter is None:
+                    delay = random.uniform(*config.DELAY_BETWEEN_ACCOUNTS)
+                    worker_logger.info(f"⏳ Пауза {delay:.1f}сек...")
+                    time.sleep(delay)
+
+    except KeyboardInterrupt:
+        worker_logger.warning("⚠️ Воркер остановлен пользователем")
+    except Exception as e:
+        worker_logger.error(
+            f"❌ Критическая ошибка в воркере: {e}", exc_info=True)
+    finally:
+        if write_queue is not None:
+            try:
+                db.checkpoint(timeout=60)
+            except Exception as e:
+                worker_logger.warning(f"⚠️ Писатель не подтвердил записи: {e}")
+        # Необработанные аккаунты сразу возвращаем в очередь
+        try:
+            released = db.release_leases(owner)
+            if released:
+                worker_logger.info(f"↩️ Возвращено в очередь: {released} аккаунтов")
+        except Exception as e:
+            worker_logger.warning(f"⚠️ Не удалось вернуть аккаунты в очередь: {e}")
+        worker_logger.info(
+            f"🏁 Воркер #{worker_id} завершен. Обработано: {processed_count} аккаунтов")
+        if scraper is not None:
+            scraper.log_summary(worker_logger)
+        if pool is not None:
+            pool.log_summary(worker_logger)
+        wait_stats.log_summary(worker_logger)
+        stats = db.get_connection_stats()
+        worker_logger.info(
+            f"🗄️ БД: соединений {stats['connections_opened']}, "
+            f"транзакций {stats['transactions']}, "
+            f"ожиданий блокировки {stats['lock_waits']} "
+            f"({stats['lock_wait_seconds']:.1f} сек)")
+        return processed_count
+
+
+def log_progress(db: Database, processed: int, elapsed: float):
+    """Прогресс и оценка оставшегося времени по счетчикам БД"""
+    pending = db.get_pending_count()
+    message = f"📈 Обработано: {processed}, осталось: {pending}"
+    if processed > 0 and elapsed > 0:
+        rate = processed / elapsed
+        eta_minutes = pending / rate / 60
+        message += f", скорость: {rate * 3600:.0f} акк/час, ETA: {eta_minutes:.0f} мин"
+    logger.info(message)
+
+
+class ParallelScraper:
+    """Оркестратор параллельной обработки"""
+
+    def __init__(self, max_workers: int = config.MAX_WORKERS,
+                 writer_mode: bool = config.WRITER_MODE,
+                 engine: str = config.SCRAPE_ENGINE,
+                 harvest_done=None,
+                 autoscale: bool = config.AUTOSCALE):
+        self.max_workers = max_workers
+        self.writer_mode = writer_mode
+        self.engine = engine
+        # Число воркеров подбирается по скорости, max_workers — потолок
+        self.autoscale = autoscale
+        # Конвейер: воркеры ждут новые аккаунты, пока событие не установлено
+        self.harvest_done = harvest_done
+        self.db = Database()
+        self.background_backup = BackgroundBackup(self.db.db_path)
+        # Общий для всех воркеров лимитер (передается инициализатором воркеров)
+        self.limiter = get_limiter()
+
+    def run(self):
+        """Запустить параллельную обработку"""
+        pending_count = self.db.get_pending_count()
+
+        if pending_count == 0 and self.harvest_done is None:
+            logger.info("✅ Все аккаунты уже обработаны!")
+            return
+
+        logger.info("=" * 60)
+        logger.info(f"🚀 ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА: {self.max_workers} воркеров")
+        logger.info(f"📋 Аккаунтов к обработке: {pending_count}")
+        logger.info("=" * 60)
+
+        # Оптимизируем количество воркеров (в конвейере аккаунты еще появятся)
+        if self.harvest_done is not None:
+            actual_workers = self.max_workers
+        else:
+            actual_workers = min(self.max_workers, pending_count)
+        autoscaler = None
+        start_workers = actual_workers
+        if self.autoscale:
+            autoscaler = Autoscaler(actual_workers, self.limiter)
+            start_workers = min(max(config.AUTOSCALE_START_WORKERS, autoscaler.min_workers), actual_workers)
+            logger.info(f"⚖️ Автомасштаб: старт с {start_workers}, не больше {actual_workers} воркеров")
+        logger.info(f"🔢 Запускаю {start_workers} воркеров...")
+
+        start_time = time.time()
+        self.actual_workers = actual_workers
+
+        # Режим писателя: один процесс пишет в БД, воркеры шлют ему данные
+        self.manager = None
+        self.write_queue = None
+        self.ack_queues = None
+        writer = None
+        if self.writer_mode:
+            # Менеджер и писатель не реагируют на Ctrl+C: очереди нужны до конца остановки
+            self.manager = SyncManager()
+            self.manager.start(ignore_sigint)
+            self.write_queue = self.manager.Queue()
+            # Очередь подтверждений — на каждый запуск воркера, включая перезапуски
+            self.ack_queues = self.manager.dict()
+            writer = mp.Process(
+                target=writer_process,
+                args=(self.write_queue, self.ack_queues, self.db.db_path)
+            )
+            writer.start()
+            logger.info("✍️ Режим писателя: запись в БД через отдельный процесс")
+        logger.info(f"🌐 Движок парсинга: {self.engine}")
+
+        self._started = start_time
+        self._last_progress = start_time
+        self._next_backup = config.BACKUP_INTERVAL
+
+        supervisor = self.supervisor = WorkerSupervisor(
+            worker_process, actual_workers,
+            make_args=self._worker_args,
+            initializer=init_worker,
+            initargs=(self.limiter, self.harvest_done),
+            has_work=self._has_work,
+            on_tick=self._on_tick,
+            db=self.db,
+            autoscaler=autoscaler,
+            start_workers=start_workers
+        )
+        self.metrics_server = MetricsServer(supervisor.metrics)
+        self.metrics_server.start()
+        try:
+            # Обработано считается по общим счетчикам — прогресс сохраняется и при Ctrl+C
+            total_processed = supervisor.run()
+
+        finally:
+            self.metrics_server.stop()
+            if writer is not None:
+                # Писатель дописывает очередь и завершается
+                self.write_queue.put(('stop',))
+                writer.join()
+                self.manager.shutdown()
+
+        # Финальная статистика
+        elapsed_time = time.time() - start_time
+        logger.info("\n" + "=" * 60)
+        logger.info(f"🎉 ПАРАЛЛЕЛЬНАЯ ОБРАБОТКА ЗАВЕРШЕНА")
+        logger.info(f"⏱️ Время выполнения: {elapsed_time/60:.1f} минут")
+        logger.info(f"📊 Обработано аккаунтов: {total_processed}")
+        if total_processed > 0:
+            logger.info(
+                f"⚡ Скорость: {elapsed_time/total_processed:.1f} сек/аккаунт")
+        logger.info(format_status(supervisor.metrics.totals(), elapsed_time,
+                                  self.db.get_pending_count(), actual_workers))
+        supervisor.metrics.log_summary()
+        if self.limiter:
+            self.limiter.log_summary()
+        logger.info("=" * 60)
+
+        # Создаем бэкап
+        self.background_backup.wait()
+        backup_path = self.db.backup()
+        logger.info(f"💾 Бэкап создан: {backup_path}")
+
+    def _worker_args(self, worker_id: int) -> tuple:
+        """Аргументы нового запуска воркера (своя очередь подтверждений писателя)"""
+        ack_queue = None
+        if self.write_queue is not None:
+            ack_queue = self.manager.Queue()
+            self.ack_queues[worker_id] = ack_queue
+        return (worker_id, self.actual_workers, self.write_queue, ack_queue, self.engine)
+
+    def _has_work(self) -> bool:
+        """Есть ли смысл запускать воркера на место завершившегося"""
+        if self.harvest_done is not None and not self.harvest_done.is_set():
+            return True
+        return self.db.count_accounts_by_status('pending') > 0
+
+    def _on_tick(self, processed: int):
+        """
+        Показатели /metrics, строка состояния раз в PROGRESS_LOG_INTERVAL
+        и бэкап каждые BACKUP_INTERVAL аккаунтов
+        """
+        now = time.time()
+        elapsed = now - self._started
+        pending = self.db.get_pending_count()
+        workers = self.supervisor.active
+        self._update_gauges(processed, pending, workers, elapsed)
+
+        if now - self._last_progress >= config.PROGRESS_LOG_INTERVAL:
+            logger.info(format_status(self.supervisor.metrics.totals(), elapsed, pending, workers))
+            if self.limiter:
+                self.limiter.log_summary()
+            self._last_progress = now
+        if processed >= self._next_backup:
+            self.background_backup.start()
+            self._next_backup = (processed // config.BACKUP_INTERVAL + 1) * config.BACKUP_INTERVAL
+
+    def _update_gauges(self, processed: int, pending: int, workers: int, elapsed: float):
+        """Показатели оркестратора для /metrics (БД читается здесь, а не в запросе Prometheus)"""
+        rate = processed / elapsed if processed and elapsed > 0 else 0.0
+        gauges = {
+            'scraper_workers_active': ('Работающих воркеров', workers),
+            'scraper_accounts_pending': ('Аккаунтов в очереди (pending и in_progress)', pending),
+            'scraper_accounts_per_hour': ('Средняя скорость, аккаунтов в час', rate * 3600),
+            'scraper_eta_seconds': ('Оценка оставшегося времени, сек', pending / rate if rate else None),
+            'scraper_uptime_seconds': ('Время работы, сек', elapsed),
+        }
+        if self.limiter:
+            stats = self.limiter.snapshot()
+            gauges['scraper_limiter_rate'] = ('Темп общего лимитера, запросов в секунду', stats['rate'])
+            gauges['scraper_server_latency_seconds'] = ('Задержка ответа CRM (EWMA), сек', stats['latency'])
+        self.metrics_server.gauges = gauges
@@ -1,246 +1,475 @@
-import time
-import random
-import re
-from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
-from typing import List
-import config
-from database.db import Database
-from utils.logger import logger
-
-class PhoneScraper:
-    def __init__(self, page: Page, db: Database):
-        self.page = page
-        self.db = db
-    
-    def scrape_account(self, account_id: str, token_url: str, start_page: int = 1):
-        """Парсинг всех номеров из аккаунта"""
-        try:
-            logger.info(f"📞 Парсинг аккаунта {account_id}...")
-            
-            # Переход по токен-ссылке
-            self.page.goto(token_url)
-            
-            # Ждем загрузки страницы
-            time.sleep(5)
-            
-            # НОВОЕ: Устанавливаем 50 записей на странице
-            self._set_page_size(50)
-            
-            # Обновляем статус
-            self.db.update_account_status(account_id, 'in_progress')
-            
-            current_page = start_page
-            total_phones = 0
-            
-            while True:
-                logger.info(f"  📄 Страница {current_page}...")
-                
-                # Если не первая страница, переходим на нужную
-                if current_page > 1:
-                    self._go_to_page(current_page)
-                    time.sleep(3)
-                
-                # Парсим номера на текущей странице
-                phones = self._parse_phones_on_page()
-                
-                if phones:
-                    added = self.db.add_phones(account_id, phones)
-                    total_phones += added
-                    logger.info(f"  ✅ Добавлено {added} номеров (всего: {total_phones})")
-                else:
-                    logger.info(f"  ℹ️ Номеров не найдено на странице {current_page}")
-                
-                # Сохраняем прогресс
-                self.db.update_account_status(account_id, 'in_progress', current_page)
-                
-                # Проверяем наличие следующей страницы
-                if not self._has_next_page():
-                    logger.info(f"  📭 Достигнута последняя страница")
-                    break
-                
-                # Переход на следующую страницу
-                current_page += 1
-                time.sleep(random.uniform(*config.DELAY_BETWEEN_REQUESTS))
-            
-            # Завершаем обработку аккаунта
-            self.db.update_account_status(account_id, 'completed')
-            logger.info(f"✅ Аккаунт {account_id} обработан: {total_phones} номеров")
-            
-            return total_phones
-            
-        except Exception as e:
-            logger.error(f"❌ Ошибка парсинга аккаунта {account_id}: {e}")
-            self.db.update_account_status(account_id, 'failed')
-            return 0
-    
-    def _set_page_size(self, size: int = 50):
-        """Установить количество записей на странице"""
-        try:
-            logger.info(f"  ⚙️ Устанавливаю {size} записей на странице...")
-            
-            # Ищем кнопку dropdown "Длина страницы"
-            dropdown_selectors = [
-                '//button[contains(., "Длина страницы")]',
-                'button[data-toggle="dropdown"]',
-                '.btn-group button.dropdown-toggle',
-            ]
-            
-            dropdown_button = None
-            for selector in dropdown_selectors:
-                dropdown_button = self.page.query_selector(selector)
-                if dropdown_button:
-                    logger.debug(f"    Найдена кнопка dropdown: {selector}")
-                    break
-            
-            if not dropdown_button:
-                logger.warning(f"  ⚠️ Кнопка dropdown не найдена")
-                return
-            
-            # Кликаем на кнопку чтобы открыть меню
-            dropdown_button.click()
-            time.sleep(0.5)
-            
-            # Ищем ссылку с нужным размером
-            # Вариант 1: По точному href
-            link_selector = f'a[href*="updatepagesize?pageSize={size}"]'
-            size_link = self.page.query_selector(link_selector)
-            
-            # Вариант 2: По тексту
-            if not size_link:
-                size_link = self.page.query_selector(f'ul.dropdown-menu a:has-text("{size}")')
-            
-            # Вариант 3: XPath
-            if not size_link:
-                size_link = self.page.query_selector(f'//ul[contains(@class, "dropdown-menu")]//a[text()="{size}"]')
-            
-            if size_link:
-                # Проверяем что это не активная опция
-                parent_li = self.page.query_selector(f'//a[contains(@href, "pageSize={size}")]/parent::li')
-                
-                if parent_li and 'active' in parent_li.get_attribute('class'):
-                    logger.info(f"  ✅ Уже установлено {size} записей")
-                    # Закрываем меню
-                    self.page.keyboard.press('Escape')
-                    return
-                
-                # Кликаем на ссылку
-                size_link.click()
-                time.sleep(3)  # Ждем перезагрузки страницы
-                logger.info(f"  ✅ Установлено {size} записей")
-            else:
-                logger.warning(f"  ⚠️ Опция {size} не найдена в меню")
-                # Закрываем меню
-                self.page.keyboard.press('Escape')
-            
-        except Exception as e:
-            logger.warning(f"  ⚠️ Не удалось установить размер страницы: {e}")
-    
-    def _parse_phones_on_page(self) -> List[str]:
-        """Парсинг номеров на текущей странице"""
-        phones = []
-        
-        try:
-            # Ждем появления таблицы
-            time.sleep(2)
-            
-            selectors = [
-                'table tbody tr',
-                'table tr',
-                'tr[data-key]',
-                '.grid-view tbody tr',
-                'div[role="row"]',
-            ]
-            
-            rows = []
-            for selector in selectors:
-                rows = self.page.query_selector_all(selector)
-                if len(rows) > 0:
-                    logger.debug(f"   ✓ Найдено {len(rows)} строк (селектор: {selector})")
-                    break
-            
-            if len(rows) == 0:
-                logger.warning("   ✗ Таблица не найдена")
-                self.page.screenshot(path='debug_phones_page.png')
-                logger.info("   📸 Скриншот: debug_phones_page.png")
-                return []
-            
-            # Парсим каждую строку
-            for idx, row in enumerate(rows):
-                try:
-                    row_text = row.inner_text()
-                    
-                    # Пропускаем заголовки
-                    if 'ТЕЛЕФОН' in row_text or 'ПРОЕКТ' in row_text:
-                        continue
-                    
-                    # ВАРИАНТ 1: Regex поиск 11-значных номеров
-                    phone_matches = re.findall(r'\b(7\d{10})\b', row_text)
-                    
-                    if phone_matches:
-                        for phone in phone_matches:
-                            if phone not in phones:
-                                phones.append(phone)
-                    else:
-                        # ВАРИАНТ 2: Поиск по ячейкам
-                        phone_cells = row.query_selector_all('td')
-                        
-                        for cell in phone_cells:
-                            cell_text = cell.inner_text().strip()
-                            
-                            if cell_text.isdigit() and len(cell_text) == 11 and cell_text.startswith('7'):
-                                if cell_text not in phones:
-                                    phones.append(cell_text)
-                
-                except Exception as e:
-                    logger.debug(f"   Ошибка парсинга строки {idx}: {e}")
-                    continue
-            
-            # Дедупликация
-            phones = list(set(phones))
-            
-        except Exception as e:
-            logger.error(f"Ошибка парсинга номеров: {e}")
-        
-        return phones
-    
-    def _has_next_page(self) -> bool:
-        """Проверка наличия следующей страницы"""
-        try:
-            next_selectors = [
-                'li.next:not(.disabled) a',
-                'a[data-page]:not(.disabled)',
-                '.pagination .next:not(.disabled)',
-                'li:not(.disabled) > a[rel="next"]',
-            ]
-            
-            for selector in next_selectors:
-                next_button = self.page.query_selector(selector)
-                if next_button:
-                    return True
-            
-            return False
-        except:
-            return False
-    
-    def _go_to_page(self, page_num: int):
-        """Переход на указанную страницу"""
-        try:
-            current_url = self.page.url
-            
-            # Добавляем/обновляем параметр page
-            if '?' in current_url:
-                base_url = current_url.split('?')[0]
-                params = current_url.split('?')[1]
-                
-                params_list = [p for p in params.split('&') if not p.startswith('page=')]
-                params_list.append(f'page={page_num}')
-                
-                new_url = f"{base_url}?{'&'.join(params_list)}"
-            else:
-                new_url = f"{current_url}?page={page_num}"
-            
-            self.page.goto(new_url)
-            time.sleep(3)
-            
-        except Exception as e:
-            logger.error(f"Ошибка перехода на страницу {page_num}: {e}")
+import time
+import random
+import re
+from collections import deque
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
+from typing import List, Optional
+import config
+from database.db import Database
+from scraper.heartbeat import page_fetched
+from scraper.metrics import count, timed
+from scraper.extractors import extract_phones, has_captcha, read_total_pages, ROW_SELECTORS, NEXT_PAGE_SELECTORS
+from scraper.rate_limiter import classify_status, get_limiter
+from scraper.retry import RetryPolicy, TableNotFound
+from scraper.waits import wait_for_grid, wait_for_selector, wait_for_network_idle, wait_for_url
+from utils.logger import logger
+
+
+def set_page_param(url: str, page_num: int) -> str:
+    """URL таблицы с параметром page=page_num (остальные параметры сохраняются)"""
+    if '?' in url:
+        base_url = url.split('?')[0]
+        params = url.split('?')[1]
+        
+        params_list = [p for p in params.split('&') if not p.startswith('page=')]
+        params_list.append(f'page={page_num}')
+        
+        return f"{base_url}?{'&'.join(params_list)}"
+    return f"{url}?page={page_num}"
+
+
+class PhoneScraper:
+    # Название движка в логах и сводке скорости
+    engine = 'browser'
+    
+    def __init__(self, page: Page, db: Database):
+        self.page = page
+        self.db = db
+        # Страницы и чистое время их загрузки+разбора (без пауз и записи в БД)
+        self.pages_fetched = 0
+        self.fetch_seconds = 0.0
+        # Общий темп запросов всех воркеров (None — фиксированные паузы)
+        self.limiter = get_limiter()
+        # Повторы страниц с паузой; после серии неудач аккаунт откладывается
+        self.retry = RetryPolicy()
+    
+    def scrape_account(self, account_id: str, token_url: str, start_page: int = 1) -> Optional[int]:
+        """
+        Парсинг всех номеров из аккаунта
+
+        Returns:
+            Количество новых номеров или None, если аккаунт не обработан
+            (возвращен в очередь или отложен)
+        """
+        try:
+            logger.info(f"📞 Парсинг аккаунта {account_id}...")
+            
+            account_pages = self.pages_fetched
+            account_seconds = self.fetch_seconds
+            
+            # Переход по токен-ссылке и 50 записей на странице
+            with timed('open'):
+                self.retry.run(lambda attempt: self._open_account(token_url), 'вход по токену')
+            
+            # Обновляем статус
+            self.db.update_account_status(account_id, 'in_progress')
+            
+            # Число страниц известно заранее — страницы грузятся в несколько вкладок
+            total_pages = self._discover_total_pages()
+            if total_pages:
+                total_phones = self._scrape_planned(account_id, token_url, start_page, total_pages)
+            else:
+                total_phones = self._scrape_sequential(account_id, token_url, start_page)
+            
+            # Завершаем обработку аккаунта
+            self.db.update_account_status(account_id, 'completed')
+            logger.info(f"✅ Аккаунт {account_id} обработан: {total_phones} номеров")
+            self._log_speed(self.pages_fetched - account_pages,
+                            self.fetch_seconds - account_seconds)
+            
+            return total_phones
+            
+        except Exception as e:
+            self._fail_account(account_id, e)
+            return None
+    
+    def _fail_account(self, account_id: str, error: Exception):
+        """Вернуть аккаунт в очередь (прогресс сохранен) или отложить после серии неудач"""
+        logger.error(f"❌ Ошибка парсинга аккаунта {account_id}: {error}")
+        count('errors')
+        status = self.db.record_account_failure(account_id, str(error))
+        if status == 'parked':
+            logger.warning(
+                f"🅿️ Аккаунт {account_id} отложен: {config.CIRCUIT_BREAKER_THRESHOLD} "
+                f"неудачи подряд (вернуть: --mode clear --clear reset-failed)")
+        else:
+            logger.info(f"↩️ Аккаунт {account_id} вернется в очередь с сохраненной страницы")
+    
+    def _open_account(self, token_url: str, tab: Page = None):
+        """Вход по токен-ссылке: таблица номеров с 50 записями на странице"""
+        tab = tab or self.page
+        if self.limiter:
+            self.limiter.acquire()
+        self._navigate(tab, token_url)
+        
+        # Ждем появления таблицы номеров
+        wait_for_grid(tab, 'token_page')
+        
+        # НОВОЕ: Устанавливаем 50 записей на странице
+        self._set_page_size(50, tab)
+    
+    def _scrape_sequential(self, account_id: str, token_url: str, start_page: int) -> int:
+        """Обход страниц по порядку до последней (число страниц неизвестно)"""
+        current_page = start_page
+        total_phones = 0
+        # URL таблицы после входа: после неудачного перехода page.url —
+        # страница ошибки браузера, и повторы строятся от сохраненного
+        grid_url = self.page.url
+        
+        while True:
+            logger.info(f"  📄 Страница {current_page}...")
+            
+            fetch_started = time.perf_counter()
+            
+            # Загрузка и парсинг страницы; повтор — с этой же страницы
+            phones = self.retry.run(
+                lambda attempt: self._load_page(grid_url, current_page, attempt),
+                f'страница {current_page}',
+                recover=lambda: self._open_account(token_url))
+            self._record_fetch(fetch_started)
+            
+            # Номера и прогресс сохраняются одной транзакцией
+            added = self._save_page(account_id, phones, current_page)
+            
+            if phones:
+                total_phones += added
+                logger.info(f"  ✅ Добавлено {added} номеров (всего: {total_phones})")
+            else:
+                logger.info(f"  ℹ️ Номеров не найдено на странице {current_page}")
+            
+            # Проверяем наличие следующей страницы
+            if not self._has_next_page():
+                logger.info(f"  📭 Достигнута последняя страница")
+                break
+            
+            # Переход на следующую страницу
+            current_page += 1
+            self._pace()
+        
+        return total_phones
+    
+    def _load_page(self, grid_url: str, page_num: int, attempt: int) -> List[str]:
+        """Открыть страницу page_num (при повторе — заново) и разобрать номера"""
+        # Если не первая страница или повтор, переходим на нужную
+        if page_num > 1 or attempt > 1:
+            self._go_to_page(grid_url, page_num)
+        return self._parse_phones_on_page()
+    
+    def _discover_total_pages(self) -> Optional[int]:
+        """Число страниц по сводке/пагинации первой страницы"""
+        try:
+            total_pages = read_total_pages(self.page, config.PHONES_PER_PAGE)
+        except Exception as e:
+            logger.debug(f"   Не удалось определить число страниц: {e}")
+            return None
+        
+        if total_pages:
+            logger.info(f"  🗺️ Страниц в аккаунте: {total_pages}")
+        return total_pages
+    
+    def _scrape_planned(self, account_id: str, token_url: str, start_page: int,
+                        total_pages: int) -> int:
+        """
+        Обработка заранее известного списка страниц в FANOUT_TABS вкладках
+        
+        Пока разбирается одна страница, следующие уже загружаются в других
+        вкладках. Обработанные страницы отмечаются в битовой карте, поэтому
+        после прерывания пропущенные страницы дозагружаются при следующем запуске.
+        """
+        self.db.set_total_pages(account_id, total_pages)
+        done = self.db.get_done_pages(account_id)
+        pages = deque(p for p in range(start_page, total_pages + 1) if p not in done)
+        if not pages:
+            return 0
+        
+        logger.info(f"  📋 К загрузке: {len(pages)} из {total_pages} страниц")
+        
+        grid_url = self.page.url
+        tabs_count = max(1, min(config.FANOUT_TABS, len(pages)))
+        extra_tabs = [self.page.context.new_page() for _ in range(tabs_count - 1)]
+        inflight = deque()
+        total_phones = 0
+        
+        try:
+            # Первая страница уже открыта в основной вкладке
+            if pages[0] == 1:
+                inflight.append((pages.popleft(), self.page, None, time.time()))
+            else:
+                self._start_navigation(self.page, grid_url, pages.popleft(), inflight)
+            for tab in extra_tabs:
+                if pages:
+                    self._start_navigation(tab, grid_url, pages.popleft(), inflight)
+            
+            while inflight:
+                page_num, tab, url, started = inflight.popleft()
+                fetch_started = time.perf_counter()
+                
+                # Повтор — в той же вкладке, вход по токену заново при потере таблицы
+                phones = self.retry.run(
+                    lambda attempt: self._load_planned_page(
+                        tab, grid_url, page_num, url, started, attempt),
+                    f'страница {page_num}',
+                    recover=lambda: self._open_account(token_url, tab))
+                self._record_fetch(fetch_started)
+                
+                # Следующая страница начинает грузиться до записи в БД
+                if pages:
+                    self._pace()
+                    self._start_navigation(tab, grid_url, pages.popleft(), inflight)
+                
+                added = self._save_page(account_id, phones, page_num)
+                total_phones += added
+                logger.info(f"  📄 Страница {page_num}/{total_pages}: +{added} номеров "
+                            f"(всего: {total_phones})")
+        finally:
+            for tab in extra_tabs:
+                try:
+                    tab.close()
+                except Exception:
+                    pass
+        
+        return total_phones
+    
+    def _load_planned_page(self, tab: Page, grid_url: str, page_num: int,
+                           url: Optional[str], started: float, attempt: int) -> List[str]:
+        """Дождаться запущенной загрузки (при повторе — открыть заново) и разобрать номера"""
+        if attempt > 1:
+            self._navigate(tab, set_page_param(grid_url, page_num))
+            wait_for_grid(tab, 'page_change')
+        elif url is not None:
+            self._wait_navigation(tab, url, page_num, started)
+        return self._parse_phones_on_page(tab)
+    
+    def _start_navigation(self, tab: Page, grid_url: str, page_num: int, inflight: deque):
+        """Начать загрузку страницы без ожидания (навигация идет в фоне)"""
+        url = set_page_param(grid_url, page_num)
+        try:
+            tab.evaluate('url => { window.location.href = url; }', url)
+        except Exception:
+            # Контекст выполнения мог смениться — навигация уже началась
+            pass
+        inflight.append((page_num, tab, url, time.time()))
+    
+    def _wait_navigation(self, tab: Page, url: str, page_num: int, started: float):
+        """Дождаться загрузки запущенной страницы; при неудаче — обычный переход"""
+        pattern = re.compile(rf'[?&]page={page_num}(&|$)')
+        if wait_for_url(tab, pattern, 'fanout_page') and wait_for_grid(tab, 'fanout_grid'):
+            self._report(tab, time.time() - started)
+            return
+        if self.limiter:
+            self.limiter.record(time.time() - started, 'timeout')
+        logger.debug(f"   Повторная загрузка страницы {page_num}")
+        self._navigate(tab, url)
+        wait_for_grid(tab, 'page_change')
+    
+    def _pace(self):
+        """Дождаться очереди на следующий запрос страницы"""
+        if self.limiter:
+            self.limiter.acquire()
+        else:
+            time.sleep(random.uniform(*config.DELAY_BETWEEN_REQUESTS))
+    
+    def _navigate(self, tab: Page, url: str):
+        """page.goto с передачей задержки и ошибок сервера в лимитер"""
+        started = time.time()
+        try:
+            response = tab.goto(url)
+        except PlaywrightTimeout:
+            if self.limiter:
+                self.limiter.record(time.time() - started, 'timeout')
+            raise
+        self._report(tab, time.time() - started, response.status if response else None)
+        return response
+    
+    def _report(self, tab: Page, latency: float, status: int = None):
+        if not self.limiter:
+            return
+        signal = classify_status(status)
+        if signal == 'ok' and has_captcha(tab):
+            signal = 'ban'
+        self.limiter.record(latency, signal)
+    
+    def _record_fetch(self, started: float):
+        elapsed = time.perf_counter() - started
+        page_fetched(elapsed)
+        self.pages_fetched += 1
+        self.fetch_seconds += elapsed
+    
+    def _save_page(self, account_id: str, phones: List[str], page_num: int) -> int:
+        """Номера страницы и прогресс — одной транзакцией; возвращает число добавленных"""
+        with timed('write'):
+            added = self.db.add_phones_page(account_id, phones, page_num)
+        # Писатель сообщает реально добавленные номера позже (WriterClient считает сам)
+        if not getattr(self.db, 'deferred_writes', False):
+            count('phones_added', added)
+            count('duplicates', len(phones) - added)
+        return added
+    
+    def _log_speed(self, pages: int, seconds: float):
+        if pages and seconds > 0:
+            logger.info(f"  ⚡ {self.engine}: {pages} стр. за {seconds:.1f} сек "
+                        f"({pages / seconds:.2f} стр/сек без пауз)")
+    
+    def log_summary(self, log=logger):
+        """Сводная скорость движка за все аккаунты"""
+        if self.pages_fetched and self.fetch_seconds > 0:
+            log.info(
+                f"📊 Движок {self.engine}: {self.pages_fetched} стр., "
+                f"{self.pages_fetched / self.fetch_seconds:.2f} стр/сек без пауз")
+    
+    def _set_page_size(self, size: int = 50, tab: Page = None):
+        """Установить количество записей на странице"""
+        tab = tab or self.page
+        try:
+            logger.info(f"  ⚙️ Устанавливаю {size} записей на странице...")
+            
+            # Ищем кнопку dropdown "Длина страницы"
+            dropdown_selectors = [
+                '//button[contains(., "Длина страницы")]',
+                'button[data-toggle="dropdown"]',
+                '.btn-group button.dropdown-toggle',
+            ]
+            
+            dropdown_button = None
+            for selector in dropdown_selectors:
+                dropdown_button = tab.query_selector(selector)
+                if dropdown_button:
+                    logger.debug(f"    Найдена кнопка dropdown: {selector}")
+                    break
+            
+            if not dropdown_button:
+                logger.warning(f"  ⚠️ Кнопка dropdown не найдена")
+                return
+            
+            # Кликаем на кнопку чтобы открыть меню
+            dropdown_button.click()
+            wait_for_selector(tab, 'ul.dropdown-menu a', 'page_size_menu',
+                              timeout=config.WAIT_SHORT_TIMEOUT, state='visible')
+            
+            # Ищем ссылку с нужным размером
+            # Вариант 1: По точному href
+            link_selector = f'a[href*="updatepagesize?pageSize={size}"]'
+            size_link = tab.query_selector(link_selector)
+            
+            # Вариант 2: По тексту
+            if not size_link:
+                size_link = tab.query_selector(f'ul.dropdown-menu a:has-text("{size}")')
+            
+            # Вариант 3: XPath
+            if not size_link:
+                size_link = tab.query_selector(f'//ul[contains(@class, "dropdown-menu")]//a[text()="{size}"]')
+            
+            if size_link:
+                # Проверяем что это не активная опция
+                parent_li = tab.query_selector(f'//a[contains(@href, "pageSize={size}")]/parent::li')
+                
+                if parent_li and 'active' in parent_li.get_attribute('class'):
+                    logger.info(f"  ✅ Уже установлено {size} записей")
+                    # Закрываем меню
+                    tab.keyboard.press('Escape')
+                    return
+                
+                # Кликаем на ссылку и ждем перезагрузки таблицы
+                try:
+                    with tab.expect_navigation(timeout=config.WAIT_TIMEOUT):
+                        size_link.click()
+                except PlaywrightTimeout:
+                    # Размер мог примениться через AJAX без навигации
+                    wait_for_network_idle(tab, 'page_size_ajax')
+                wait_for_grid(tab, 'page_size')
+                logger.info(f"  ✅ Установлено {size} записей")
+            else:
+                logger.warning(f"  ⚠️ Опция {size} не найдена в меню")
+                # Закрываем меню
+                tab.keyboard.press('Escape')
+            
+        except Exception as e:
+            logger.warning(f"  ⚠️ Не удалось установить размер страницы: {e}")
+    
+    def _parse_phones_on_page(self, tab: Page = None) -> List[str]:
+        """Парсинг номеров на текущей странице (один вызов page.evaluate)"""
+        tab = tab or self.page
+        
+        # Ждем появления таблицы
+        wait_for_grid(tab, 'parse', timeout=config.WAIT_SHORT_TIMEOUT)
+        
+        try:
+            phones = extract_phones(tab)
+        except Exception as e:
+            logger.debug(f"   Извлечение через evaluate не удалось: {e}")
+            return self._parse_phones_dom(tab)
+        
+        if phones is None:
+            logger.warning("   ✗ Таблица не найдена")
+            tab.screenshot(path='debug_phones_page.png')
+            logger.info("   📸 Скриншот: debug_phones_page.png")
+            raise TableNotFound("на странице нет таблицы номеров")
+        
+        return phones
+    
+    def _parse_phones_dom(self, tab: Page = None) -> List[str]:
+        """Запасной парсинг через элементы DOM (по запросу на строку)"""
+        tab = tab or self.page
+        phones = set()
+        
+        try:
+            rows = []
+            for selector in ROW_SELECTORS:
+                rows = tab.query_selector_all(selector)
+                if len(rows) > 0:
+                    logger.debug(f"   ✓ Найдено {len(rows)} строк (селектор: {selector})")
+                    break
+            
+            if len(rows) == 0:
+                logger.warning("   ✗ Таблица не найдена")
+                return []
+            
+            # Парсим каждую строку
+            for idx, row in enumerate(rows):
+                try:
+                    row_text = row.inner_text()
+                    
+                    # Пропускаем заголовки
+                    if 'ТЕЛЕФОН' in row_text or 'ПРОЕКТ' in row_text:
+                        continue
+                    
+                    # ВАРИАНТ 1: Regex поиск 11-значных номеров
+                    phone_matches = re.findall(r'\b(7\d{10})\b', row_text)
+                    
+                    if phone_matches:
+                        phones.update(phone_matches)
+                    else:
+                        # ВАРИАНТ 2: Поиск по ячейкам
+                        phone_cells = row.query_selector_all('td')
+                        
+                        for cell in phone_cells:
+                            cell_text = cell.inner_text().strip()
+                            
+                            if cell_text.isdigit() and len(cell_text) == 11 and cell_text.startswith('7'):
+                                phones.add(cell_text)
+                
+                except Exception as e:
+                    logger.debug(f"   Ошибка парсинга строки {idx}: {e}")
+                    continue
+            
+        except Exception as e:
+            logger.error(f"Ошибка парсинга номеров: {e}")
+        
+        return list(phones)
+    
+    def _has_next_page(self) -> bool:
+        """Проверка наличия следующей страницы"""
+        try:
+            for selector in NEXT_PAGE_SELECTORS:
+                next_button = self.page.query_selector(selector)
+                if next_button:
+                    return True
+            
+            return False
+        except:
+            return False
+    
+    def _go_to_page(self, grid_url: str, page_num: int):
+        """Переход на указанную страницу (таймаут перехода повторяет RetryPolicy)"""
+        self._navigate(self.page, set_page_param(grid_url, page_num))
+        wait_for_grid(self.page, 'page_change')
@@ -0,0 +1,94 @@
+import multiprocessing as mp
+import time
+import config
+from database.db import Database
+from scraper import session_store
+from scraper.auth import ensure_logged_in
+from scraper.browser import BrowserManager
+from scraper.harvester import AccountHarvester
+from scraper.parallel_scraper import ParallelScraper
+from scraper.rate_limiter import init_worker_limiter
+from utils.logger import logger
+
+
+def harvest_process(harvest_done, limiter=None, fresh: bool = False,
+                    tokens_on_demand: bool = config.PIPELINE_TOKENS_ON_DEMAND):
+    """
+    Процесс-сборщик конвейера
+
+    Каждый аккаунт записывается в БД, как только для него получен токен
+    (или сразу, если токены генерируют воркеры), и тут же доступен для
+    захвата воркерами. По завершении, в том числе с ошибкой,
+    устанавливается harvest_done — воркеры доделывают очередь и выходят.
+    """
+    from utils.logger import setup_logger
+    harvest_logger = setup_logger('Harvester')
+
+    # Запросы create-token и списка аккаунтов — в общем темпе с воркерами
+    init_worker_limiter(limiter)
+
+    try:
+        db = Database()
+        state = session_store.load_state()
+        with BrowserManager(phase='login', storage_state=state) as browser:
+            page = browser.new_page()
+            if not ensure_logged_in(page, restored=state is not None):
+                harvest_logger.error("❌ Сборщик не авторизовался — воркеры обработают только очередь")
+                return
+
+            browser.set_phase('harvest')
+            harvester = AccountHarvester(page, db, fresh=fresh, tokens_on_demand=tokens_on_demand)
+            harvester.harvest_all_accounts()
+
+    except KeyboardInterrupt:
+        harvest_logger.warning("⚠️ Сборщик остановлен пользователем")
+    except Exception as e:
+        harvest_logger.error(f"❌ Ошибка сборщика: {e}", exc_info=True)
+    finally:
+        harvest_done.set()
+        harvest_logger.info("🏁 Сбор аккаунтов завершен")
+
+
+class PipelineScraper:
+    """
+    Сбор аккаунтов и парсинг номеров одновременно
+
+    Сборщик работает в отдельном процессе, воркеры ParallelScraper
+    забирают аккаунты из той же очереди в БД (claim_accounts) по мере
+    появления и ждут новые, пока сбор не закончен.
+    """
+
+    def __init__(self, max_workers: int = config.MAX_WORKERS,
+                 writer_mode: bool = config.WRITER_MODE,
+                 engine: str = config.SCRAPE_ENGINE,
+                 fresh: bool = False,
+                 autoscale: bool = config.AUTOSCALE):
+        self.harvest_done = mp.Event()
+        self.scraper = ParallelScraper(
+            max_workers=max_workers, writer_mode=writer_mode,
+            engine=engine, harvest_done=self.harvest_done,
+            autoscale=autoscale)
+        self.fresh = fresh
+
+    def run(self):
+        logger.info("=" * 60)
+        logger.info("🔀 КОНВЕЙЕР: сбор аккаунтов и парсинг номеров одновременно")
+        if config.PIPELINE_TOKENS_ON_DEMAND:
+            logger.info("🔑 Токены генерируются воркерами перед парсингом")
+        logger.info("=" * 60)
+
+        start_time = time.time()
+        harvester = mp.Process(
+            target=harvest_process,
+            args=(self.harvest_done, self.scraper.limiter, self.fresh),
+            name='Harvester'
+        )
+        harvester.start()
+
+        try:
+            self.scraper.run()
+        finally:
+            # Воркеры могли завершиться раньше (прерывание) — сборщик дорабатывает сам
+            harvester.join()
+
+        logger.info(f"⏱️ Конвейер: {(time.time() - start_time) / 60:.1f} минут всего")
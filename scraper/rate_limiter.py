@@ -0,0 +1,164 @@
+import multiprocessing as mp
+import time
+from typing import Dict, Optional
+import config
+from utils.logger import logger
+
+# Поля общего массива состояния
+_RATE = 0  # текущая скорость, запросов/сек на всех воркеров
+_TOKENS = 1  # токены в корзине (отрицательные — уже выданные авансом)
+_UPDATED = 2  # время последнего пополнения
+_LATENCY = 3  # сглаженная задержка сервера, сек
+_DECREASED = 4  # время последнего снижения скорости
+_PAUSED_UNTIL = 5  # пауза после капчи/429
+_REQUESTS = 6
+_ERRORS = 7
+_TIMEOUTS = 8
+_BANS = 9
+_FIELDS = 10
+
+# Вес нового замера в сглаженной задержке
+LATENCY_ALPHA = 0.2
+
+# Ответы, означающие ограничение частоты или бан
+BAN_STATUSES = (403, 429)
+
+
+def classify_status(status: Optional[int]) -> str:
+    """Сигнал для лимитера по HTTP-статусу ответа"""
+    if status in BAN_STATUSES:
+        return 'ban'
+    if status is not None and status >= 500:
+        return 'error'
+    return 'ok'
+
+
+class RateLimiter:
+    """
+    Token bucket, общий для всех процессов-воркеров, с AIMD-регулировкой
+
+    Состояние хранится в multiprocessing.Array, поэтому лимит действует на
+    суммарную нагрузку. Скорость растет на RATE_INCREASE после каждой быстрой
+    страницы и умножается на RATE_DECREASE при медленном ответе, ошибке или
+    таймауте (не чаще раза в RATE_DECREASE_INTERVAL). Капча или 429/403
+    снижают скорость на RATE_BAN_DECREASE и останавливают всех воркеров
+    на RATE_BAN_PAUSE секунд.
+    """
+
+    def __init__(self, rate: float = config.RATE_INITIAL,
+                 min_rate: float = config.RATE_MIN,
+                 max_rate: float = config.RATE_MAX,
+                 burst: float = config.RATE_BURST):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._state = mp.Array('d', _FIELDS)
+        self._state[_RATE] = rate
+        self._state[_TOKENS] = burst
+        self._state[_UPDATED] = time.time()
+
+    def reserve(self) -> float:
+        """
+        Занять токен на следующий запрос
+
+        Returns:
+            Сколько секунд подождать перед запросом
+        """
+        with self._state.get_lock():
+            now = time.time()
+            state = self._state
+            rate = state[_RATE]
+            state[_TOKENS] = min(self.burst, state[_TOKENS] + (now - state[_UPDATED]) * rate)
+            state[_UPDATED] = now
+            state[_TOKENS] -= 1
+            state[_REQUESTS] += 1
+
+            wait = -state[_TOKENS] / rate if state[_TOKENS] < 0 else 0.0
+            return max(wait, state[_PAUSED_UNTIL] - now)
+
+    def acquire(self):
+        """Дождаться своей очереди на запрос"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, latency: Optional[float] = None, signal: str = 'ok'):
+        """
+        Учесть результат запроса
+
+        Args:
+            latency: Время ответа сервера, сек
+            signal: 'ok', 'error' (5xx, сбой сети), 'timeout' или 'ban' (капча, 429, 403)
+        """
+        with self._state.get_lock():
+            now = time.time()
+            state = self._state
+            if latency is not None:
+                if state[_LATENCY] == 0:
+                    state[_LATENCY] = latency
+                else:
+                    state[_LATENCY] += LATENCY_ALPHA * (latency - state[_LATENCY])
+
+            if signal == 'ban':
+                state[_BANS] += 1
+                state[_PAUSED_UNTIL] = now + config.RATE_BAN_PAUSE
+                self._decrease(config.RATE_BAN_DECREASE, now, force=True)
+                logger.warning(
+                    f"🛑 Признаки блокировки: пауза {config.RATE_BAN_PAUSE} сек, "
+                    f"скорость {state[_RATE]:.2f} запр/сек")
+            elif signal in ('error', 'timeout'):
+                state[_ERRORS if signal == 'error' else _TIMEOUTS] += 1
+                self._decrease(config.RATE_DECREASE, now)
+            elif latency is not None and latency > config.RATE_TARGET_LATENCY:
+                self._decrease(config.RATE_DECREASE, now)
+            else:
+                state[_RATE] = min(self.max_rate, state[_RATE] + config.RATE_INCREASE)
+
+    def _decrease(self, factor: float, now: float, force: bool = False):
+        # Одна перегрузка дает серию плохих ответов — снижаем один раз за интервал
+        if not force and now - self._state[_DECREASED] < config.RATE_DECREASE_INTERVAL:
+            return
+        self._state[_RATE] = max(self.min_rate, self._state[_RATE] * factor)
+        self._state[_DECREASED] = now
+
+    def snapshot(self) -> Dict:
+        """Текущая скорость, задержка сервера и счетчики"""
+        with self._state.get_lock():
+            state = self._state
+            return {
+                'rate': state[_RATE],
+                'latency': state[_LATENCY],
+                'paused': max(0.0, state[_PAUSED_UNTIL] - time.time()),
+                'requests': int(state[_REQUESTS]),
+                'errors': int(state[_ERRORS]),
+                'timeouts': int(state[_TIMEOUTS]),
+                'bans': int(state[_BANS]),
+            }
+
+    def log_summary(self, log=logger):
+        stats = self.snapshot()
+        message = (
+            f"📶 Темп: {stats['rate']:.2f} запр/сек, задержка сервера {stats['latency']:.1f} сек, "
+            f"запросов {stats['requests']}, ошибок {stats['errors']}, "
+            f"таймаутов {stats['timeouts']}, блокировок {stats['bans']}")
+        if stats['paused'] > 0:
+            message += f", пауза еще {stats['paused']:.0f} сек"
+        log.info(message)
+
+
+# Лимитер процесса: общий (передан инициализатором пула) или свой
+_limiter: Optional[RateLimiter] = None
+
+
+def init_worker_limiter(limiter: Optional[RateLimiter]):
+    """Инициализатор mp.Pool: сделать общий лимитер лимитером процесса"""
+    global _limiter
+    _limiter = limiter
+
+
+def get_limiter() -> Optional[RateLimiter]:
+    """Лимитер текущего процесса; None, если RATE_LIMIT выключен"""
+    global _limiter
+    if _limiter is None and config.RATE_LIMIT:
+        _limiter = RateLimiter()
+    return _limiter
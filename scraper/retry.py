@@ -0,0 +1,130 @@
+import asyncio
+import random
+import time
+from typing import Callable, Optional, TypeVar
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeout
+import config
+from scraper.heartbeat import beat
+from scraper.metrics import count
+from utils.logger import logger
+
+T = TypeVar('T')
+
+
+class PageTimeout(Exception):
+    """Страница или таблица не загрузилась за отведенное время"""
+
+
+class TableNotFound(Exception):
+    """На странице нет таблицы номеров (сессия сброшена, капча, другая верстка)"""
+
+
+class RequestFailed(Exception):
+    """Временный сбой HTTP-запроса: разрыв соединения, 5xx или признак блокировки"""
+
+
+class RetriesExhausted(Exception):
+    """Операция не удалась после всех попыток"""
+
+    def __init__(self, name: str, kind: str, attempts: int, error: Exception):
+        super().__init__(f"{name}: {KIND_NAMES[kind]} после {attempts} попыток ({error})")
+        self.kind = kind
+        self.error = error
+
+
+KIND_NAMES = {
+    'timeout': 'таймаут',
+    'no_table': 'нет таблицы',
+    'error': 'ошибка браузера',
+    'http': 'ошибка HTTP',
+}
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """Вид ошибки для повтора; None — ошибка не повторяется"""
+    if isinstance(error, (PlaywrightTimeout, PageTimeout, asyncio.TimeoutError)):
+        return 'timeout'
+    if isinstance(error, TableNotFound):
+        return 'no_table'
+    if isinstance(error, PlaywrightError):
+        return 'error'
+    if isinstance(error, RequestFailed):
+        return 'http'
+    return None
+
+
+class RetryPolicy:
+    """
+    Повтор операции над страницей с экспоненциальной задержкой и jitter
+
+    Таймауты и ошибки браузера повторяются после паузы. При отсутствии
+    таблицы перед повтором вызывается recover (повторный вход по токену),
+    т.к. чаще всего это сброшенная сессия. Операция получает номер попытки,
+    поэтому повтор выполняется с той же страницы, а не с начала аккаунта.
+    """
+
+    def __init__(self, attempts: int = config.RETRY_ATTEMPTS,
+                 base_delay: float = config.RETRY_DELAY,
+                 max_delay: float = config.RETRY_MAX_DELAY):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+
+    def backoff(self, attempt: int) -> float:
+        """Пауза перед попыткой attempt + 1: base * 2^(attempt-1), случайно от половины до полной"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(delay / 2, delay)
+
+    def _on_failure(self, name: str, attempt: int, error: Exception) -> tuple:
+        """Решить, повторять ли. Возвращает (вид ошибки, пауза)"""
+        kind = classify_error(error)
+        if kind is None:
+            raise error
+        if attempt >= self.attempts:
+            raise RetriesExhausted(name, kind, attempt, error) from error
+
+        # Воркер жив, просто повторяет — супервизор не должен его перезапускать
+        beat()
+        count('retries')
+        delay = self.backoff(attempt)
+        self.retries += 1
+        logger.warning(
+            f"  🔁 {name}: {KIND_NAMES[kind]} (попытка {attempt}/{self.attempts}), "
+            f"повтор через {delay:.1f} сек")
+        return kind, delay
+
+    def run(self, operation: Callable[[int], T], name: str,
+            recover: Callable[[], None] = None) -> T:
+        """Выполнить operation(attempt) с повторами"""
+        attempt = 1
+        while True:
+            try:
+                return operation(attempt)
+            except Exception as e:
+                kind, delay = self._on_failure(name, attempt, e)
+
+            time.sleep(delay)
+            if kind == 'no_table' and recover:
+                try:
+                    recover()
+                except Exception as e:
+                    logger.warning(f"  ⚠️ Восстановление сессии не удалось: {e}")
+            attempt += 1
+
+    async def run_async(self, operation, name: str, recover=None):
+        """То же для корутин: operation(attempt) и recover() возвращают awaitable"""
+        attempt = 1
+        while True:
+            try:
+                return await operation(attempt)
+            except Exception as e:
+                kind, delay = self._on_failure(name, attempt, e)
+
+            await asyncio.sleep(delay)
+            if kind == 'no_table' and recover:
+                try:
+                    await recover()
+                except Exception as e:
+                    logger.warning(f"  ⚠️ Восстановление сессии не удалось: {e}")
+            attempt += 1
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+import requests
+from playwright.sync_api import BrowserContext
+import config
+from utils.logger import logger
+
+
+def state_path(login: str = None, password: str = None) -> Path:
+    """
+    Файл storage_state для учетных данных
+
+    Имя — хэш адреса CRM, логина и пароля: смена пароля или стенда
+    дает другой файл, а старый просто перестает использоваться.
+    """
+    login = config.ADMIN_LOGIN if login is None else login
+    password = config.ADMIN_PASSWORD if password is None else password
+    key = hashlib.sha256(f"{config.BASE_URL}\n{login}\n{password}".encode('utf-8')).hexdigest()
+    return Path(config.SESSION_STATE_DIR) / f"admin_{key[:16]}.json"
+
+
+def load_state(ttl_hours: float = config.SESSION_TTL_HOURS) -> Optional[str]:
+    """
+    Путь к сохраненной сессии, если она есть и не старше ttl_hours
+
+    Returns:
+        Путь для storage_state контекста или None (нужен вход)
+    """
+    if not config.SESSION_REUSE:
+        return None
+
+    path = state_path()
+    if not path.exists():
+        return None
+
+    age_hours = (time.time() - path.stat().st_mtime) / 3600
+    if ttl_hours and age_hours > ttl_hours:
+        logger.info(f"⌛ Сохраненная сессия старше {ttl_hours} ч — нужен вход")
+        invalidate()
+        return None
+
+    logger.debug(f"   Сохраненная сессия: {path} ({age_hours:.1f} ч)")
+    return str(path)
+
+
+def save_state(context: BrowserContext) -> Optional[str]:
+    """Сохранить cookies и localStorage авторизованного контекста"""
+    if not config.SESSION_REUSE:
+        return None
+
+    path = state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    try:
+        context.storage_state(path=str(tmp_path))
+        # В файле cookies сессии админки — только для владельца
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"⚠️ Не удалось сохранить сессию: {e}")
+        return None
+
+    logger.info("💾 Сессия админки сохранена")
+    return str(path)
+
+
+def invalidate():
+    """Удалить сохраненную сессию (устарела или отозвана)"""
+    try:
+        state_path().unlink()
+    except FileNotFoundError:
+        pass
+
+
+def load_state_cookies(session: requests.Session, path: str) -> int:
+    """Перенести cookies из файла storage_state в сессию requests"""
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+
+    cookies = state.get('cookies', [])
+    for cookie in cookies:
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain', ''),
+            path=cookie.get('path', '/'),
+            secure=cookie.get('secure', False)
+        )
+    return len(cookies)
@@ -0,0 +1,325 @@
+import os
+import signal
+import sys
+import threading
+import time
+import multiprocessing as mp
+from typing import Callable, List, Optional
+import config
+from database.db import Database
+from database.leases import make_worker_id
+from scraper.heartbeat import init_worker_heartbeat, recycled
+from scraper.metrics import WorkerMetrics, init_worker_metrics
+from utils.logger import logger
+
+# Код выхода воркера, отработавшего WORKER_RECYCLE_ACCOUNTS аккаунтов
+EXIT_RECYCLE = 3
+
+
+def ignore_sigint():
+    """Ctrl+C обрабатывает только главный процесс (писатель и менеджер очередей доживают до конца)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _worker_main(target, args, slot, initializer, initargs,
+                 heartbeats, metrics, retire, stop_event, max_accounts):
+    """Точка входа процесса-воркера под супервизором"""
+    # Своя группа процессов: Ctrl+C в терминале не долетает до воркера
+    # и его браузера, а зависшего воркера можно убить вместе с Chromium
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    if initializer is not None:
+        initializer(*initargs)
+    init_worker_metrics(metrics, slot)
+    init_worker_heartbeat(slot, heartbeats, retire, stop_event, max_accounts)
+
+    target(*args)
+    sys.exit(EXIT_RECYCLE if recycled() else 0)
+
+
+def kill_process_tree(process: mp.Process):
+    """Убить процесс воркера вместе с драйвером Playwright и Chromium"""
+    children = []
+    try:
+        import psutil
+        children = psutil.Process(process.pid).children(recursive=True)
+    except ImportError:
+        pass
+    except Exception:
+        children = []
+
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+    process.kill()
+
+    for child in children:
+        try:
+            child.kill()
+        except Exception:
+            continue
+    process.join(timeout=10)
+
+
+class _Slot:
+    """Место воркера: процесс текущего запуска и счетчики перезапусков"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.process: Optional[mp.Process] = None
+        self.worker_id = 0
+        self.restarts = 0  # Подряд, без обработанных аккаунтов
+        self.processed_at_spawn = 0
+        self.finished = False
+        self.retiring = False  # Автомасштаб попросил воркера завершиться
+
+
+class WorkerSupervisor:
+    """
+    Запуск и надзор за процессами-воркерами вместо mp.Pool
+
+    Каждый воркер живет в своем слоте и обновляет отметку времени в общем
+    массиве (scraper.heartbeat). Супервизор раз в MONITOR_INTERVAL:
+    - убивает воркера, молчащего дольше WORKER_STALL_TIMEOUT, вместе с
+      браузером и возвращает его аккаунты в очередь;
+    - запускает новый процесс на место упавшего, зависшего или
+      отработавшего WORKER_RECYCLE_ACCOUNTS аккаунтов, пока есть работа;
+    - по первому Ctrl+C/SIGTERM просит воркеров доделать текущий аккаунт
+      и выйти, по второму (или через WORKER_DRAIN_TIMEOUT) — убивает.
+
+    Каждый запуск получает новый worker_id, поэтому аренды и очереди
+    подтверждений разных запусков одного слота не пересекаются.
+
+    С autoscaler запускается start_workers воркеров, а число занятых
+    слотов меняется по его решениям (scale_to): лишний воркер доделывает
+    текущий аккаунт и выходит, новый занимает свободный слот.
+    """
+
+    def __init__(self, target: Callable, workers: int,
+                 make_args: Callable[[int], tuple],
+                 initializer: Callable = None, initargs: tuple = (),
+                 has_work: Callable[[], bool] = None,
+                 on_tick: Callable[[int], None] = None,
+                 db: Database = None,
+                 autoscaler=None,
+                 start_workers: int = None,
+                 max_accounts: int = config.WORKER_RECYCLE_ACCOUNTS,
+                 stall_timeout: float = config.WORKER_STALL_TIMEOUT,
+                 max_restarts: int = config.WORKER_MAX_RESTARTS,
+                 drain_timeout: float = config.WORKER_DRAIN_TIMEOUT):
+        self.target = target
+        self.make_args = make_args
+        self.initializer = initializer
+        self.initargs = initargs
+        self.has_work = has_work or (lambda: False)
+        self.on_tick = on_tick
+        self.db = db or Database()
+        self.autoscaler = autoscaler
+        self.start_workers = workers if start_workers is None else min(start_workers, workers)
+        self.max_accounts = max_accounts
+        self.stall_timeout = stall_timeout
+        self.max_restarts = max_restarts
+        self.drain_timeout = drain_timeout
+
+        self.slots: List[_Slot] = [_Slot(i) for i in range(workers)]
+        self.heartbeats = mp.Array('d', workers)
+        # Счетчики по слотам (scraper.metrics): аккаунты, страницы, номера, время этапов
+        self.metrics = WorkerMetrics(workers)
+        self.retire = mp.Array('b', workers)
+        self.stop_event = mp.Event()
+
+        self._next_worker_id = 1
+        self._stop_requested_at: Optional[float] = None
+        self._force_stop = False
+
+        # Статистика
+        self.stalled = 0
+        self.crashed = 0
+        self.recycled = 0
+
+    @property
+    def total_processed(self) -> int:
+        """Обработано аккаунтов всеми воркерами, включая убитые и перезапущенные"""
+        return int(self.metrics.total('accounts'))
+
+    @property
+    def total_pages(self) -> int:
+        return int(self.metrics.total('pages'))
+
+    @property
+    def active(self) -> int:
+        """Работающих воркеров (без завершающихся по решению автомасштаба)"""
+        return sum(1 for slot in self.slots if slot.process is not None and not slot.retiring)
+
+    def run(self) -> int:
+        """Запустить воркеров и ждать, пока все слоты не завершатся"""
+        for slot in self.slots:
+            if slot.index < self.start_workers:
+                self._spawn(slot)
+            else:
+                slot.finished = True
+
+        previous = self._install_signal_handlers()
+        try:
+            while not all(slot.finished for slot in self.slots):
+                time.sleep(config.MONITOR_INTERVAL)
+
+                if self._force_stop:
+                    self._kill_all("⛔ Принудительная остановка воркеров")
+                    break
+                if self._stop_requested_at is not None and \
+                        time.time() - self._stop_requested_at > self.drain_timeout:
+                    self._kill_all(f"⛔ Воркеры не завершились за {self.drain_timeout} сек — останавливаю")
+                    break
+
+                for slot in self.slots:
+                    if not slot.finished:
+                        self._check_slot(slot)
+
+                if self.autoscaler is not None and not self.stop_event.is_set():
+                    target = self.autoscaler.update(self.active, self.total_pages)
+                    if target != self.active:
+                        self.scale_to(target)
+
+                if self.on_tick is not None:
+                    self.on_tick(self.total_processed)
+        finally:
+            self._restore_signal_handlers(previous)
+            self._kill_all()
+
+        self.log_summary()
+        if self.autoscaler is not None:
+            self.autoscaler.log_summary()
+        return self.total_processed
+
+    def scale_to(self, workers: int):
+        """Довести число работающих воркеров до workers"""
+        while self.active < workers and self.has_work():
+            slot = next((s for s in self.slots if s.finished), None)
+            if slot is None:
+                break
+            slot.finished = False
+            slot.restarts = 0
+            self._spawn(slot)
+            logger.info(f"➕ Слот #{slot.index + 1}: запущен воркер #{slot.worker_id}")
+
+        while self.active > workers:
+            slot = max((s for s in self.slots if s.process is not None and not s.retiring),
+                       key=lambda s: s.index)
+            slot.retiring = True
+            self.retire[slot.index] = 1
+            logger.info(f"➖ Воркер #{slot.worker_id} завершится после текущего аккаунта")
+
+    def _spawn(self, slot: _Slot):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+
+        self.heartbeats[slot.index] = time.time()
+        self.retire[slot.index] = 0
+        slot.worker_id = worker_id
+        slot.processed_at_spawn = self.metrics.get(slot.index, 'accounts')
+        slot.process = mp.Process(
+            target=_worker_main,
+            args=(self.target, self.make_args(worker_id), slot.index,
+                  self.initializer, self.initargs,
+                  self.heartbeats, self.metrics, self.retire,
+                  self.stop_event, self.max_accounts),
+            name=f'Worker-{worker_id}'
+        )
+        slot.process.start()
+
+    def _check_slot(self, slot: _Slot):
+        process = slot.process
+
+        if process.is_alive():
+            silent = time.time() - self.heartbeats[slot.index]
+            if silent <= self.stall_timeout:
+                return
+            logger.warning(
+                f"🧟 Воркер #{slot.worker_id} не подает признаков жизни {silent:.0f} сек — перезапускаю")
+            kill_process_tree(process)
+            self.stalled += 1
+        elif process.exitcode == EXIT_RECYCLE:
+            self.recycled += 1
+            logger.info(f"♻️ Воркер #{slot.worker_id} обработал {self.max_accounts} аккаунтов — перезапуск")
+        elif process.exitcode != 0:
+            self.crashed += 1
+            logger.warning(f"💥 Воркер #{slot.worker_id} завершился с кодом {process.exitcode}")
+
+        recycle = process.exitcode == EXIT_RECYCLE
+        self._release(slot)
+
+        if self.stop_event.is_set() or slot.retiring:
+            slot.retiring = False
+            slot.finished = True
+            return
+        if not recycle and not self.has_work():
+            slot.finished = True
+            return
+
+        if self.metrics.get(slot.index, 'accounts') > slot.processed_at_spawn:
+            slot.restarts = 0
+        elif not recycle:
+            slot.restarts += 1
+            if slot.restarts > self.max_restarts:
+                logger.error(
+                    f"❌ Слот #{slot.index + 1}: {self.max_restarts} перезапусков подряд "
+                    f"без обработанных аккаунтов — слот остановлен")
+                slot.finished = True
+                return
+
+        self._spawn(slot)
+        logger.info(f"🔁 Слот #{slot.index + 1}: запущен воркер #{slot.worker_id}")
+
+    def _release(self, slot: _Slot):
+        """Вернуть в очередь аккаунты завершенного или убитого воркера"""
+        owner = make_worker_id(slot.worker_id, pid=slot.process.pid)
+        slot.process = None
+        try:
+            released = self.db.release_leases(owner)
+        except Exception as e:
+            logger.warning(f"⚠️ Не удалось вернуть аккаунты воркера #{slot.worker_id}: {e}")
+            return
+        if released:
+            logger.info(f"↩️ Возвращено в очередь: {released} аккаунтов воркера #{slot.worker_id}")
+
+    def _kill_all(self, message: str = None):
+        alive = [slot for slot in self.slots if slot.process is not None and slot.process.is_alive()]
+        if alive and message:
+            logger.warning(message)
+        for slot in alive:
+            kill_process_tree(slot.process)
+        for slot in self.slots:
+            if slot.process is not None:
+                self._release(slot)
+            slot.finished = True
+
+    def _on_signal(self, signum, frame):
+        if self._stop_requested_at is None:
+            self._stop_requested_at = time.time()
+            self.stop_event.set()
+            logger.warning(
+                "\n⚠️ Прерывание пользователем. Воркеры доделывают текущие аккаунты "
+                "(повторный Ctrl+C — остановить сразу)...")
+        else:
+            self._force_stop = True
+
+    def _install_signal_handlers(self) -> dict:
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        previous = {}
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, self._on_signal)
+        return previous
+
+    def _restore_signal_handlers(self, previous: dict):
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+    def log_summary(self, log=logger):
+        if self.stalled or self.crashed or self.recycled:
+            log.info(
+                f"🩺 Супервизор: зависших {self.stalled}, упавших {self.crashed}, "
+                f"плановых перезапусков {self.recycled}")
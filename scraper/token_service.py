@@ -0,0 +1,308 @@
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+import requests
+from playwright.sync_api import Page
+import config
+from scraper.http_scraper import create_http_session, load_browser_cookies
+from scraper.rate_limiter import RateLimiter, classify_status, get_limiter
+from scraper.session_store import load_state, load_state_cookies
+from utils.logger import logger
+
+# Токен-ссылка в ответе create-token (JSON, HTML или текст)
+TOKEN_URL_PATTERN = re.compile(r'https?://[^\s"\'<>\\]+signin\?token=[^\s"\'<>\\]+')
+
+# CSRF-токен Yii2 из meta-тега страницы админки
+CSRF_SCRIPT = '''() => {
+    const param = document.querySelector('meta[name="csrf-param"]');
+    const token = document.querySelector('meta[name="csrf-token"]');
+    return token ? [param ? param.content : '_csrf', token.content] : null;
+}'''
+CSRF_META_PATTERN = re.compile(r'<meta[^>]+name="csrf-(param|token)"[^>]+content="([^"]*)"')
+
+
+def parse_token_response(text: str) -> Optional[str]:
+    """Токен-ссылка из ответа create-token. None — ссылки в ответе нет"""
+    if not text:
+        return None
+
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+
+    # В JSON ссылка может лежать в любом поле (url, link, token, data.url...)
+    if data is not None:
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                stack.extend(value.values())
+            elif isinstance(value, list):
+                stack.extend(value)
+            elif isinstance(value, str):
+                match = TOKEN_URL_PATTERN.search(value)
+                if match:
+                    return match.group(0)
+
+    match = TOKEN_URL_PATTERN.search(text.replace('\\/', '/'))
+    return match.group(0) if match else None
+
+
+def probe_tokens(tokens: Dict[str, str], limiter: RateLimiter = None,
+                 concurrency: int = config.TOKEN_CONCURRENCY,
+                 timeout: float = config.HTTP_TIMEOUT) -> Dict[str, str]:
+    """
+    Оставить токены, по которым еще открывается кабинет
+
+    Каждая ссылка открывается в отдельной сессии без cookies админки;
+    токен считается действующим, если после редиректов ответ успешный
+    и это не ссылка входа и не форма логина. Сетевые ошибки не считаются
+    отказом токена.
+    """
+    def is_valid(token_url: str) -> bool:
+        if limiter:
+            limiter.acquire()
+        started = time.time()
+        try:
+            with create_http_session(pool_size=1) as session:
+                response = session.get(token_url, timeout=timeout)
+        except requests.RequestException as e:
+            logger.debug(f"   Проверка токена не удалась: {e}")
+            if limiter:
+                limiter.record(time.time() - started, 'error')
+            return True
+        if limiter:
+            limiter.record(time.time() - started, classify_status(response.status_code))
+        final_url = response.url.lower()
+        return response.ok and '/login' not in final_url and 'signin' not in final_url
+
+    if not tokens:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = list(executor.map(is_valid, tokens.values()))
+    return {
+        account_id: token_url
+        for (account_id, token_url), valid in zip(tokens.items(), results)
+        if valid
+    }
+
+
+class TokenService:
+    """
+    Генерация токен-ссылок прямым запросом к TOKEN_API_URL
+
+    Cookies авторизованной сессии и CSRF-токен берутся из браузера,
+    после чего create-token вызывается через requests пачками по
+    TOKEN_CONCURRENCY запросов одновременно. Темп задает общий лимитер,
+    поэтому при 429/капче все запросы притормаживают вместе.
+
+    После max_failures неудач подряд (другой метод или параметры
+    эндпоинта, нет прав) API отключается: create_token сразу возвращает
+    None, и сборщик генерирует токены кнопкой.
+    """
+
+    def __init__(self, limiter: RateLimiter = None,
+                 concurrency: int = config.TOKEN_CONCURRENCY,
+                 timeout: float = config.HTTP_TIMEOUT,
+                 max_failures: int = config.TOKEN_API_MAX_FAILURES):
+        self.limiter = limiter or get_limiter()
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self.session = create_http_session(pool_size=self.concurrency)
+        self.csrf = None
+        self.disabled = False
+        self._failures_in_row = 0
+        self._lock = threading.Lock()
+
+        # Статистика
+        self.generated = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    def load_session(self, page: Page):
+        """Взять cookies и CSRF-токен у авторизованной страницы админки"""
+        self.session.cookies.clear()
+        cookies = load_browser_cookies(self.session, page.context)
+        try:
+            self.csrf = page.evaluate(CSRF_SCRIPT)
+        except Exception as e:
+            logger.debug(f"   CSRF-токен не прочитан: {e}")
+            self.csrf = None
+        logger.debug(f"   Сессия для create-token: {cookies} cookies, CSRF {'есть' if self.csrf else 'нет'}")
+
+    def load_saved_session(self, path: str) -> bool:
+        """
+        Cookies из сохраненного storage_state и CSRF со страницы админки — без браузера
+
+        Returns:
+            False — сессия больше не действует (сервер отправил на вход)
+        """
+        self.session.cookies.clear()
+        load_state_cookies(self.session, path)
+        try:
+            response = self.session.get(config.ACCOUNTS_URL, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning(f"⚠️ Проверка сохраненной сессии не удалась: {e}")
+            return False
+
+        final_url = response.url.lower()
+        if not response.ok or '/login' in final_url or 'type="password"' in response.text:
+            return False
+
+        meta = dict(CSRF_META_PATTERN.findall(response.text))
+        self.csrf = [meta.get('param', '_csrf'), meta['token']] if 'token' in meta else None
+        return True
+
+    def generate(self, account_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Токен-ссылки для аккаунтов
+
+        Returns:
+            account_id -> token_url (аккаунты без токена в словарь не попадают)
+        """
+        return {
+            account_id: token_url
+            for account_id, token_url in self.iter_tokens(account_ids)
+            if token_url
+        }
+
+    def iter_tokens(self, account_ids: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Токен-ссылки по мере получения: (account_id, token_url или None)"""
+        account_ids = list(account_ids)
+        if not account_ids:
+            return
+
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {
+                    executor.submit(self.create_token, account_id): account_id
+                    for account_id in account_ids
+                }
+                for future in as_completed(futures):
+                    token_url = future.result()
+                    if token_url:
+                        self.generated += 1
+                    else:
+                        self.failed += 1
+                    yield futures[future], token_url
+        finally:
+            self.seconds += time.perf_counter() - started
+
+    def create_token(self, account_id: str) -> Optional[str]:
+        """Один запрос create-token. None — токен получить не удалось"""
+        if self.disabled:
+            return None
+        if self.limiter:
+            self.limiter.acquire()
+
+        data = {}
+        headers = {
+            'X-Requested-With': 'XMLHttpRequest',
+            'Accept': 'application/json, text/javascript, */*; q=0.01',
+        }
+        if self.csrf:
+            param, token = self.csrf
+            data[param] = token
+            headers['X-CSRF-Token'] = token
+
+        started = time.time()
+        try:
+            response = self.session.request(
+                config.TOKEN_API_METHOD, config.TOKEN_API_URL,
+                params={'id': account_id}, data=data or None,
+                headers=headers, timeout=self.timeout)
+        except requests.Timeout as e:
+            logger.debug(f"   create-token {account_id}: {e}")
+            self._record(time.time() - started, 'timeout')
+            self._track(False)
+            return None
+        except requests.RequestException as e:
+            logger.debug(f"   create-token {account_id}: {e}")
+            self._record(time.time() - started, 'error')
+            self._track(False)
+            return None
+
+        signal = classify_status(response.status_code)
+        token_url = parse_token_response(response.text) if response.ok else None
+        captcha = 'captcha' in response.text.lower()
+        if response.status_code == 403 and not captcha:
+            # Нет прав или не тот эндпоинт — не повод останавливать всех воркеров
+            signal = 'error'
+        elif token_url is None and signal == 'ok' and captcha:
+            signal = 'ban'
+        self._record(time.time() - started, signal)
+        self._track(token_url is not None)
+
+        if token_url is None:
+            logger.debug(f"   create-token {account_id}: HTTP {response.status_code}, ссылки в ответе нет")
+        return token_url
+
+    def _track(self, success: bool):
+        """Счетчик неудач подряд; после max_failures API отключается"""
+        with self._lock:
+            if success:
+                self._failures_in_row = 0
+                return
+            self._failures_in_row += 1
+            if self.disabled or not self.max_failures or self._failures_in_row < self.max_failures:
+                return
+            self.disabled = True
+        logger.warning(
+            f"⚠️ create-token: {self.max_failures} неудач подряд — API отключен, "
+            f"токены генерируются кнопкой")
+
+    def _record(self, latency: float, signal: str):
+        if self.limiter:
+            self.limiter.record(latency, signal)
+
+    def log_summary(self, log=logger):
+        total = self.generated + self.failed
+        if not total:
+            return
+        speed = f", {self.generated / self.seconds:.1f} токенов/сек" if self.seconds > 0 else ''
+        log.info(f"🔑 Токены через API: получено {self.generated} из {total}{speed}")
+
+
+class OnDemandTokens:
+    """
+    Токен для аккаунта прямо перед парсингом (воркеры конвейера)
+
+    Сессия админки берется из storage_state, сохраненного при входе
+    сборщиком, поэтому воркеру не нужен ни вход, ни браузер админки.
+    Пока сессии нет или она устарела, попытка повторяется на следующем
+    аккаунте.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.service = TokenService(concurrency=1)
+        self._ready = False
+
+    def ensure(self, account: Dict) -> Optional[str]:
+        """Действующий токен аккаунта: сохраненный или новый"""
+        account_id = account['account_id']
+        if account.get('token_url') and self.db.get_valid_tokens([account_id]):
+            return account['token_url']
+
+        if not self._ready:
+            path = load_state()
+            self._ready = bool(path) and self.service.load_saved_session(path)
+            if not self._ready:
+                logger.warning("⚠️ Нет действующей сессии админки для генерации токенов")
+                return account.get('token_url')
+
+        token_url = self.service.create_token(account_id)
+        if token_url:
+            self.db.update_account_token(account_id, token_url)
+            logger.info(f"🔑 Токен получен перед парсингом: {account['username']}")
+            return token_url
+
+        # Сессия могла устареть — перечитать ее перед следующим аккаунтом
+        self._ready = False
+        return account.get('token_url')
@@ -0,0 +1,178 @@
+import random
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
+import config
+from utils.logger import logger
+
+# Строки таблиц: Yii2 GridView на страницах номеров и Vue datatable в админке
+GRID_ROWS_SELECTOR = ', '.join([
+    'table tbody tr',
+    'tr[data-key]',
+    '.grid-view tbody tr',
+    'div[role="row"]',
+])
+
+
+class _Timing:
+    """Накопленные замеры одного вида ожидания"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.samples: List[float] = []
+
+    def add(self, seconds: float, sample_size: int):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        # Равномерная выборка фиксированного размера (reservoir sampling)
+        if len(self.samples) < sample_size:
+            self.samples.append(seconds)
+        else:
+            index = random.randrange(self.count)
+            if index < sample_size:
+                self.samples[index] = seconds
+
+    def percentile(self, share: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+class WaitStats:
+    """
+    Фактическое время ожиданий по видам — реальная задержка страниц
+
+    По каждому виду хранятся счетчик, сумма и максимум, а для p95 —
+    выборка из sample_size замеров, поэтому память воркера не растет
+    с числом обработанных страниц.
+    """
+
+    def __init__(self, sample_size: int = config.WAIT_STATS_SAMPLES):
+        self.sample_size = sample_size
+        self._timings: Dict[str, _Timing] = defaultdict(_Timing)
+
+    def record(self, name: str, seconds: float, timed_out: bool = False):
+        timing = self._timings[name]
+        timing.add(seconds, self.sample_size)
+        if timed_out:
+            timing.timeouts += 1
+
+    def summary(self) -> Dict[str, Dict]:
+        result = {}
+        for name, timing in self._timings.items():
+            result[name] = {
+                'count': timing.count,
+                'avg': timing.total / timing.count,
+                'p95': timing.percentile(0.95),
+                'max': timing.max,
+                'timeouts': timing.timeouts,
+            }
+        return result
+
+    def log_summary(self, log=logger):
+        """Вывести сводку ожиданий"""
+        summary = self.summary()
+        if not summary:
+            return
+        log.info("⏱️ Ожидания страниц:")
+        for name, item in sorted(summary.items()):
+            log.info(
+                f"   {name}: {item['count']} раз, среднее {item['avg']:.2f} сек, "
+                f"p95 {item['p95']:.2f} сек, макс {item['max']:.2f} сек, "
+                f"таймаутов {item['timeouts']}")
+
+    def reset(self):
+        self._timings.clear()
+
+
+# Статистика процесса (у каждого воркера своя)
+wait_stats = WaitStats()
+
+
+def _timed(name: str, wait: Callable[[], None]) -> bool:
+    """Выполнить ожидание, записать время. False — если вышел таймаут"""
+    started = time.perf_counter()
+    try:
+        wait()
+        wait_stats.record(name, time.perf_counter() - started)
+        return True
+    except PlaywrightTimeout:
+        wait_stats.record(name, time.perf_counter() - started, timed_out=True)
+        logger.debug(f"   Ожидание '{name}' прервано по таймауту")
+        return False
+
+
+def wait_for_selector(page: Page, selector: str, name: str,
+                      timeout: int = config.WAIT_TIMEOUT, state: str = 'attached') -> bool:
+    """Дождаться появления элемента"""
+    return _timed(name, lambda: page.wait_for_selector(selector, state=state, timeout=timeout))
+
+
+def wait_for_grid(page: Page, name: str = 'grid', timeout: int = config.WAIT_TIMEOUT) -> bool:
+    """Дождаться строк таблицы"""
+    return wait_for_selector(page, GRID_ROWS_SELECTOR, name, timeout)
+
+
+def wait_for_network_idle(page: Page, name: str = 'network_idle',
+                          timeout: int = config.WAIT_SHORT_TIMEOUT) -> bool:
+    """Дождаться окончания сетевых запросов (AJAX таблиц)"""
+    return _timed(name, lambda: page.wait_for_load_state('networkidle', timeout=timeout))
+
+
+def wait_for_text_change(page: Page, selector: str, old_text: str, name: str,
+                         timeout: int = config.WAIT_TIMEOUT) -> bool:
+    """Дождаться, пока текст элемента станет отличаться от old_text"""
+    script = '''([selector, oldText]) => {
+        const element = document.querySelector(selector);
+        return element !== null && element.innerText !== oldText;
+    }'''
+    return _timed(name, lambda: page.wait_for_function(
+        script, arg=[selector, old_text], timeout=timeout))
+
+
+def wait_for_url(page: Page, url, name: str, timeout: int = config.WAIT_TIMEOUT) -> bool:
+    """Дождаться перехода страницы на url (строка, regex или функция) и DOMContentLoaded"""
+    return _timed(name, lambda: page.wait_for_url(url, wait_until='domcontentloaded', timeout=timeout))
+
+
+def wait_until(page: Page, condition: Callable[[], bool], name: str,
+               timeout: int = config.WAIT_SHORT_TIMEOUT, poll: int = 100) -> bool:
+    """
+    Дождаться условия на стороне Python
+
+    Опрос идет через page.wait_for_timeout, а не time.sleep, чтобы Playwright
+    успевал обрабатывать события (dialog и т.п.).
+    """
+    started = time.perf_counter()
+    deadline = started + timeout / 1000
+    while True:
+        if condition():
+            wait_stats.record(name, time.perf_counter() - started)
+            return True
+        if time.perf_counter() >= deadline:
+            wait_stats.record(name, time.perf_counter() - started, timed_out=True)
+            return False
+        page.wait_for_timeout(poll)
+
+
+async def _timed_async(name: str, wait) -> bool:
+    """_timed для корутин playwright.async_api"""
+    started = time.perf_counter()
+    try:
+        await wait
+        wait_stats.record(name, time.perf_counter() - started)
+        return True
+    except PlaywrightTimeout:
+        wait_stats.record(name, time.perf_counter() - started, timed_out=True)
+        logger.debug(f"   Ожидание '{name}' прервано по таймауту")
+        return False
+
+
+async def wait_for_grid_async(page, name: str = 'grid', timeout: int = config.WAIT_TIMEOUT) -> bool:
+    """Дождаться строк таблицы (async-страница)"""
+    return await _timed_async(
+        name, page.wait_for_selector(GRID_ROWS_SELECTOR, state='attached', timeout=timeout))
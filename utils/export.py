@@ -0,0 +1,180 @@
+import csv
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import config
+from database.db import Database
+from utils.logger import logger
+
+COLUMNS = ['phone_number', 'account_id', 'created_at']
+ACCOUNT_COLUMNS = ['username']
+
+
+def export_phones(db: Database, output_path: Optional[str] = None, fmt: str = 'csv',
+                  since: Optional[str] = None, with_accounts: bool = False,
+                  chunk_size: int = config.EXPORT_CHUNK_SIZE) -> int:
+    """
+    Потоковая выгрузка номеров из phones.db в CSV или Parquet
+
+    Строки читаются курсором порциями по chunk_size, поэтому память не
+    зависит от размера БД. Файл пишется во временный и переименовывается
+    после успешного завершения.
+
+    Args:
+        output_path: Путь к файлу (по умолчанию data/exports/phones_<время>.<fmt>)
+        fmt: 'csv' или 'parquet'
+        since: Нижняя граница created_at ('YYYY-MM-DD[ HH:MM:SS]', UTC)
+               или 'last' — продолжить с последней выгрузки (номера моложе
+               EXPORT_SETTLE_SECONDS попадут в следующую)
+        with_accounts: Добавить username аккаунта
+
+    Returns:
+        Количество выгруженных номеров
+    """
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+
+    if output_path is None:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = str(Path(config.EXPORT_DIR) / f"phones_{timestamp}.{fmt}")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    # Инкрементальный режим: окно [граница прошлой выгрузки, сейчас - EXPORT_SETTLE_SECONDS).
+    # created_at хранится с точностью до секунды и ставится до commit, поэтому
+    # последние секунды откладываются до следующей выгрузки, а не теряются
+    until = None
+    if since == 'last':
+        since = _read_last_export()
+        until = _settled_time(db)
+        if since:
+            logger.info(f"   Продолжение с последней выгрузки: {since}")
+        logger.info(f"   Номера до {until} (UTC)")
+
+    columns = COLUMNS + (ACCOUNT_COLUMNS if with_accounts else [])
+    query, params = _build_query(since, until, with_accounts)
+
+    logger.info(f"📤 Экспорт номеров в {output_path}...")
+    started = time.perf_counter()
+
+    cursor = db.connections.connection().execute(query, params)
+    cursor.arraysize = chunk_size
+
+    tmp_path = f"{output_path}.part"
+    writer = _ParquetWriter(tmp_path, columns) if fmt == 'parquet' else _CsvWriter(tmp_path, columns)
+
+    total = 0
+    try:
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            writer.write([tuple(row) for row in rows])
+            total += len(rows)
+            logger.debug(f"   Выгружено {total} номеров")
+    except BaseException:
+        writer.close()
+        cursor.close()
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+    writer.close()
+    cursor.close()
+
+    os.replace(tmp_path, output_path)
+    if until:
+        _write_last_export(until)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ Экспорт завершен: {total} номеров за {elapsed:.1f} сек "
+        f"({total / elapsed if elapsed > 0 else 0:.0f} строк/сек)")
+    return total
+
+
+def _settled_time(db: Database) -> str:
+    """Верхняя граница инкрементальной выгрузки в формате CURRENT_TIMESTAMP"""
+    return db.connections.connection().execute(
+        "SELECT datetime('now', ?)", (f'{-config.EXPORT_SETTLE_SECONDS} seconds',)
+    ).fetchone()[0]
+
+
+def _build_query(since: Optional[str], until: Optional[str], with_accounts: bool):
+    # CAST возвращает номер строкой при любом варианте хранения
+    select = 'SELECT CAST(p.phone_number AS TEXT), p.account_id, p.created_at'
+    source = 'FROM phones p'
+    if with_accounts:
+        select += ', a.username'
+        source += ' LEFT JOIN accounts a ON a.account_id = p.account_id'
+
+    conditions, params = [], []
+    if since:
+        conditions.append('p.created_at >= ?')
+        params.append(since)
+    if until:
+        conditions.append('p.created_at < ?')
+        params.append(until)
+
+    if not conditions:
+        return f'{select} {source}', ()
+
+    # Фильтр и сортировка идут по индексу idx_phones_created
+    return (f'{select} {source} WHERE {" AND ".join(conditions)} ORDER BY p.created_at',
+            tuple(params))
+
+
+def _read_last_export() -> Optional[str]:
+    try:
+        with open(config.EXPORT_STATE_PATH, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _write_last_export(until: str):
+    previous = _read_last_export()
+    if previous and previous >= until:
+        return
+    Path(config.EXPORT_STATE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    with open(config.EXPORT_STATE_PATH, 'w', encoding='utf-8') as f:
+        f.write(until)
+
+
+class _CsvWriter:
+    def __init__(self, path: str, columns):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Каждая порция строк — отдельная row group"""
+
+    def __init__(self, path: str, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Для экспорта в Parquet установите pyarrow: pip install pyarrow")
+
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(name, pa.string()) for name in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression='snappy')
+
+    def write(self, rows):
+        data = list(zip(*rows))
+        table = self._pa.Table.from_arrays(
+            [self._pa.array(column, type=self._pa.string()) for column in data],
+            schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
@@ -1,61 +1,61 @@
-import logging
-import sys
-from pathlib import Path
-from datetime import datetime
-from colorama import init, Fore, Style
-
-# Инициализация colorama для Windows
-init(autoreset=True)
-
-class ColoredFormatter(logging.Formatter):
-    """Цветной форматтер для консоли"""
-    
-    COLORS = {
-        'DEBUG': Fore.CYAN,
-        'INFO': Fore.GREEN,
-        'WARNING': Fore.YELLOW,
-        'ERROR': Fore.RED,
-        'CRITICAL': Fore.RED + Style.BRIGHT,
-    }
-    
-    def format(self, record):
-        log_color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{log_color}{record.levelname}{Style.RESET_ALL}"
-        return super().format(record)
-
-def setup_logger(name: str = 'CRM_Scraper'):
-    """Настройка логгера"""
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Удаляем существующие handlers
-    logger.handlers.clear()
-    
-    # Консольный handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_formatter = ColoredFormatter(
-        '%(asctime)s | %(levelname)s | %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # Файловый handler
-    log_dir = Path('logs')
-    log_dir.mkdir(exist_ok=True)
-    
-    log_file = log_dir / f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
-    return logger
-
-# Глобальный логгер
-logger = setup_logger()
+import logging
+import sys
+from pathlib import Path
+from datetime import datetime
+from colorama import init, Fore, Style
+
+# Инициализация colorama для Windows
+init(autoreset=True)
+
+class ColoredFormatter(logging.Formatter):
+    """Цветной форматтер для консоли"""
+    
+    COLORS = {
+        'DEBUG': Fore.CYAN,
+        'INFO': Fore.GREEN,
+        'WARNING': Fore.YELLOW,
+        'ERROR': Fore.RED,
+        'CRITICAL': Fore.RED + Style.BRIGHT,
+    }
+    
+    def format(self, record):
+        log_color = self.COLORS.get(record.levelname, '')
+        record.levelname = f"{log_color}{record.levelname}{Style.RESET_ALL}"
+        return super().format(record)
+
+def setup_logger(name: str = 'CRM_Scraper'):
+    """Настройка логгера"""
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    
+    # Удаляем существующие handlers
+    logger.handlers.clear()
+    
+    # Консольный handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_formatter = ColoredFormatter(
+        '%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%H:%M:%S'
+    )
+    console_handler.setFormatter(console_formatter)
+    logger.addHandler(console_handler)
+    
+    # Файловый handler
+    log_dir = Path('logs')
+    log_dir.mkdir(exist_ok=True)
+    
+    log_file = log_dir / f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter(
+        '%(asctime)s | %(levelname)s | %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    file_handler.setFormatter(file_formatter)
+    logger.addHandler(file_handler)
+    
+    return logger
+
+# Глобальный логгер
+logger = setup_logger()